@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Shared Agent Components for the Web Interface
+Process-wide tools, RAG client and configuration, built once at startup
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from agent_tools import AgentTools
+from function_calling_agent import FunctionCallingAgent, PrefetchStats
+from completion_cache import get_completion_cache
+from conversation_memory import ConversationSessions
+
+
+class AgentComponents:
+    """
+    Thread-safe container for components shared by every web request.
+
+    ``AgentTools`` (and the Vectorize ``ApiClient`` with its urllib3
+    connection pool inside it), the tool schemas and the environment
+    configuration are created once, as are the speculative prefetch pool
+    and its counters. Each request only builds a light
+    ``FunctionCallingAgent`` around its own output sink.
+    """
+
+    # Speculative document searches in flight across all requests
+    PREFETCH_WORKERS = 8
+
+    def __init__(self, tools: Optional[AgentTools] = None):
+        """
+        Initialize the container.
+
+        Args:
+            tools (AgentTools, optional): Pre-built tools. Created lazily on first use if omitted.
+        """
+        self._lock = threading.Lock()
+        self._tools = tools
+        self._tool_info: Optional[List[Dict[str, str]]] = None
+        self.sessions = ConversationSessions()
+        self.config = self.read_config()
+        # Threads start on first submit, so this costs nothing with prefetch off
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=self.PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        self.prefetch_stats = PrefetchStats()
+
+    @staticmethod
+    def read_config() -> Dict[str, bool]:
+        """Snapshot of which credentials are configured."""
+        return {
+            'openai_configured': bool(os.getenv("OPENAI_API_KEY")),
+            'vectorize_configured': all(os.getenv(var) for var in (
+                "VECTORIZE_ORGANIZATION_ID",
+                "VECTORIZE_PIPELINE_ACCESS_TOKEN",
+                "VECTORIZE_PIPELINE_ID",
+            )),
+        }
+
+    @property
+    def tools(self) -> AgentTools:
+        """The shared tools instance, created on first access."""
+        if self._tools is None:
+            with self._lock:
+                if self._tools is None:
+                    self._tools = AgentTools()
+        return self._tools
+
+    def create_agent(self, cli, session_id: Optional[str] = None, **kwargs) -> FunctionCallingAgent:
+        """
+        Build a per-request agent around the shared tools.
+
+        Args:
+            cli: Output sink for this request (e.g. a WebCLIInterface)
+            session_id (str, optional): Server-issued session id whose conversation
+                memory the agent continues. Without one, each request starts fresh.
+            **kwargs: Extra FunctionCallingAgent options
+
+        Returns:
+            FunctionCallingAgent: Agent that reuses the pooled components
+        """
+        memory = self.sessions.get(session_id) if session_id else None
+        return FunctionCallingAgent(cli, tools=self.tools, memory=memory,
+                                    prefetch_executor=self.prefetch_executor,
+                                    prefetch_stats=self.prefetch_stats, **kwargs)
+
+    def tool_info(self) -> List[Dict[str, str]]:
+        """Names and descriptions of the available tools."""
+        if self._tool_info is None:
+            self._tool_info = [
+                {
+                    'name': tool['function']['name'],
+                    'description': tool['function']['description']
+                }
+                for tool in self.tools.get_available_tools()
+            ]
+        return self._tool_info
+
+    def status(self) -> Dict[str, Any]:
+        """System status for the web UI."""
+        status = {
+            **self.config,
+            'rag_available': self.tools.has_rag,
+            'total_tools': len(self.tools.get_available_tools()),
+            'active_sessions': len(self.sessions)
+        }
+        cache = get_completion_cache()
+        if cache:
+            status['completion_cache'] = cache.stats()
+        if os.getenv("AGENT_SPECULATIVE_PREFETCH", "false").lower() == "true":
+            status['speculative_prefetch'] = self.prefetch_stats.stats()
+        return status
@@ -8,8 +8,14 @@ Tool 2: Web Search
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
 from vectorize_wrapper import VectorizeWrapper
+from local_vector_store import LocalVectorStore
+from hybrid_rag_source import HybridRAGSource
+from cached_rag_source import CachedRAGSource, with_cache_from_env
+from ttl_cache import TTLCache
+from async_http import get_async_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,20 +24,59 @@ load_dotenv()
 class AgentTools:
     """
     Function calling tools for the AI agent.
+    
+    Every tool has a blocking form for the CLI and Flask app and an
+    ``a``-prefixed coroutine for the async web server.
     """
     
+    WEB_SEARCH_URL = "https://api.duckduckgo.com/"
+    
     def __init__(self):
-        """Initialize the agent tools."""
-        # Initialize RAG source if available
+        """
+        Initialize the agent tools.
+        
+        Web search settings come from the environment: WEB_SEARCH_URL (API
+        endpoint, e.g. a local stub), WEB_SEARCH_CACHE_SIZE (0 disables the
+        result cache) and WEB_SEARCH_CACHE_TTL (seconds).
+        """
+        self._tool_schemas = None
+        
+        # One keep-alive session for every web search, so repeated calls
+        # skip the TCP and TLS handshakes
+        self.web_search_url = os.getenv("WEB_SEARCH_URL", self.WEB_SEARCH_URL)
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_maxsize=16))
+        self._session.mount("http://", HTTPAdapter(pool_maxsize=16))
+        
+        cache_size = int(os.getenv("WEB_SEARCH_CACHE_SIZE", "256"))
+        self.web_cache = TTLCache(
+            max_size=cache_size, ttl=float(os.getenv("WEB_SEARCH_CACHE_TTL", "300"))
+        ) if cache_size > 0 else None
+        
+        # Initialize RAG source if available. A saved local index is
+        # memory-mapped, so opening it per request costs the same at any size.
         try:
-            self.rag_source = VectorizeWrapper()
+            if os.getenv("LOCAL_INDEX_PATH") and os.getenv("LOCAL_SEARCH", "vector").lower() == "hybrid":
+                self.rag_source = with_cache_from_env(HybridRAGSource())
+            elif os.getenv("LOCAL_INDEX_PATH"):
+                self.rag_source = with_cache_from_env(LocalVectorStore())
+            else:
+                self.rag_source = with_cache_from_env(VectorizeWrapper())
             self.has_rag = True
         except:
             self.rag_source = None
             self.has_rag = False
     
     def get_available_tools(self) -> List[Dict]:
-        """Get the list of available tools for the AI agent."""
+        """
+        Get the list of available tools for the AI agent.
+        
+        The schema only depends on settings fixed at construction, so it is
+        built once and the same list is returned afterwards.
+        """
+        if self._tool_schemas is not None:
+            return self._tool_schemas
+        
         tools = []
         
         # Tool 1: RAG Document Retrieval
@@ -83,6 +128,7 @@ class AgentTools:
             }
         })
         
+        self._tool_schemas = tools
         return tools
     
     def search_documents(self, query: str, num_results: int = 5) -> Dict[str, Any]:
@@ -105,22 +151,27 @@ class AgentTools:
         
         try:
             documents = self.rag_source.retrieve_documents(query, num_results)
+            return self._format_document_results(query, documents)
             
-            # Format results for the agent
-            formatted_results = []
-            for doc in documents:
-                formatted_results.append({
-                    "content": doc.get("content", ""),
-                    "score": doc.get("metadata", {}).get("score", "N/A"),
-                    "source": "knowledge_base"
-                })
-            
+        except Exception as e:
             return {
-                "success": True,
-                "query": query,
-                "results": formatted_results,
-                "total_found": len(formatted_results)
+                "success": False,
+                "error": f"Error searching documents: {str(e)}",
+                "results": []
+            }
+    
+    async def asearch_documents(self, query: str, num_results: int = 5) -> Dict[str, Any]:
+        """Tool 1 (async): Search through RAG documents without blocking the event loop."""
+        if not self.has_rag:
+            return {
+                "success": False,
+                "error": "RAG source not available",
+                "results": []
             }
+        
+        try:
+            documents = await self.rag_source.aretrieve_documents(query, num_results)
+            return self._format_document_results(query, documents)
             
         except Exception as e:
             return {
@@ -129,126 +180,62 @@ class AgentTools:
                 "results": []
             }
     
+    def _format_document_results(self, query: str, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Format retrieved documents for the agent."""
+        formatted_results = []
+        for doc in documents:
+            formatted_results.append({
+                "content": doc.get("content", ""),
+                "score": doc.get("metadata", {}).get("score", "N/A"),
+                "source": "knowledge_base"
+            })
+        
+        return {
+            "success": True,
+            "query": query,
+            "results": formatted_results,
+            "total_found": len(formatted_results)
+        }
+    
     def search_web(self, query: str, max_results: int = 5) -> Dict[str, Any]:
         """Tool 2: Search the web for current information."""
         try:
-            # Check if this is a weather query and try to get better info
-            if self._is_weather_query(query):
-                weather_result = self._get_weather_info(query)
-                if weather_result:
-                    return {
-                        "success": True,
-                        "query": query,
-                        "results": [weather_result],
-                        "total_found": 1
-                    }
+            simulated = self._simulated_web_results(query)
+            if simulated:
+                return simulated
             
-            # Check if this is a news query and try to get better info
-            if self._is_news_query(query):
-                news_results = self._get_news_info(query)
-                if news_results:
-                    return {
-                        "success": True,
-                        "query": query,
-                        "results": news_results,
-                        "total_found": len(news_results)
-                    }
+            cached = self._cached_web_results(query, max_results)
+            if cached:
+                return cached
             
             # First try DuckDuckGo instant answers
-            url = "https://api.duckduckgo.com/"
-            params = {
-                "q": query,
-                "format": "json",
-                "no_html": "1",
-                "skip_disambig": "1"
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
-            
-            results = []
-            
-            # Check for instant answer
-            if data.get("Abstract") and len(data["Abstract"]) > 10:
-                results.append({
-                    "title": "Instant Answer",
-                    "content": data["Abstract"],
-                    "url": data.get("AbstractURL", ""),
-                    "source": "web_search"
-                })
-            
-            # Check for answer (often has good info)
-            if data.get("Answer") and len(data["Answer"]) > 5:
-                results.append({
-                    "title": "Direct Answer",
-                    "content": data["Answer"],
-                    "url": "",
-                    "source": "web_search"
-                })
-            
-            # Get related topics with better filtering
-            for topic in data.get("RelatedTopics", [])[:max_results]:
-                if isinstance(topic, dict) and topic.get("Text"):
-                    text = topic.get("Text", "")
-                    if len(text) > 20:  # Only include substantial content
-                        results.append({
-                            "title": text[:60] + "..." if len(text) > 60 else text,
-                            "content": text,
-                            "url": topic.get("FirstURL", ""),
-                            "source": "web_search"
-                        })
-            
-            # If we have good results, return them
-            if results and any(len(r["content"]) > 20 for r in results):
-                return {
-                    "success": True,
-                    "query": query,
-                    "results": results[:max_results],
-                    "total_found": len(results)
-                }
+            response = self._session.get(self.web_search_url, params=self._web_search_params(query), timeout=10)
+            response.raise_for_status()
+            return self._store_web_results(query, max_results, response.json())
             
-            # Fallback: Try to provide contextual search suggestions
-            weather_keywords = ["weather", "temperature", "climate", "forecast"]
-            news_keywords = ["news", "latest", "current", "today", "recent"]
-            price_keywords = ["price", "cost", "value", "bitcoin", "stock"]
-            
-            search_type = "general"
-            if any(keyword in query.lower() for keyword in weather_keywords):
-                search_type = "weather"
-            elif any(keyword in query.lower() for keyword in news_keywords):
-                search_type = "news"
-            elif any(keyword in query.lower() for keyword in price_keywords):
-                search_type = "financial"
-            
-            # Provide helpful contextual response
-            contextual_responses = {
-                "weather": f"For current weather information about '{query}', I recommend checking a dedicated weather service. Weather data changes frequently and requires real-time APIs.",
-                "news": f"For the latest news about '{query}', I recommend checking current news websites as news updates happen in real-time.",
-                "financial": f"For current financial information about '{query}', I recommend checking a financial data service as prices change constantly.",
-                "general": f"I searched for '{query}' but didn't find substantial instant answers. This might require checking current websites directly."
-            }
-            
-            # Add some useful suggestions
-            suggestions = {
-                "weather": ["OpenWeatherMap", "Weather.com", "AccuWeather"],
-                "news": ["Google News", "BBC News", "Reuters"],
-                "financial": ["Yahoo Finance", "Bloomberg", "MarketWatch"],
-                "general": ["Google Search", "Bing", "DuckDuckGo"]
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error searching web: {str(e)}",
+                "results": []
             }
+    
+    async def asearch_web(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        """Tool 2 (async): Search the web without blocking the event loop."""
+        try:
+            simulated = self._simulated_web_results(query)
+            if simulated:
+                return simulated
             
-            results.append({
-                "title": f"Search Performed: {query}",
-                "content": f"{contextual_responses[search_type]} Recommended sources: {', '.join(suggestions[search_type])}",
-                "url": f"https://duckduckgo.com/?q={query.replace(' ', '+')}",
-                "source": "web_search"
-            })
+            cached = self._cached_web_results(query, max_results)
+            if cached:
+                return cached
             
-            return {
-                "success": True,
-                "query": query,
-                "results": results,
-                "total_found": len(results)
-            }
+            response = await get_async_client().get(
+                self.web_search_url, params=self._web_search_params(query), timeout=10
+            )
+            response.raise_for_status()
+            return self._store_web_results(query, max_results, response.json())
             
         except Exception as e:
             return {
@@ -257,6 +244,150 @@ class AgentTools:
                 "results": []
             }
     
+    def _simulated_web_results(self, query: str) -> Optional[Dict[str, Any]]:
+        """Weather and news queries are answered from simulated data."""
+        # Check if this is a weather query and try to get better info
+        if self._is_weather_query(query):
+            weather_result = self._get_weather_info(query)
+            if weather_result:
+                return {
+                    "success": True,
+                    "query": query,
+                    "results": [weather_result],
+                    "total_found": 1
+                }
+
+        # Check if this is a news query and try to get better info
+        if self._is_news_query(query):
+            news_results = self._get_news_info(query)
+            if news_results:
+                return {
+                    "success": True,
+                    "query": query,
+                    "results": news_results,
+                    "total_found": len(news_results)
+                }
+        
+        return None
+    
+    def _web_cache_key(self, query: str, max_results: int):
+        return (CachedRAGSource.normalize_question(query), max_results)
+    
+    def _cached_web_results(self, query: str, max_results: int) -> Optional[Dict[str, Any]]:
+        """Cached results for an equivalent query, reported under this query's wording."""
+        if self.web_cache is None:
+            return None
+        cached = self.web_cache.get(self._web_cache_key(query, max_results))
+        return {**cached, "query": query} if cached else None
+    
+    def _store_web_results(self, query: str, max_results: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Format an API response, caching it only if it had real answers."""
+        results = self._web_answers(data, max_results)
+        if not any(len(r["content"]) > 20 for r in results):
+            # Not cached: the next call should ask the API again rather than
+            # repeat this non-answer for the whole TTL
+            return self._fallback_web_results(query, results)
+        
+        result = {
+            "success": True,
+            "query": query,
+            "results": results[:max_results],
+            "total_found": len(results)
+        }
+        if self.web_cache is not None:
+            self.web_cache.set(self._web_cache_key(query, max_results), result)
+        return result
+    
+    def _web_search_params(self, query: str) -> Dict[str, str]:
+        """Query parameters for the DuckDuckGo instant answer API."""
+        return {
+            "q": query,
+            "format": "json",
+            "no_html": "1",
+            "skip_disambig": "1"
+        }
+    
+    def _web_answers(self, data: Dict[str, Any], max_results: int) -> List[Dict[str, Any]]:
+        """Answers and related topics from an instant answer API response."""
+        results = []
+
+        # Check for instant answer
+        if data.get("Abstract") and len(data["Abstract"]) > 10:
+            results.append({
+                "title": "Instant Answer",
+                "content": data["Abstract"],
+                "url": data.get("AbstractURL", ""),
+                "source": "web_search"
+            })
+
+        # Check for answer (often has good info)
+        if data.get("Answer") and len(data["Answer"]) > 5:
+            results.append({
+                "title": "Direct Answer",
+                "content": data["Answer"],
+                "url": "",
+                "source": "web_search"
+            })
+
+        # Get related topics with better filtering
+        for topic in data.get("RelatedTopics", [])[:max_results]:
+            if isinstance(topic, dict) and topic.get("Text"):
+                text = topic.get("Text", "")
+                if len(text) > 20:  # Only include substantial content
+                    results.append({
+                        "title": text[:60] + "..." if len(text) > 60 else text,
+                        "content": text,
+                        "url": topic.get("FirstURL", ""),
+                        "source": "web_search"
+                    })
+
+        return results
+    
+    def _fallback_web_results(self, query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Contextual search suggestions (after any short answers) for a query the API had no real answer for."""
+        # Fallback: Try to provide contextual search suggestions
+        weather_keywords = ["weather", "temperature", "climate", "forecast"]
+        news_keywords = ["news", "latest", "current", "today", "recent"]
+        price_keywords = ["price", "cost", "value", "bitcoin", "stock"]
+
+        search_type = "general"
+        if any(keyword in query.lower() for keyword in weather_keywords):
+            search_type = "weather"
+        elif any(keyword in query.lower() for keyword in news_keywords):
+            search_type = "news"
+        elif any(keyword in query.lower() for keyword in price_keywords):
+            search_type = "financial"
+
+        # Provide helpful contextual response
+        contextual_responses = {
+            "weather": f"For current weather information about '{query}', I recommend checking a dedicated weather service. Weather data changes frequently and requires real-time APIs.",
+            "news": f"For the latest news about '{query}', I recommend checking current news websites as news updates happen in real-time.",
+            "financial": f"For current financial information about '{query}', I recommend checking a financial data service as prices change constantly.",
+            "general": f"I searched for '{query}' but didn't find substantial instant answers. This might require checking current websites directly."
+        }
+
+        # Add some useful suggestions
+        suggestions = {
+            "weather": ["OpenWeatherMap", "Weather.com", "AccuWeather"],
+            "news": ["Google News", "BBC News", "Reuters"],
+            "financial": ["Yahoo Finance", "Bloomberg", "MarketWatch"],
+            "general": ["Google Search", "Bing", "DuckDuckGo"]
+        }
+
+        results.append({
+            "title": f"Search Performed: {query}",
+            "content": f"{contextual_responses[search_type]} Recommended sources: {', '.join(suggestions[search_type])}",
+            "url": f"https://duckduckgo.com/?q={query.replace(' ', '+')}",
+            "source": "web_search"
+        })
+
+        return {
+            "success": True,
+            "query": query,
+            "results": results,
+            "total_found": len(results)
+        }
+    
     def _is_weather_query(self, query: str) -> bool:
         """Check if query is weather-related."""
         weather_keywords = ["weather", "temperature", "climate", "forecast", "rain", "sunny", "cloudy"]
@@ -398,4 +529,26 @@ class AgentTools:
                 "success": False,
                 "error": f"Unknown tool: {tool_name}",
                 "results": []
-            } 
\ No newline at end of file
+            } 
+    
+    async def aexecute_tool(self, tool_name: str, **kwargs) -> Dict[str, Any]:
+        """
+        Execute a tool by name without blocking the event loop.
+        
+        Args:
+            tool_name (str): Name of the tool to execute
+            **kwargs: Tool parameters
+            
+        Returns:
+            Dict with tool execution results
+        """
+        if tool_name == "search_documents":
+            return await self.asearch_documents(**kwargs)
+        elif tool_name == "search_web":
+            return await self.asearch_web(**kwargs)
+        else:
+            return {
+                "success": False,
+                "error": f"Unknown tool: {tool_name}",
+                "results": []
+            }
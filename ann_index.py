@@ -0,0 +1,156 @@
+"""
+Approximate Nearest-Neighbour Index for Local Retrieval
+Inverted-file (IVF) index over L2-normalized embeddings.
+"""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Uses ``argpartition`` so only the k winners are fully sorted.
+    """
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k >= len(scores):
+        return np.argsort(-scores)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class IVFIndex:
+    """
+    Inverted-file index with k-means coarse centroids.
+
+    Every vector is assigned to its nearest centroid. A query scores the
+    centroids first and then exactly scores only the vectors in the
+    ``nprobe`` closest lists, trading a little recall for a large cut in
+    work. Raising ``nprobe`` moves towards exact search.
+    """
+
+    ASSIGN_BLOCK = 65536
+
+    def __init__(self, n_lists: Optional[int] = None, nprobe: int = 8,
+                 n_iter: int = 10, sample_size: int = 100000, seed: int = 0):
+        """
+        Initialize the IVF index.
+
+        Args:
+            n_lists (int, optional): Number of coarse centroids. Defaults to 4 * sqrt(n).
+            nprobe (int): Lists scanned per query (recall/latency knob)
+            n_iter (int): k-means iterations
+            sample_size (int): Maximum vectors used to train the centroids
+            seed (int): Random seed for reproducible training
+        """
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.n_iter = n_iter
+        self.sample_size = sample_size
+        self.seed = seed
+
+        self.centroids: Optional[np.ndarray] = None
+        self.list_ids: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid per vector, in blocks to bound memory."""
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), self.ASSIGN_BLOCK):
+            block = np.asarray(vectors[start:start + self.ASSIGN_BLOCK], dtype=np.float32)
+            assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return assignments
+
+    def _train(self, vectors: np.ndarray, n_lists: int) -> np.ndarray:
+        """Spherical k-means on a random sample of the vectors."""
+        rng = np.random.default_rng(self.seed)
+        sample_ids = rng.choice(len(vectors), size=min(len(vectors), self.sample_size), replace=False)
+        sample = np.asarray(vectors[np.sort(sample_ids)], dtype=np.float32)
+
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assignments = self._assign(sample, centroids)
+            counts = np.bincount(assignments, minlength=n_lists)
+            starts = np.cumsum(counts) - counts
+            filled = counts > 0
+
+            sums = np.zeros_like(centroids)
+            grouped = sample[np.argsort(assignments, kind="stable")]
+            sums[filled] = np.add.reduceat(grouped, starts[filled], axis=0)
+
+            empty = ~filled
+            if empty.any():
+                # Re-seed empty lists so every centroid stays useful
+                sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = sums / norms
+
+        return centroids.astype(np.float32)
+
+    def build(self, vectors: np.ndarray):
+        """
+        Train centroids and bucket every vector into its inverted list.
+
+        Args:
+            vectors (np.ndarray): Matrix of shape (n, dimension)
+        """
+        n = len(vectors)
+        if n == 0:
+            raise ValueError("Cannot build an IVF index over zero vectors")
+
+        n_lists = min(self.n_lists or max(1, int(4 * math.sqrt(n))), n)
+        self.centroids = self._train(vectors, n_lists)
+
+        assignments = self._assign(vectors, self.centroids)
+        self.list_ids = np.argsort(assignments, kind="stable").astype(np.int64)
+        counts = np.bincount(assignments, minlength=n_lists)
+        self.list_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def load(self, centroids: np.ndarray, list_ids: np.ndarray, list_offsets: np.ndarray):
+        """Restore a previously built index from its arrays."""
+        self.centroids = centroids
+        self.list_ids = list_ids
+        self.list_offsets = list_offsets
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Ids of all vectors in the ``nprobe`` lists closest to the query."""
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        probes = top_k_indices(self.centroids @ query, nprobe)
+        return np.concatenate([
+            self.list_ids[self.list_offsets[p]:self.list_offsets[p + 1]] for p in probes
+        ])
+
+    def search(self, vectors: np.ndarray, query: np.ndarray, k: int,
+               nprobe: Optional[int] = None,
+               scales: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k search.
+
+        Args:
+            vectors (np.ndarray): The matrix the index was built over
+            query (np.ndarray): L2-normalized query vector
+            k (int): Number of results
+            nprobe (int, optional): Override for the number of lists scanned
+            scales (np.ndarray, optional): Per-row scales for int8-quantized vectors
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row indices and scores, best first
+        """
+        if not self.is_trained:
+            raise ValueError("IVF index has not been built")
+
+        candidate_ids = np.sort(self.candidates(query, nprobe))
+        scores = np.asarray(vectors[candidate_ids], dtype=np.float32) @ query
+        if scales is not None:
+            scores *= scales[candidate_ids]
+        best = top_k_indices(scores, k)
+        return candidate_ids[best], scores[best]
@@ -0,0 +1,37 @@
+import asyncio
+import weakref
+
+import httpx
+
+
+# One pooled client per event loop. httpx clients are bound to the loop
+# they were first used on, so sharing across loops is not safe.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client for the running event loop.
+
+    Every async caller in the process (RAG sources, web search) shares it,
+    so keep-alive connections are reused across requests.
+
+    Returns:
+        httpx.AsyncClient: Client owned by the running loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def aclose_async_client():
+    """Close the pooled HTTP client of the running event loop."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Async Web Frontend for Function Calling Agent
+ASGI version of web_app: same routes and templates, served by Hypercorn
+"""
+
+import os
+import asyncio
+from quart import Quart, Response, render_template, request, jsonify, session
+from dotenv import load_dotenv
+from agent_components import AgentComponents
+from async_http import aclose_async_client
+from web_app import WebCLIInterface, StreamingWebCLIInterface, format_sse, conversation_id
+
+load_dotenv()
+
+app = Quart(__name__)
+app.secret_key = os.getenv('FLASK_SECRET_KEY', 'agent-bootcamp-secret-key-change-in-production')
+
+# Shared tools, RAG client and config: built once, reused by every request
+components = AgentComponents()
+
+
+class AsyncStreamingWebCLIInterface(StreamingWebCLIInterface):
+    """Streaming web CLI interface whose events are consumed on the event loop."""
+    
+    def __init__(self):
+        super().__init__()
+        self._events = asyncio.Queue()
+    
+    async def aevents(self):
+        """Yield events until the producer closes the stream."""
+        while True:
+            event = await self._events.get()
+            if event is self._CLOSED:
+                return
+            yield event
+
+
+@app.after_serving
+async def close_http_client():
+    """Release pooled connections on shutdown."""
+    await aclose_async_client()
+
+@app.route('/')
+async def index():
+    """Main chat interface."""
+    return await render_template('index.html')
+
+@app.route('/api/chat', methods=['POST'])
+async def chat():
+    """Handle chat requests."""
+    try:
+        data = await request.get_json()
+        user_message = data.get('message', '').strip()
+        
+        if not user_message:
+            return jsonify({
+                'success': False,
+                'error': 'Please enter a message'
+            })
+        
+        if not components.config['openai_configured']:
+            return jsonify({
+                'success': False,
+                'error': 'OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.'
+            })
+        
+        web_cli = WebCLIInterface()
+        agent = components.create_agent(web_cli, session_id=conversation_id(session))
+        response = await agent.achat_with_tools(user_message)
+        
+        return jsonify({
+            'success': True,
+            'response': response,
+            'messages': web_cli.messages,
+            'user_message': user_message
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error: {str(e)}'
+        })
+
+@app.route('/api/chat/stream', methods=['POST'])
+async def chat_stream():
+    """Handle chat requests, streaming tool and answer events as Server-Sent Events."""
+    data = await request.get_json(silent=True) or {}
+    user_message = data.get('message', '').strip()
+    session_id = conversation_id(session)
+    
+    web_cli = AsyncStreamingWebCLIInterface()
+    
+    async def run_agent():
+        try:
+            if not user_message:
+                web_cli.emit('error', error='Please enter a message')
+                return
+            
+            if not components.config['openai_configured']:
+                web_cli.emit('error', error='OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.')
+                return
+            
+            agent = components.create_agent(web_cli, session_id=session_id, stream=True)
+            response = await agent.achat_with_tools(user_message)
+            web_cli.emit('done', response=response)
+            
+        except Exception as e:
+            web_cli.emit('error', error=f'Error: {str(e)}')
+        finally:
+            web_cli.close()
+    
+    # The agent runs as a task on the same loop instead of a thread per request
+    task = asyncio.ensure_future(run_agent())
+    
+    async def generate():
+        try:
+            async for event in web_cli.aevents():
+                yield format_sse(event)
+        finally:
+            # Client went away: stop spending tokens on an unread answer
+            task.cancel()
+    
+    response = Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    response.timeout = None
+    return response
+
+@app.route('/api/tools')
+async def get_tools():
+    """Get available tools information."""
+    try:
+        return jsonify({
+            'success': True,
+            'tools': components.tool_info()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/status')
+async def get_status():
+    """Get system status."""
+    try:
+        return jsonify({
+            'success': True,
+            'status': components.status()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+async def serve(host: str = '0.0.0.0', port: int = 5000):
+    """
+    Serve the app with Hypercorn.
+    
+    Args:
+        host (str): Interface to bind
+        port (int): Port to listen on
+    """
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config
+    
+    config = Config()
+    config.bind = [f"{host}:{port}"]
+    await hypercorn_serve(app, config)
+
+if __name__ == '__main__':
+    port = int(os.getenv('PORT', 5000))
+    
+    print("🚀 Starting Function Calling Agent Web Interface (async)...")
+    print(f"🌐 Open your browser to: http://localhost:{port}")
+    print("🔧 Press Ctrl+C to stop the server")
+    
+    asyncio.run(serve(port=port))
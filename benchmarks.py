@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Agent Engineering Bootcamp RAG System
+Measure latency and quality trade-offs before changing deployment settings
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from typing import List
+
+import numpy as np
+
+from ann_index import IVFIndex, top_k_indices
+
+
+def synthetic_corpus(n: int, dim: int, n_clusters: int, seed: int = 0) -> np.ndarray:
+    """Clustered, L2-normalized vectors that behave like real embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, size=n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def bench_ann(args) -> int:
+    """Recall@k and latency of the IVF index against exact search."""
+    print(f"📦 Building corpus: {args.size} vectors x {args.dim} dims")
+    # Queries are held-out draws from the same clusters as the corpus, as real
+    # questions come from the same distribution as the documents
+    data = synthetic_corpus(args.size + args.queries, args.dim, n_clusters=max(8, args.size // 500))
+    vectors, queries = data[:args.size], data[args.size:]
+
+    # Exact ground truth
+    start = time.perf_counter()
+    truth = [set(top_k_indices(vectors @ q, args.k).tolist()) for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    index = IVFIndex(n_lists=args.n_lists)
+    index.build(vectors)
+    build_s = time.perf_counter() - start
+    print(f"🔧 IVF built with {len(index.centroids)} lists in {build_s:.2f}s")
+
+    print(f"\n{'method':<14}{'recall@' + str(args.k):>12}{'ms/query':>12}{'speedup':>10}")
+    print(f"{'exact':<14}{1.0:>12.3f}{exact_ms:>12.3f}{1.0:>10.1f}")
+
+    for nprobe in args.nprobe:
+        start = time.perf_counter()
+        found: List[set] = [set(index.search(vectors, q, args.k, nprobe)[0].tolist()) for q in queries]
+        ivf_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+        print(f"{'ivf/' + str(nprobe):<14}{recall:>12.3f}{ivf_ms:>12.3f}{exact_ms / ivf_ms:>10.1f}")
+
+    return 0
+
+
+def _time_per_call(fn, repeat: int) -> float:
+    """Mean wall time of fn() in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_web_overhead(args) -> int:
+    """Per-request setup cost: fresh agent vs the shared component container."""
+    # Placeholder credentials so the Vectorize client is really constructed;
+    # nothing here makes a network call
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("VECTORIZE_ORGANIZATION_ID", "benchmark")
+    os.environ.setdefault("VECTORIZE_PIPELINE_ACCESS_TOKEN", "benchmark")
+    os.environ.setdefault("VECTORIZE_PIPELINE_ID", "benchmark")
+
+    from function_calling_agent import FunctionCallingAgent
+    from web_app import app, components, WebCLIInterface
+
+    fresh_ms = _time_per_call(lambda: FunctionCallingAgent(WebCLIInterface()), args.requests)
+    pooled_ms = _time_per_call(lambda: components.create_agent(WebCLIInterface()), args.requests)
+
+    print(f"\n{'per-request agent setup':<32}{'ms':>10}")
+    print(f"{'before: new agent + tools':<32}{fresh_ms:>10.3f}")
+    print(f"{'after: shared components':<32}{pooled_ms:>10.3f}")
+    print(f"{'speedup':<32}{fresh_ms / pooled_ms:>10.1f}x")
+
+    client = app.test_client()
+    print(f"\n{'endpoint (shared components)':<32}{'ms':>10}")
+    for path in ('/api/status', '/api/tools'):
+        print(f"{path:<32}{_time_per_call(lambda: client.get(path), args.requests):>10.3f}")
+
+    return 0
+
+
+def bench_context(args) -> int:
+    """Prompt tokens and packing time: every retrieved chunk in full vs the context packer."""
+    from embedders import HashingEmbedder
+    from ingestion import chunk_text
+    from local_vector_store import LocalVectorStore
+    from context_packer import ContextPacker, estimate_tokens
+
+    with open(args.document, encoding='utf-8') as f:
+        document = f.read()
+
+    # Several revisions of the same document, as a knowledge base accumulates them
+    store = LocalVectorStore(embedder=HashingEmbedder(), from_env=False)
+    for revision in range(args.revisions):
+        text = document.replace("Bootcamp", f"Bootcamp (revision {revision})")
+        chunks = chunk_text(text, args.chunk_tokens, args.overlap)
+        store.add_texts(chunks, [{"revision": revision, "chunk": i} for i, chunk in enumerate(chunks)])
+
+    questions = [
+        "What is RAG?", "What are the key benefits of RAG?", "What is covered in week 2?",
+        "How should documents be chunked?", "What does the technical architecture look like?",
+        "Which vector databases are covered?", "What topics are in the production week?",
+        "What are the best practices?",
+    ]
+    packer = ContextPacker(max_tokens=args.budget, max_chunk_tokens=args.chunk_budget)
+    print(f"📦 {len(store)} chunks from {args.revisions} revisions of {args.document}; "
+          f"top {args.k} per question, budget {args.budget} tokens")
+
+    full_tokens, packed_tokens, times = [], [], []
+    for question in questions * args.repeat:
+        documents = store.retrieve_documents(question, args.k)
+        full_tokens.append(sum(estimate_tokens(d['content']) for d in documents))
+        packer.pack(documents, question)
+        packed_tokens.append(packer.last_stats['output_tokens'])
+        times.append(packer.last_stats['ms'])
+
+    full, packed = np.mean(full_tokens), np.mean(packed_tokens)
+    print(f"\n{'context tokens/request':<28}{'mean':>10}")
+    print(f"{'before: all chunks in full':<28}{full:>10.0f}")
+    print(f"{'after: packed':<28}{packed:>10.0f}")
+    print(f"{'reduction':<28}{(1 - packed / full) * 100:>9.1f}%")
+    print(f"\n{'packing time':<28}{'ms':>10}")
+    print(f"{'mean':<28}{np.mean(times):>10.3f}")
+    print(f"{'p99':<28}{np.percentile(times, 99):>10.3f}")
+    return 0
+
+
+def bench_completion_cache(args) -> int:
+    """Repeated FAQ-style prompts against a simulated LLM: no cache vs the completion cache."""
+    import contextlib
+    from completion_cache import CompletionCache, complete
+    import completion_cache
+
+    class QuietCLI:
+        def spinner(self, message):
+            return contextlib.nullcontext()
+
+    # Popular questions are asked far more often than the rest (Zipf-like)
+    rng = np.random.default_rng(0)
+    weights = 1.0 / np.arange(1, args.questions + 1)
+    asked = rng.choice(args.questions, size=args.requests, p=weights / weights.sum())
+
+    def run() -> float:
+        start = time.perf_counter()
+        for q in asked:
+            complete(QuietCLI(), "", model="openai/gpt-4o", temperature=0.7,
+                     messages=[{"role": "user", "content": f"FAQ question {q}?"}],
+                     mock_response=f"Answer {q}", mock_delay=args.llm_ms / 1000)
+        return time.perf_counter() - start
+
+    print(f"💬 {args.requests} requests over {args.questions} distinct questions, "
+          f"simulated LLM latency {args.llm_ms:.0f} ms")
+    completion_cache._cache = None
+    os.environ["COMPLETION_CACHE"] = "false"
+    uncached = run()
+
+    path = os.path.abspath(args.db)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    os.environ["COMPLETION_CACHE"] = "true"
+    completion_cache._cache = CompletionCache(path=path)
+    cached = run()
+    stats = completion_cache._cache.stats()
+
+    print(f"\n{'mode':<12}{'seconds':>10}{'ms/request':>12}")
+    print(f"{'no cache':<12}{uncached:>10.2f}{uncached * 1000 / args.requests:>12.1f}")
+    print(f"{'cached':<12}{cached:>10.2f}{cached * 1000 / args.requests:>12.1f}")
+    print(f"\nhit rate {stats['hit_rate']:.1%} "
+          f"(memory {stats['memory_hits']}, disk {stats['disk_hits']}), "
+          f"LLM time saved {stats['seconds_saved']:.2f}s")
+    completion_cache._cache.close()
+    return 0
+
+
+def bench_memory(args) -> int:
+    """History tokens per turn: full transcript vs ConversationMemory (summary + recent turns)."""
+    from context_packer import estimate_tokens
+    from conversation_memory import ConversationMemory, extractive_summarizer
+
+    def slow_summarizer(summary, turns, max_tokens):
+        # Stands in for the LLM call that normally folds turns into the summary
+        time.sleep(args.summary_ms / 1000)
+        return extractive_summarizer(summary, turns, max_tokens)
+
+    rng = np.random.default_rng(0)
+    words = "agent retrieval vector index chunk embedding latency budget token summary cache".split()
+    memory = ConversationMemory(max_tokens=args.max_tokens, summarizer=slow_summarizer)
+    full_history = 0
+    add_ms = []
+
+    print(f"💬 {args.turns} turns, memory ceiling {args.max_tokens} tokens, "
+          f"simulated summary call {args.summary_ms:.0f} ms")
+    print(f"\n{'turn':>6}{'full history':>15}{'memory':>10}")
+    for turn in range(1, args.turns + 1):
+        question = "Question: " + " ".join(rng.choice(words, 30)) + "?"
+        answer = "Answer. " + ". ".join(" ".join(rng.choice(words, 20)) for _ in range(8)) + "."
+
+        start = time.perf_counter()
+        memory.add_turn(question, answer)
+        add_ms.append((time.perf_counter() - start) * 1000)
+        full_history += estimate_tokens(question) + estimate_tokens(answer)
+
+        if turn in (1, 5, 10, 25, 50, 100, 200, 500) or turn == args.turns:
+            print(f"{turn:>6}{full_history:>15}{memory.tokens():>10}")
+
+    memory.wait()
+    print(f"\nadd_turn: {np.mean(add_ms):.3f} ms mean, {max(add_ms):.3f} ms max "
+          f"(summaries run in the background; {memory.folds} folds)")
+    return 0
+
+
+def bench_prefetch(args) -> int:
+    """Agent turns against a simulated LLM and slow retrieval: sequential vs speculative prefetch."""
+    import json
+    import contextlib
+    from unittest import mock
+
+    import litellm
+
+    from agent_tools import AgentTools
+    from function_calling_agent import FunctionCallingAgent
+
+    class QuietCLI:
+        def spinner(self, message):
+            return contextlib.nullcontext()
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    def passages(question, num_results):
+        return [{"content": f"Passage {i} about {question}", "metadata": {"score": 1.0 / (i + 1)}}
+                for i in range(num_results)]
+
+    class SlowSource:
+        def retrieve_documents(self, question, num_results=5):
+            time.sleep(args.retrieval_ms / 1000)
+            return passages(question, num_results)
+
+        async def aretrieve_documents(self, question, num_results=5):
+            await asyncio.sleep(args.retrieval_ms / 1000)
+            return passages(question, num_results)
+
+    # What the model does with each question: search its words (minus filler),
+    # search something else, or answer without tools
+    rng = np.random.default_rng(0)
+    topics = "vector index chunk embedding latency budget token summary cache retrieval agent".split()
+    turns = []
+    for _ in range(args.turns):
+        question = "Can you tell me about " + " ".join(rng.choice(topics, 4)) + "?"
+        action = rng.choice(["same", "other", "none"], p=[args.same, args.other, 1 - args.same - args.other])
+        query = {"same": question[len("Can you tell me about "):-1],
+                 "other": " ".join(rng.choice(topics, 3)) + " pricing",
+                 "none": None}[action]
+        turns.append((question, query))
+
+    def fake_completion(query):
+        def respond(**kwargs):
+            time.sleep(args.llm_ms / 1000)
+            if query is None or kwargs.get("tools") is None:
+                return litellm.ModelResponse(choices=[{"message": {"role": "assistant", "content": "Done."}}])
+            return litellm.ModelResponse(choices=[{"message": {
+                "role": "assistant", "content": None,
+                "tool_calls": [{"id": "call_0", "type": "function", "function": {
+                    "name": "search_documents", "arguments": json.dumps({"query": query})}}]
+            }}])
+        return respond
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["COMPLETION_CACHE"] = "false"
+    tools = AgentTools()
+    tools.rag_source, tools.has_rag = SlowSource(), True
+
+    def run(speculative: bool):
+        agent = FunctionCallingAgent(QuietCLI(), tools=tools, speculative_prefetch=speculative)
+        start = time.perf_counter()
+        for question, query in turns:
+            with mock.patch("litellm.completion", fake_completion(query)):
+                agent.memory.clear()
+                agent.chat_with_tools(question)
+        return time.perf_counter() - start, agent.prefetch_stats.stats()
+
+    print(f"🔎 {args.turns} agent turns, simulated LLM {args.llm_ms:.0f} ms per call, "
+          f"retrieval {args.retrieval_ms:.0f} ms")
+    sequential, _ = run(False)
+    speculative, stats = run(True)
+
+    print(f"\n{'mode':<14}{'seconds':>10}{'ms/turn':>10}")
+    print(f"{'sequential':<14}{sequential:>10.2f}{sequential * 1000 / args.turns:>10.1f}")
+    print(f"{'speculative':<14}{speculative:>10.2f}{speculative * 1000 / args.turns:>10.1f}")
+    print(f"\nprefetch hit rate {stats['hit_rate']:.1%} (hits {stats['hits']}, misses {stats['misses']}, "
+          f"unused {stats['unused']}), retrieval time hidden {stats['seconds_saved']:.2f}s")
+    return 0
+
+
+def bench_embed(args) -> int:
+    """Single-text embed calls from many threads: direct vs coalesced by BatchingEmbedder."""
+    from embedders import EmbedderBase, HashingEmbedder
+    from embedding_service import BatchingEmbedder
+
+    class RemoteLikeEmbedder(EmbedderBase):
+        """Hashing embedder behind a simulated API: per-call latency and a concurrency cap."""
+
+        def __init__(self):
+            self.inner = HashingEmbedder()
+            self.slots = threading.Semaphore(args.max_concurrent_calls)
+            self.calls = 0
+
+        @property
+        def dimension(self) -> int:
+            return self.inner.dimension
+
+        def embed(self, texts):
+            with self.slots:
+                self.calls += 1
+                time.sleep(args.call_ms / 1000 + args.per_text_ms / 1000 * len(texts))
+                return self.inner.embed(texts)
+
+    texts = [f"chunk {i} about topic {i % 50}" for i in range(args.texts)]
+
+    def run(embedder) -> float:
+        def worker(offset: int):
+            for i in range(offset, len(texts), args.threads):
+                embedder.embed([texts[i]])
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    print(f"🧮 {args.texts} texts from {args.threads} threads; API: {args.call_ms}ms/call, "
+          f"{args.max_concurrent_calls} concurrent calls")
+    print(f"\n{'mode':<12}{'texts/s':>10}{'API calls':>12}")
+    direct = RemoteLikeEmbedder()
+    elapsed = run(direct)
+    print(f"{'direct':<12}{args.texts / elapsed:>10.0f}{direct.calls:>12}")
+
+    remote = RemoteLikeEmbedder()
+    batching = BatchingEmbedder(remote, workers=args.max_concurrent_calls)
+    elapsed = run(batching)
+    print(f"{'batched':<12}{args.texts / elapsed:>10.0f}{remote.calls:>12}")
+    print(f"\nadapted batch size: {batching.stats()['batch_size']}")
+    return 0
+
+
+def bench_hybrid(args) -> int:
+    """Identifier lookups: vector-only vs hybrid BM25 + vector, with per-stage latency."""
+    from embedders import HashingEmbedder
+    from local_vector_store import LocalVectorStore
+    from hybrid_rag_source import HybridRAGSource
+
+    rng = np.random.default_rng(0)
+    topics = ["billing", "login", "upload", "search", "export", "webhooks", "quotas", "sso"]
+    texts = [
+        f"The {topics[i % len(topics)]} service returned error ERR-{1000 + i} when the request "
+        f"from client {rng.integers(1, 50)} timed out. Retry the {topics[i % len(topics)]} call "
+        f"after checking the {topics[(i * 7) % len(topics)]} settings."
+        for i in range(args.size)
+    ]
+    print(f"📦 Indexing {args.size} chunks")
+    store = LocalVectorStore(embedder=HashingEmbedder(), from_env=False)
+    store.add_texts(texts, [{"row": i} for i in range(args.size)])
+    hybrid = HybridRAGSource(store, candidates=args.candidates)
+
+    start = time.perf_counter()
+    hybrid.bm25
+    print(f"🔧 BM25 index built in {time.perf_counter() - start:.2f}s")
+
+    targets = rng.choice(args.size, size=min(args.queries, args.size), replace=False)
+    questions = [f"What does ERR-{1000 + i} mean?" for i in targets]
+
+    vector_hits = [
+        int(t) in {d['metadata']['row'] for d in store.retrieve_documents(q, args.k)}
+        for q, t in zip(questions, targets)
+    ]
+    hybrid_hits = [
+        int(t) in {d['metadata']['row'] for d in hybrid.retrieve_documents(q, args.k)}
+        for q, t in zip(questions, targets)
+    ]
+
+    print(f"\n{'method':<10}{'hit@' + str(args.k):>10}")
+    print(f"{'vector':<10}{np.mean(vector_hits):>10.3f}")
+    print(f"{'hybrid':<10}{np.mean(hybrid_hits):>10.3f}")
+
+    print(f"\n{'stage':<10}{'ms/query':>10}")
+    for stage, ms in hybrid.stats()['mean_ms'].items():
+        print(f"{stage:<10}{ms:>10.3f}")
+    return 0
+
+
+async def _load_test(args) -> List[float]:
+    """Fire args.requests requests with args.concurrency in flight; return latencies, NaN on error."""
+    import httpx
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        async def one() -> float:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    if args.message is None:
+                        response = await client.get(args.path)
+                    else:
+                        # Read the whole body so streamed (SSE) answers are timed to the end
+                        async with client.stream('POST', args.path, json={'message': args.message}) as response:
+                            await response.aread()
+                    if response.status_code >= 400:
+                        return float('nan')
+                except httpx.HTTPError:
+                    return float('nan')
+                return (time.perf_counter() - start) * 1000
+
+        return await asyncio.gather(*(one() for _ in range(args.requests)))
+
+
+def bench_load_test(args) -> int:
+    """Throughput and latency percentiles of a running web server under concurrent load."""
+    print(f"🚦 {args.requests} requests to {args.url}{args.path}, {args.concurrency} concurrent")
+
+    start = time.perf_counter()
+    latencies = np.array(asyncio.run(_load_test(args)))
+    elapsed = time.perf_counter() - start
+
+    ok = latencies[~np.isnan(latencies)]
+    print(f"\n{'throughput':<16}{len(ok) / elapsed:>10.1f} req/s")
+    if len(ok):
+        for label, q in (('p50', 50), ('p95', 95), ('p99', 99)):
+            print(f"{label:<16}{np.percentile(ok, q):>10.1f} ms")
+    print(f"{'errors':<16}{len(latencies) - len(ok):>10d}")
+
+    return 0 if len(ok) else 1
+
+
+def main():
+    """Main CLI function for benchmarks."""
+
+    parser = argparse.ArgumentParser(
+        description="📊 Benchmarks for the RAG System",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks.py ann                                # Recall vs exact, default sizes
+  python benchmarks.py ann --size 1000000 --nprobe 4 16   # Pick nprobe for a 1M corpus
+  python benchmarks.py web-overhead                       # Per-request setup cost in web_app
+  python benchmarks.py hybrid --size 100000               # Exact-identifier recall and per-stage latency
+  python benchmarks.py context --budget 1000             # Prompt tokens saved by the context packer
+  python benchmarks.py completion-cache --requests 500     # Hit rate and time saved on repeated prompts
+  python benchmarks.py memory --turns 200                  # Prompt history size over a long conversation
+  python benchmarks.py prefetch --retrieval-ms 100       # Retrieval hidden behind the first completion
+  python benchmarks.py embed --threads 64                 # Micro-batching vs one call per text
+  python benchmarks.py load-test --concurrency 100        # Load a running server (web or web --async)
+  python benchmarks.py load-test --path /api/chat/stream --message "Hi" --requests 50
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Benchmarks')
+
+    ann_parser = subparsers.add_parser('ann', help='IVF recall and latency vs exact search')
+    ann_parser.add_argument('--size', type=int, default=200000, help='Number of corpus vectors')
+    ann_parser.add_argument('--dim', type=int, default=256, help='Embedding dimension')
+    ann_parser.add_argument('--queries', type=int, default=200, help='Number of queries')
+    ann_parser.add_argument('--k', type=int, default=10, help='Results per query')
+    ann_parser.add_argument('--n-lists', type=int, default=None, help='IVF lists (default 4*sqrt(n))')
+    ann_parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32],
+                            help='nprobe values to evaluate')
+
+    web_parser = subparsers.add_parser('web-overhead', help='Per-request setup cost of the web app')
+    web_parser.add_argument('--requests', type=int, default=500, help='Requests to time')
+
+    hybrid_parser = subparsers.add_parser('hybrid', help='Vector-only vs hybrid BM25 + vector retrieval')
+    hybrid_parser.add_argument('--size', type=int, default=20000, help='Number of chunks')
+    hybrid_parser.add_argument('--queries', type=int, default=200, help='Number of queries')
+    hybrid_parser.add_argument('--k', type=int, default=5, help='Results per query')
+    hybrid_parser.add_argument('--candidates', type=int, default=50, help='Results per retriever before fusion')
+
+    context_parser = subparsers.add_parser('context', help='Prompt tokens before/after context packing')
+    context_parser.add_argument('--document', default='sample_document.md', help='Document to build the corpus from')
+    context_parser.add_argument('--revisions', type=int, default=5, help='Near-duplicate revisions of the document')
+    context_parser.add_argument('--chunk-tokens', type=int, default=60, help='Words per chunk')
+    context_parser.add_argument('--overlap', type=int, default=15, help='Words repeated between chunks')
+    context_parser.add_argument('--k', type=int, default=8, help='Documents retrieved per question')
+    context_parser.add_argument('--budget', type=int, default=1000, help='Context token budget')
+    context_parser.add_argument('--chunk-budget', type=int, default=120, help='Token cap per document')
+    context_parser.add_argument('--repeat', type=int, default=50, help='Passes over the question set')
+
+    llm_cache_parser = subparsers.add_parser('completion-cache', help='Repeated prompts with and without the completion cache')
+    llm_cache_parser.add_argument('--requests', type=int, default=300, help='Requests to send')
+    llm_cache_parser.add_argument('--questions', type=int, default=50, help='Distinct questions')
+    llm_cache_parser.add_argument('--llm-ms', type=float, default=20.0, help='Simulated LLM latency')
+    llm_cache_parser.add_argument('--db', default='/tmp/benchmark_completion_cache.db', help='SQLite file for the run')
+
+    memory_parser = subparsers.add_parser('memory', help='Conversation history tokens per turn')
+    memory_parser.add_argument('--turns', type=int, default=100, help='Conversation turns')
+    memory_parser.add_argument('--max-tokens', type=int, default=2000, help='Memory token ceiling')
+    memory_parser.add_argument('--summary-ms', type=float, default=200.0, help='Simulated summarization latency')
+
+    prefetch_parser = subparsers.add_parser('prefetch', help='Agent turn latency with and without speculative prefetch')
+    prefetch_parser.add_argument('--turns', type=int, default=100, help='Agent turns')
+    prefetch_parser.add_argument('--llm-ms', type=float, default=50.0, help='Simulated LLM latency per call')
+    prefetch_parser.add_argument('--retrieval-ms', type=float, default=40.0, help='Simulated retrieval latency')
+    prefetch_parser.add_argument('--same', type=float, default=0.6, help='Share of turns searching the question')
+    prefetch_parser.add_argument('--other', type=float, default=0.2, help='Share of turns searching something else')
+
+    embed_parser = subparsers.add_parser('embed', help='Embedding throughput with and without micro-batching')
+    embed_parser.add_argument('--texts', type=int, default=2000, help='Texts to embed')
+    embed_parser.add_argument('--threads', type=int, default=64, help='Concurrent callers')
+    embed_parser.add_argument('--call-ms', type=float, default=20.0, help='Simulated latency per API call')
+    embed_parser.add_argument('--per-text-ms', type=float, default=0.1, help='Simulated latency per text')
+    embed_parser.add_argument('--max-concurrent-calls', type=int, default=4, help='Simulated API concurrency limit')
+
+    load_parser = subparsers.add_parser('load-test', help='Concurrent load against a running web server')
+    load_parser.add_argument('--url', default='http://localhost:5000', help='Server base URL')
+    load_parser.add_argument('--path', default='/api/status', help='Endpoint to request')
+    load_parser.add_argument('--message', default=None,
+                             help='POST this chat message instead of a GET (for /api/chat endpoints)')
+    load_parser.add_argument('--requests', type=int, default=1000, help='Total requests')
+    load_parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once')
+    load_parser.add_argument('--timeout', type=float, default=60.0, help='Per-request timeout in seconds')
+
+    args = parser.parse_args()
+
+    if args.command == 'ann':
+        return bench_ann(args)
+    elif args.command == 'web-overhead':
+        return bench_web_overhead(args)
+    elif args.command == 'hybrid':
+        return bench_hybrid(args)
+    elif args.command == 'context':
+        return bench_context(args)
+    elif args.command == 'completion-cache':
+        return bench_completion_cache(args)
+    elif args.command == 'memory':
+        return bench_memory(args)
+    elif args.command == 'prefetch':
+        return bench_prefetch(args)
+    elif args.command == 'embed':
+        return bench_embed(args)
+    elif args.command == 'load-test':
+        return bench_load_test(args)
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+BM25 Keyword Index for Local Retrieval
+Compact inverted index with CSR postings and vectorized scoring.
+
+Layout of the postings (term ids are assigned in first-seen order):
+    offsets     (n_terms + 1,) int64   postings of term t are offsets[t]:offsets[t + 1]
+    doc_ids     (n_postings,)  int32   documents containing the term, ascending
+    term_freqs  (n_postings,)  float32 occurrences of the term in each document
+    doc_lengths (n_docs,)      float32 tokens per document
+
+A query gathers the postings of its terms, computes every BM25
+contribution in one NumPy expression and sums them per document, so the
+cost scales with the matched postings rather than with the corpus.
+"""
+
+import os
+import re
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ann_index import top_k_indices
+
+# Words, numbers and identifiers such as ERR-1042, user_id, v2.3.1 or gpt-4o
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[._\-/:][a-z0-9]+)*")
+_SPLIT_RE = re.compile(r"[._\-/:]")
+
+MANIFEST_NAME = "bm25.json"
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased keyword tokens.
+
+    Compound identifiers are kept whole and also split into their parts, so
+    "ERR-1042" matches an exact query for the code as well as "error 1042".
+    """
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(part for part in _SPLIT_RE.split(token) if part)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an immutable set of documents.
+
+    Build once with ``build`` (or ``from_texts``), then query with
+    ``search``. ``save``/``open`` store the postings next to a local vector
+    index; opened arrays are memory-mapped like the embeddings.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1 (float): Term-frequency saturation
+            b (float): Document-length normalization (0 = none, 1 = full)
+        """
+        self.k1 = k1
+        self.b = b
+
+        self.vocabulary: Dict[str, int] = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.doc_ids = np.zeros(0, dtype=np.int32)
+        self.term_freqs = np.zeros(0, dtype=np.float32)
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.avg_doc_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], **kwargs) -> "BM25Index":
+        """Build an index over the given documents."""
+        index = cls(**kwargs)
+        index.build(texts)
+        return index
+
+    def build(self, texts: Iterable[str]):
+        """
+        Tokenize the documents and lay out their postings.
+
+        Args:
+            texts (Iterable[str]): Document texts; document ids follow iteration order
+        """
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        term_freqs: List[int] = []
+        doc_lengths: List[int] = []
+
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                doc_ids.append(doc_id)
+                term_freqs.append(count)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        # Stable sort keeps each term's documents in ascending id order
+        order = np.argsort(term_ids, kind='stable')
+        counts = np.bincount(term_ids, minlength=len(vocabulary))
+
+        self.vocabulary = vocabulary
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)[order]
+        self.term_freqs = np.asarray(term_freqs, dtype=np.float32)[order]
+        self.doc_lengths = np.asarray(doc_lengths, dtype=np.float32)
+        self._finalize()
+
+    def _finalize(self):
+        n_docs = len(self.doc_lengths)
+        df = np.diff(self.offsets).astype(np.float32)
+        self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        self.avg_doc_length = float(self.doc_lengths.mean()) if n_docs else 0.0
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k documents for a keyword query.
+
+        Args:
+            query (str): Query text
+            k (int): Number of results
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Document ids and BM25 scores, best first.
+            Documents sharing no term with the query are never returned.
+        """
+        term_ids = {self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary}
+        if not term_ids or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        spans = [(self.offsets[t], self.offsets[t + 1]) for t in term_ids]
+        docs = np.concatenate([self.doc_ids[start:stop] for start, stop in spans])
+        tfs = np.concatenate([self.term_freqs[start:stop] for start, stop in spans])
+        idf = np.repeat(self.idf[list(term_ids)], [stop - start for start, stop in spans])
+
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[docs] / self.avg_doc_length)
+        contributions = idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+        candidates, slots = np.unique(docs, return_inverse=True)
+        scores = np.bincount(slots, weights=contributions).astype(np.float32)
+        best = top_k_indices(scores, k)
+        return candidates[best].astype(np.int64), scores[best]
+
+    def save(self, path: str):
+        """
+        Write the index into a directory (e.g. a local vector index directory).
+
+        Args:
+            path (str): Output directory
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ('offsets', 'doc_ids', 'term_freqs', 'doc_lengths'):
+            np.save(path / f"bm25_{name}.npy", getattr(self, name))
+
+        # Terms in id order; the list position is the id
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        manifest = {"count": len(self), "k1": self.k1, "b": self.b, "terms": terms}
+        tmp = path / (MANIFEST_NAME + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp, path / MANIFEST_NAME)
+
+    @classmethod
+    def open(cls, path: str) -> Optional["BM25Index"]:
+        """
+        Memory-map an index written by ``save``.
+
+        Args:
+            path (str): Index directory
+
+        Returns:
+            Optional[BM25Index]: The index, or None if the directory has none
+        """
+        path = Path(path)
+        if not (path / MANIFEST_NAME).exists():
+            return None
+
+        with open(path / MANIFEST_NAME, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        index = cls(k1=manifest["k1"], b=manifest["b"])
+        index.vocabulary = {term: i for i, term in enumerate(manifest["terms"])}
+        for name in ('offsets', 'doc_ids', 'term_freqs', 'doc_lengths'):
+            setattr(index, name, np.load(path / f"bm25_{name}.npy", mmap_mode='r'))
+        index._finalize()
+        return index
+
+
+def reciprocal_rank_fusion(rankings: List[np.ndarray], k: int = 60) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse ranked id lists by summing 1 / (k + rank) per id.
+
+    Args:
+        rankings (List[np.ndarray]): Ids per ranker, best first
+        k (int): Rank offset that damps the influence of top positions
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Fused ids and scores, best first
+    """
+    rankings = [np.asarray(ranking, dtype=np.int64) for ranking in rankings if len(ranking)]
+    if not rankings:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+    ids = np.concatenate(rankings)
+    weights = np.concatenate([1.0 / (k + np.arange(1, len(r) + 1)) for r in rankings])
+    fused, slots = np.unique(ids, return_inverse=True)
+    scores = np.bincount(slots, weights=weights)
+    # Stable sort: ties keep ascending id order so results are deterministic
+    order = np.argsort(-scores, kind='stable')
+    return fused[order], scores[order]
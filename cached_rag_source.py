@@ -0,0 +1,277 @@
+import os
+import re
+import asyncio
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from rag_source_base import RAGSourceBase
+from embedders import EmbedderBase, HashingEmbedder
+from ttl_cache import TTLCache
+
+
+class CachedRAGSource(RAGSourceBase):
+    """
+    Caching decorator for any RAG source.
+
+    Lookups go through two tiers before reaching the wrapped source:
+
+    1. Exact: keyed on the normalized question and ``num_results``.
+    2. Semantic (opt-in): reuses the results of a cached question whose
+       embedding is within ``similarity_threshold`` cosine similarity of the
+       new one and which fetched at least as many documents.
+
+    Both tiers share one bounded LRU with TTL expiry. The semantic tier is
+    off by default: lexical embeddings can score questions that differ only
+    in an identifier ("error E1042" vs "error E2077") above 0.95, so it is only
+    safe with an embedder that separates them.
+    """
+
+    def __init__(self, source: RAGSourceBase, max_size: int = 1024, ttl: Optional[float] = 3600.0,
+                 similarity_threshold: Optional[float] = None, embedder: Optional[EmbedderBase] = None):
+        """
+        Initialize the cached source.
+
+        Args:
+            source (RAGSourceBase): RAG source to wrap
+            max_size (int): Maximum number of cached questions
+            ttl (float, optional): Seconds before a cached result expires
+            similarity_threshold (float, optional): Minimum cosine similarity for a
+                near-duplicate hit, or None (the default) to disable the semantic tier
+            embedder (EmbedderBase, optional): Embedder for the semantic tier. Defaults
+                to the wrapped source's embedder, or the offline hashing embedder.
+        """
+        self.source = source
+        self.similarity_threshold = similarity_threshold
+        self.embedder = embedder or getattr(source, "embedder", None) or HashingEmbedder()
+
+        self._lock = threading.RLock()
+        self._cache = TTLCache(max_size=max_size, ttl=ttl, on_evict=self._release_slot)
+
+        # One embedding row per cached question, reused through a free list
+        self._embeddings = np.zeros((max_size, self.embedder.dimension), dtype=np.float32)
+        self._slot_keys: List[Optional[Tuple[str, int]]] = [None] * max_size
+        self._slot_num_results = np.zeros(max_size, dtype=np.int64)
+        self._free_slots = list(range(max_size - 1, -1, -1))
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_question(question: str) -> str:
+        """Lowercase, collapse whitespace and drop trailing punctuation."""
+        return re.sub(r"\s+", " ", question.lower()).strip().rstrip("?!. ")
+
+    def _release_slot(self, key: Tuple[str, int], entry: Dict[str, Any]):
+        slot = entry["slot"]
+        if slot is not None:
+            self._slot_keys[slot] = None
+            self._slot_num_results[slot] = 0
+            self._free_slots.append(slot)
+
+    def _lookup(self, key: Tuple[str, int], num_results: int) -> Tuple[Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        """Check both tiers. Returns cached results (or None) and the query embedding if computed."""
+        cached = self._lookup_exact(key)
+        if cached is not None:
+            return cached, None
+
+        query = self._embed_question(key)
+        return self._lookup_semantic(key, num_results, query), query
+
+    def _lookup_exact(self, key: Tuple[str, int]) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self.exact_hits += 1
+                return entry["results"]
+            return None
+
+    def _embed_question(self, key: Tuple[str, int]) -> Optional[np.ndarray]:
+        """Embedding of a normalized question for the semantic tier, or None if it is disabled."""
+        if self.similarity_threshold is None:
+            return None
+        return self.embedder.embed([key[0]])[0]
+
+    def _lookup_semantic(self, key: Tuple[str, int], num_results: int,
+                         query: Optional[np.ndarray]) -> Optional[List[Dict[str, Any]]]:
+        """Results of a cached near-duplicate question; counts the miss if there is none."""
+        if query is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            eligible = self._slot_num_results >= num_results
+            if eligible.any():
+                scores = np.where(eligible, self._embeddings @ query, -1.0)
+                best = int(np.argmax(scores))
+                best_key = self._slot_keys[best]
+                if scores[best] >= self.similarity_threshold and best_key is not None:
+                    entry = self._cache.get(best_key)
+                    if entry is not None:
+                        self.semantic_hits += 1
+                        return entry["results"][:num_results]
+
+            self.misses += 1
+            return None
+
+    def _store(self, key: Tuple[str, int], num_results: int, results: List[Dict[str, Any]],
+               query: Optional[np.ndarray]):
+        # Empty results usually mean the source failed; don't pin them
+        if not results:
+            return
+
+        if query is None:
+            query = self._embed_question(key)
+
+        with self._lock:
+            # Inserting first lets any replaced or LRU-evicted entry hand its
+            # embedding slot back before this entry claims one
+            entry = {"results": results, "slot": None}
+            self._cache.set(key, entry)
+
+            if query is not None and self._free_slots:
+                slot = self._free_slots.pop()
+                self._embeddings[slot] = query
+                self._slot_keys[slot] = key
+                self._slot_num_results[slot] = num_results
+                entry["slot"] = slot
+
+    def retrieve_documents(self, question: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retrieve documents, serving repeated and near-duplicate questions from cache.
+
+        Args:
+            question (str): The question to search for
+            num_results (int): Number of documents to retrieve
+
+        Returns:
+            List[Dict[str, Any]]: List of retrieved documents with metadata
+        """
+        key = (self.normalize_question(question), num_results)
+        cached, query = self._lookup(key, num_results)
+        if cached is not None:
+            return list(cached)
+
+        results = self.source.retrieve_documents(question, num_results)
+        self._store(key, num_results, results, query)
+        return results
+
+    def retrieve_documents_many(self, questions: List[str], num_results: int = 5,
+                                **kwargs) -> List[List[Dict[str, Any]]]:
+        """
+        Batch retrieval that forwards only the cache misses to the wrapped source.
+
+        Args:
+            questions (List[str]): Questions to search for
+            num_results (int): Number of documents to retrieve per question
+            **kwargs: Passed through to the wrapped source (e.g. ``max_concurrency``
+                for sources that run retrievals on a thread pool)
+
+        Returns:
+            List[List[Dict[str, Any]]]: One result list per question, in input order
+        """
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(questions)
+        misses = []
+        for i, question in enumerate(questions):
+            key = (self.normalize_question(question), num_results)
+            cached, query = self._lookup(key, num_results)
+            if cached is not None:
+                results[i] = list(cached)
+            else:
+                misses.append((i, key, query))
+
+        if misses:
+            fetched = self.source.retrieve_documents_many(
+                [questions[i] for i, _, _ in misses], num_results, **kwargs
+            )
+            for (i, key, query), documents in zip(misses, fetched):
+                self._store(key, num_results, documents, query)
+                results[i] = documents
+
+        return results
+
+    async def aretrieve_documents(self, question: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Async retrieval that only awaits the wrapped source on a cache miss.
+
+        The question embedding for the semantic tier runs in a worker thread,
+        since a remote or batching embedder would block the event loop.
+
+        Args:
+            question (str): The question to search for
+            num_results (int): Number of documents to retrieve
+
+        Returns:
+            List[Dict[str, Any]]: List of retrieved documents with metadata
+        """
+        key = (self.normalize_question(question), num_results)
+        cached = self._lookup_exact(key)
+        if cached is not None:
+            return list(cached)
+
+        query = None
+        if self.similarity_threshold is not None:
+            query = await asyncio.to_thread(self._embed_question, key)
+        cached = self._lookup_semantic(key, num_results, query)
+        if cached is not None:
+            return list(cached)
+
+        results = await self.source.aretrieve_documents(question, num_results)
+        self._store(key, num_results, results, query)
+        return results
+
+    def clear(self):
+        """Drop every cached entry and reset counters."""
+        with self._lock:
+            self._cache.clear()
+            self._slot_keys = [None] * self._cache.max_size
+            self._slot_num_results[:] = 0
+            self._free_slots = list(range(self._cache.max_size - 1, -1, -1))
+            self.exact_hits = self.semantic_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers."""
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            hits = self.exact_hits + self.semantic_hits
+            return {
+                "size": len(self._cache),
+                "max_size": self._cache.max_size,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self._cache.evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def get_required_env_vars(self) -> List[str]:
+        """
+        Get the list of required environment variables for the wrapped source.
+
+        Returns:
+            List[str]: List of required environment variable names
+        """
+        return self.source.get_required_env_vars()
+
+
+def with_cache_from_env(source: Optional[RAGSourceBase]) -> Optional[RAGSourceBase]:
+    """
+    Wrap a source in ``CachedRAGSource`` when RAG_CACHE is enabled.
+
+    Settings: RAG_CACHE ("true" to enable), RAG_CACHE_SIZE, RAG_CACHE_TTL
+    (seconds) and RAG_CACHE_SIMILARITY (cosine threshold that enables the
+    semantic tier; "off", the default, keeps the cache exact-only).
+    """
+    if source is None or os.getenv("RAG_CACHE", "false").lower() != "true":
+        return source
+
+    similarity = os.getenv("RAG_CACHE_SIMILARITY", "off")
+    return CachedRAGSource(
+        source,
+        max_size=int(os.getenv("RAG_CACHE_SIZE", "1024")),
+        ttl=float(os.getenv("RAG_CACHE_TTL", "3600")),
+        similarity_threshold=None if similarity.lower() == "off" else float(similarity),
+    )
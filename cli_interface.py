@@ -1,6 +1,8 @@
 import time
 import sys
-from typing import List, Dict, Any
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator
 
 
 class CLIInterface:
@@ -10,6 +12,8 @@ class CLIInterface:
     Provides colored output, loading animations, and formatted display.
     """
     
+    SPINNER_FRAMES = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+    
     # ANSI color codes
     COLORS = {
         'blue': '\033[94m',
@@ -84,15 +88,51 @@ class CLIInterface:
             print(f"{self.color_text('Score:', 'yellow')} {score}")
             print(f"{self.color_text('Content:', 'white')} {display_content}")
     
+    def print_tool_start(self, tool_name: str, arguments: str = ""):
+        """Print that a tool call has started."""
+        self.print_info(f"Using tool: {tool_name}")
+    
+    def print_tool_result(self, tool_name: str, tool_result: Dict[str, Any]):
+        """Print a summary of a finished tool call."""
+        if tool_result.get("success"):
+            results = tool_result.get("results", [])
+            
+            if tool_name == "search_documents":
+                self.print_success(f"Found {len(results)} documents")
+                
+            elif tool_name == "search_web":
+                self.print_success(f"Found {len(results)} web results")
+        else:
+            error = tool_result.get("error", "Unknown error")
+            self.print_warning(f"Tool {tool_name} failed: {error}")
+    
     def print_answer(self, answer: str):
         """Print AI-generated answer."""
         print(f"\n{self.color_text('🤖 AI Answer:', 'green')}")
         print(self.color_text('-' * 50, 'green'))
         print(f"{answer}\n")
     
+    def print_answer_start(self):
+        """Print the answer header before streamed tokens."""
+        print(f"\n{self.color_text('🤖 AI Answer:', 'green')}")
+        print(self.color_text('-' * 50, 'green'))
+    
+    def print_answer_delta(self, delta: str):
+        """Print a streamed piece of the answer as soon as it arrives."""
+        sys.stdout.write(delta)
+        sys.stdout.flush()
+    
+    def print_answer_end(self):
+        """Finish a streamed answer."""
+        print("\n")
+    
     def loading_animation(self, message: str, duration: float = 2.0):
-        """Show a loading animation."""
-        animation = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+        """
+        Show a loading animation for a fixed duration.
+        
+        This blocks the caller; prefer ``spinner`` around real work.
+        """
+        animation = self.SPINNER_FRAMES
         start_time = time.time()
         i = 0
         
@@ -105,6 +145,44 @@ class CLIInterface:
         sys.stdout.write('\r' + ' ' * (len(message) + 10) + '\r')
         sys.stdout.flush()
     
+    @contextmanager
+    def spinner(self, message: str) -> Iterator[None]:
+        """
+        Animate a spinner while the wrapped block runs.
+        
+        The animation runs on a background thread and stops as soon as the
+        block finishes, so it adds no latency. When stdout is not a terminal
+        nothing is drawn at all.
+        
+        Usage:
+            with cli.spinner("Searching knowledge base"):
+                documents = source.retrieve_documents(question)
+        """
+        if not sys.stdout.isatty():
+            yield
+            return
+        
+        done = threading.Event()
+        
+        def animate():
+            i = 0
+            while not done.is_set():
+                frame = self.SPINNER_FRAMES[i % len(self.SPINNER_FRAMES)]
+                sys.stdout.write(f'\r{self.color_text(frame, "cyan")} {message}')
+                sys.stdout.flush()
+                i += 1
+                done.wait(0.1)
+        
+        thread = threading.Thread(target=animate, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+            sys.stdout.write('\r' + ' ' * (len(message) + 10) + '\r')
+            sys.stdout.flush()
+    
     def get_user_input(self, prompt: str = "Enter your question") -> str:
         """Get input from user with colored prompt."""
         try:
@@ -0,0 +1,294 @@
+"""
+LLM Completion Cache
+Opt-in two-tier cache (in-memory LRU + SQLite with TTL) for completion calls.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import litellm
+
+from ttl_cache import TTLCache
+from llm_streaming import stream_completion, astream_completion
+
+# Request parameters that never change the answer
+_IGNORED_PARAMS = ('stream', 'api_key', 'api_base', 'timeout', 'metadata')
+
+_MESSAGE_FIELDS = ('role', 'content', 'name', 'tool_calls', 'tool_call_id', 'function_call')
+
+
+def _as_dict(value: Any) -> Any:
+    """Plain JSON-able structure of a litellm/pydantic object."""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    return value
+
+
+def canonical_messages(messages: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Messages reduced to the fields that affect the answer.
+
+    Empty fields are dropped and text is stripped. Tool call ids are random
+    per response, so they are renumbered in order of appearance. A
+    conversation that repeats the same tool calls then maps to the same key.
+    """
+    ids: Dict[str, str] = {}
+
+    def call_id(value: str) -> str:
+        return ids.setdefault(value, f"call_{len(ids)}")
+
+    canonical = []
+    for message in messages:
+        message = _as_dict(message)
+        entry = {}
+        for field in _MESSAGE_FIELDS:
+            value = message.get(field)
+            if value in (None, '', []):
+                continue
+            if field == 'content' and isinstance(value, str):
+                value = value.strip()
+            elif field == 'tool_call_id':
+                value = call_id(value)
+            elif field == 'tool_calls':
+                value = [
+                    {
+                        'id': call_id(call['id']),
+                        'name': call['function']['name'],
+                        'arguments': call['function']['arguments'],
+                    }
+                    for call in (_as_dict(c) for c in value)
+                ]
+            entry[field] = value
+        canonical.append(entry)
+    return canonical
+
+
+class CompletionCache:
+    """
+    Completion responses keyed on a hash of the canonicalized request.
+
+    Lookups try a per-process LRU first, then an SQLite file in WAL mode
+    that several web workers can share. Each entry remembers how long the
+    original call took, so hits can report the latency they saved.
+    """
+
+    PURGE_EVERY = 100
+
+    def __init__(self, path: Optional[str] = None, max_size: int = 256, ttl: float = 86400.0):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str, optional): SQLite file for the persistent tier. Memory only if omitted.
+            max_size (int): Entries kept in the in-memory tier
+            ttl (float): Seconds an entry stays valid in both tiers
+        """
+        self.path = path
+        self.ttl = ttl
+        self.memory = TTLCache(max_size=max_size, ttl=ttl)
+
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            # The timeout lets concurrent writers from other processes wait their turn
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, latency REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+        self._puts = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    @staticmethod
+    def key(**kwargs) -> str:
+        """
+        Cache key for a completion request.
+
+        Args:
+            **kwargs: Arguments of the ``litellm.completion`` call (model, messages,
+                tools, temperature, ...)
+
+        Returns:
+            str: Hex digest of the canonicalized request
+        """
+        request = {name: _as_dict(value) for name, value in kwargs.items() if name not in _IGNORED_PARAMS}
+        request['messages'] = canonical_messages(kwargs.get('messages') or [])
+        payload = json.dumps(request, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Cached response for a key, counting the hit and the latency it saved.
+
+        Returns:
+            Optional[ModelResponse]: A fresh response object, or None on a miss
+        """
+        start = time.perf_counter()
+        entry = self.memory.get(key)
+        if entry is not None:
+            tier = 'memory'
+        elif self._conn is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, latency FROM completions WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+            entry = tuple(row) if row else None
+            if entry is not None:
+                tier = 'disk'
+                self.memory.set(key, entry)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            if tier == 'memory':
+                self.memory_hits += 1
+            else:
+                self.disk_hits += 1
+            response, latency = entry
+            self.seconds_saved += max(0.0, latency - (time.perf_counter() - start))
+
+        # A new object per hit, so callers can't alter what is cached
+        return litellm.ModelResponse(**json.loads(response))
+
+    def put(self, key: str, response: Any, latency: float):
+        """
+        Store a response.
+
+        Args:
+            key (str): Key from ``key``
+            response (ModelResponse): Completion response
+            latency (float): Seconds the original call took
+        """
+        entry = (json.dumps(_as_dict(response), default=str), latency)
+        self.memory.set(key, entry)
+        if self._conn is None:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, response, latency, expires_at) VALUES (?, ?, ?, ?)",
+                (key, entry[0], latency, time.time() + self.ttl)
+            )
+            self._puts += 1
+            if self._puts % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM completions WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per tier and the latency saved by hits."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "seconds_saved": self.seconds_saved,
+            }
+
+    def close(self):
+        """Close the database connection."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: Optional[CompletionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """
+    The process-wide completion cache, or None unless COMPLETION_CACHE is "true".
+
+    Settings: COMPLETION_CACHE_PATH (SQLite file, default .completion_cache.db;
+    empty for memory only), COMPLETION_CACHE_SIZE (in-memory entries) and
+    COMPLETION_CACHE_TTL (seconds).
+    """
+    global _cache
+    if os.getenv("COMPLETION_CACHE", "false").lower() != "true":
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CompletionCache(
+                    path=os.getenv("COMPLETION_CACHE_PATH", ".completion_cache.db") or None,
+                    max_size=int(os.getenv("COMPLETION_CACHE_SIZE", "256")),
+                    ttl=float(os.getenv("COMPLETION_CACHE_TTL", "86400")),
+                )
+    return _cache
+
+
+def complete(cli, spinner_message: str, stream: bool = False, **kwargs) -> Tuple[Any, bool]:
+    """
+    Call the LLM through the completion cache (when enabled).
+
+    On a hit nothing is printed, even in streaming mode; the caller prints
+    the cached answer like a non-streamed one.
+
+    Args:
+        cli: CLI interface with ``spinner`` (and the answer printers when streaming)
+        spinner_message (str): Message shown while waiting
+        stream (bool): Print answer tokens as they arrive
+        **kwargs: Arguments forwarded to ``litellm.completion``
+
+    Returns:
+        Tuple[Any, bool]: The response and whether its text was already printed
+    """
+    cache = get_completion_cache()
+    key = cache.key(**kwargs) if cache else None
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, False
+
+    start = time.perf_counter()
+    if stream:
+        response, printed = stream_completion(cli, spinner_message, **kwargs)
+    else:
+        with cli.spinner(spinner_message):
+            response, printed = litellm.completion(**kwargs), False
+
+    if cache:
+        cache.put(key, response, time.perf_counter() - start)
+    return response, printed
+
+
+async def acomplete(cli, spinner_message: str, stream: bool = False, **kwargs) -> Tuple[Any, bool]:
+    """Async version of ``complete`` built on ``litellm.acompletion``."""
+    cache = get_completion_cache()
+    key = cache.key(**kwargs) if cache else None
+    if cache:
+        # The database is shared across workers, so a lookup can wait on another
+        # worker's write lock (up to the 30 s busy timeout); keep it off the loop
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached, False
+
+    start = time.perf_counter()
+    if stream:
+        response, printed = await astream_completion(cli, spinner_message, **kwargs)
+    else:
+        with cli.spinner(spinner_message):
+            response, printed = await litellm.acompletion(**kwargs), False
+
+    if cache:
+        await asyncio.to_thread(cache.put, key, response, time.perf_counter() - start)
+    return response, printed
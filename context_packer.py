@@ -0,0 +1,169 @@
+"""
+Token-Budgeted Context Packing for RAG Prompts
+Dedup, trim and order retrieved chunks before they reach the LLM.
+"""
+
+import os
+import re
+import math
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from bm25_index import tokenize, TOKEN_RE
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate LLM token count of a text.
+
+    About four characters per token for English; counting is O(1), so the
+    packer can call it for every sentence and still stay well under a
+    millisecond per request.
+    """
+    return (len(text) + 3) // 4
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences and line-separated items (headings, bullets) of a chunk."""
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+
+
+def _shingles(text: str) -> Set[int]:
+    """Hashed word 3-grams of a text; int sets intersect faster than sets of tuples."""
+    words = text.lower().split()
+    if len(words) < 3:
+        return {hash(tuple(words))}
+    return set(map(hash, zip(words, words[1:], words[2:])))
+
+
+class ContextPacker:
+    """
+    Assembles retrieved documents into a prompt context under a token budget.
+
+    Documents are taken in descending retrieval score. A document whose
+    word 3-gram Jaccard similarity to one already taken reaches
+    ``dedup_threshold`` is dropped. Documents longer than
+    ``max_chunk_tokens`` (or than what is left of the budget) are trimmed
+    to their sentences that best match the question, kept in their
+    original order. Packing stops when the budget is spent.
+    """
+
+    MIN_CHUNK_TOKENS = 24
+
+    def __init__(self, max_tokens: Optional[int] = None, max_chunk_tokens: Optional[int] = None,
+                 dedup_threshold: Optional[float] = None):
+        """
+        Initialize the packer.
+
+        Args:
+            max_tokens (int, optional): Token budget for the whole context.
+                Defaults to CONTEXT_MAX_TOKENS (2000 if unset).
+            max_chunk_tokens (int, optional): Token cap per document. Defaults to
+                CONTEXT_CHUNK_TOKENS (400 if unset).
+            dedup_threshold (float, optional): Jaccard similarity at which a document
+                counts as a near-duplicate. Defaults to CONTEXT_DEDUP_THRESHOLD (0.8 if unset).
+        """
+        # An explicit 0 is a real setting, so only None falls back to the environment
+        self.max_tokens = max_tokens if max_tokens is not None else int(os.getenv("CONTEXT_MAX_TOKENS", "2000"))
+        self.max_chunk_tokens = (max_chunk_tokens if max_chunk_tokens is not None
+                                 else int(os.getenv("CONTEXT_CHUNK_TOKENS", "400")))
+        self.dedup_threshold = (dedup_threshold if dedup_threshold is not None
+                                else float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.8")))
+        self.last_stats: Dict[str, Any] = {}
+
+    def pack(self, documents: List[Dict[str, Any]], question: str = "") -> List[Dict[str, Any]]:
+        """
+        Select and trim documents to fit the token budget.
+
+        Args:
+            documents (List[Dict[str, Any]]): Retrieved documents with content and metadata
+            question (str): The user's question, used to rank sentences for trimming
+
+        Returns:
+            List[Dict[str, Any]]: Packed documents, best first. Trimmed ones carry
+            ``"trimmed": True`` in their metadata. Counters are in ``last_stats``.
+        """
+        start = time.perf_counter()
+        # Stable sort: documents without a score keep their retrieval order, after scored ones
+        ranked = sorted(documents, key=self._sort_key)
+
+        query_terms = set(tokenize(question))
+        kept_shingles: List[Set[int]] = []
+        packed = []
+        remaining = self.max_tokens
+        input_tokens = duplicates = trimmed = 0
+
+        for doc in ranked:
+            content = doc.get('content') or ''
+            tokens = estimate_tokens(content)
+            input_tokens += tokens
+            if remaining < self.MIN_CHUNK_TOKENS or not content.strip():
+                continue
+
+            shingles = _shingles(content)
+            if any(self._jaccard(shingles, seen) >= self.dedup_threshold for seen in kept_shingles):
+                duplicates += 1
+                continue
+            kept_shingles.append(shingles)
+
+            allowance = min(self.max_chunk_tokens, remaining)
+            if tokens > allowance:
+                content = self._trim(content, query_terms, allowance)
+                tokens = estimate_tokens(content)
+                trimmed += 1
+                doc = {**doc, 'content': content, 'metadata': {**(doc.get('metadata') or {}), 'trimmed': True}}
+
+            packed.append(doc)
+            remaining -= tokens
+
+        self.last_stats = {
+            "input_documents": len(documents),
+            "output_documents": len(packed),
+            "input_tokens": input_tokens,
+            "output_tokens": self.max_tokens - remaining,
+            "duplicates": duplicates,
+            "trimmed": trimmed,
+            "ms": (time.perf_counter() - start) * 1000,
+        }
+        return packed
+
+    @staticmethod
+    def _jaccard(a: Set[int], b: Set[int]) -> float:
+        # |a | b| from the sizes, without building the union set
+        common = len(a & b) if len(a) <= len(b) else len(b & a)
+        return common / (len(a) + len(b) - common)
+
+    @staticmethod
+    def _sort_key(doc: Dict[str, Any]) -> float:
+        score = (doc.get('metadata') or {}).get('score')
+        return math.inf if score is None else -score
+
+    @staticmethod
+    def _trim(content: str, query_terms: Set[str], allowance: int) -> str:
+        """Highest-scoring sentences that fit ``allowance`` tokens, in their original order."""
+        sentences = split_sentences(content)
+        # Whole-token matching is enough here; the query side also has identifier parts
+        terms = [set(TOKEN_RE.findall(s.lower())) & query_terms for s in sentences]
+
+        # Terms found in fewer sentences say more about which sentence answers the question
+        frequency: Dict[str, int] = {}
+        for found in terms:
+            for term in found:
+                frequency[term] = frequency.get(term, 0) + 1
+        scores = [sum(1.0 / frequency[t] for t in found) for found in terms]
+
+        chosen = []
+        budget = allowance
+        for i in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+            cost = estimate_tokens(sentences[i]) + 1
+            if cost <= budget:
+                chosen.append(i)
+                budget -= cost
+
+        if not chosen:
+            # Not even one sentence fits: cut the best one at a word boundary
+            best = sentences[max(range(len(sentences)), key=lambda i: (scores[i], -i))]
+            return best[:allowance * 4].rsplit(' ', 1)[0] + " …"
+        return " ".join(sentences[i] for i in sorted(chosen))
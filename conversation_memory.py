@@ -0,0 +1,252 @@
+"""
+Conversation Memory for Multi-Turn Chat
+Recent turns under a token ceiling, older turns folded into a rolling summary.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import litellm
+
+from context_packer import estimate_tokens, split_sentences
+from ttl_cache import TTLCache
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an AI assistant.
+Merge the new turns into the current summary. Keep facts, names, numbers, decisions and open
+questions the assistant may need later; drop greetings and filler. Write compact prose."""
+
+Summarizer = Callable[[str, List[Dict[str, str]], int], str]
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _summary_executor() -> ThreadPoolExecutor:
+    """Process-wide pool that runs summarization off the request path."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summarizer")
+    return _executor
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    """Cut text to about ``max_tokens`` tokens at a word boundary."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[:max_tokens * 4].rsplit(' ', 1)[0] + " …"
+
+
+def llm_summarizer(summary: str, turns: List[Dict[str, str]], max_tokens: int) -> str:
+    """
+    Fold turns into the summary with an LLM call.
+
+    Args:
+        summary (str): Current summary (may be empty)
+        turns (List[Dict[str, str]]): Messages leaving the recent window, oldest first
+        max_tokens (int): Length limit for the new summary
+
+    Returns:
+        str: Updated summary
+    """
+    transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+    response = litellm.completion(
+        model=os.getenv("MEMORY_SUMMARY_MODEL", "openai/gpt-4o-mini"),
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"}
+        ],
+        temperature=0,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content.strip()
+
+
+def extractive_summarizer(summary: str, turns: List[Dict[str, str]], max_tokens: int) -> str:
+    """
+    Offline fallback: the first sentence of each turn, keeping the newest lines that fit.
+
+    Args:
+        summary (str): Current summary (may be empty)
+        turns (List[Dict[str, str]]): Messages leaving the recent window, oldest first
+        max_tokens (int): Length limit for the new summary
+
+    Returns:
+        str: Updated summary
+    """
+    lines = summary.splitlines() if summary else []
+    for turn in turns:
+        sentences = split_sentences(turn['content'])
+        if sentences:
+            lines.append(f"{turn['role'].capitalize()}: {_clip(sentences[0], max_tokens // 4)}")
+
+    kept, used = [], 0
+    for line in reversed(lines):
+        used += estimate_tokens(line) + 1
+        if used > max_tokens:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+
+class ConversationMemory:
+    """
+    Per-session chat history with a hard token ceiling.
+
+    The newest turns are kept verbatim within ``max_tokens - summary_tokens``.
+    When a new turn pushes the window over that budget, the oldest turns
+    leave it at once and are folded into a summary of at most
+    ``summary_tokens`` on a background thread. The prompt never waits for
+    summarization; until a fold finishes, the previous summary is used.
+    The history added to each prompt therefore stays under ``max_tokens``
+    however long the conversation runs.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, summary_tokens: Optional[int] = None,
+                 summarizer: Optional[Summarizer] = None):
+        """
+        Initialize the memory.
+
+        Args:
+            max_tokens (int, optional): Ceiling for summary plus recent turns.
+                Defaults to MEMORY_MAX_TOKENS (2000 if unset).
+            summary_tokens (int, optional): Part of the ceiling reserved for the summary.
+                Defaults to MEMORY_SUMMARY_TOKENS (400 if unset).
+            summarizer (Callable, optional): ``(summary, turns, max_tokens) -> summary``.
+                Defaults to an LLM summarizer that falls back to an extractive one on errors.
+        """
+        self.max_tokens = max_tokens or int(os.getenv("MEMORY_MAX_TOKENS", "2000"))
+        self.summary_tokens = min(summary_tokens or int(os.getenv("MEMORY_SUMMARY_TOKENS", "400")),
+                                  self.max_tokens // 2)
+        self.recent_tokens = self.max_tokens - self.summary_tokens
+        self.summarizer = summarizer or llm_summarizer
+
+        self.summary = ""
+        self._recent: List[Dict[str, str]] = []
+        self._recent_size = 0
+        self._pending: List[Dict[str, str]] = []
+        self._future: Optional[Future] = None
+        self._generation = 0  # bumped by clear() so a fold already running is discarded
+        self._lock = threading.Lock()
+        self.folds = 0
+
+    def messages(self) -> List[Dict[str, str]]:
+        """
+        History to place between the system prompt and the new user message.
+
+        Returns:
+            List[Dict[str, str]]: A summary system message (once there is one) and the recent turns
+        """
+        with self._lock:
+            history = [dict(message) for message in self._recent]
+            if self.summary:
+                history.insert(0, {"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"})
+            return history
+
+    def tokens(self) -> int:
+        """Estimated tokens that ``messages`` adds to a prompt."""
+        with self._lock:
+            return self._recent_size + estimate_tokens(self.summary)
+
+    def add_turn(self, user_message: str, assistant_message: str):
+        """
+        Record a completed turn, evicting old turns into the summary if needed.
+
+        Args:
+            user_message (str): The user's message
+            assistant_message (str): The final answer
+        """
+        # One side of a turn can take at most half the window
+        cap = self.recent_tokens // 2
+        turn = [
+            {"role": "user", "content": _clip(user_message, cap)},
+            {"role": "assistant", "content": _clip(assistant_message or "", cap)},
+        ]
+
+        with self._lock:
+            self._recent.extend(turn)
+            self._recent_size += sum(estimate_tokens(m['content']) for m in turn)
+            while self._recent_size > self.recent_tokens and len(self._recent) > 2:
+                evicted = self._recent.pop(0)
+                self._recent_size -= estimate_tokens(evicted['content'])
+                self._pending.append(evicted)
+            self._schedule()
+
+    def _schedule(self):
+        """Start a fold of the pending turns unless one is running. Caller holds the lock."""
+        if self._future is None and self._pending:
+            batch, self._pending = self._pending, []
+            self._future = _summary_executor().submit(self._fold, batch, self._generation)
+
+    def _fold(self, batch: List[Dict[str, str]], generation: int):
+        # Folds are serialized per session, so reading self.summary here is safe
+        try:
+            summary = self.summarizer(self.summary, batch, self.summary_tokens)
+        except Exception as e:
+            print(f"⚠️ Conversation summary failed, using extractive fallback: {e}")
+            summary = extractive_summarizer(self.summary, batch, self.summary_tokens)
+
+        with self._lock:
+            if generation == self._generation:
+                self.summary = _clip(summary, self.summary_tokens)
+                self.folds += 1
+            self._future = None
+            self._schedule()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until pending turns are folded into the summary (for tests and benchmarks)."""
+        while True:
+            with self._lock:
+                future = self._future
+            if future is None:
+                return
+            future.result(timeout)
+
+    def clear(self):
+        """Forget the conversation, including any summary fold still running."""
+        with self._lock:
+            self._generation += 1
+            self.summary = ""
+            self._recent = []
+            self._recent_size = 0
+            self._pending = []
+
+
+class ConversationSessions:
+    """
+    Conversation memories for web sessions, keyed by a server-issued session id.
+
+    Idle sessions expire after ``ttl`` seconds, and at most ``max_sessions``
+    are kept (least recently used first out).
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize the session store.
+
+        Args:
+            max_sessions (int, optional): Sessions kept. Defaults to MEMORY_MAX_SESSIONS (1000 if unset).
+            ttl (float, optional): Idle seconds before a session is dropped.
+                Defaults to MEMORY_SESSION_TTL (3600 if unset).
+        """
+        self._sessions = TTLCache(
+            max_size=max_sessions or int(os.getenv("MEMORY_MAX_SESSIONS", "1000")),
+            ttl=ttl or float(os.getenv("MEMORY_SESSION_TTL", "3600"))
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> ConversationMemory:
+        """The memory of a session, created on first use. Each access renews its TTL."""
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is None:
+                memory = ConversationMemory()
+            # Re-setting restarts the idle timer
+            self._sessions.set(session_id, memory)
+            return memory
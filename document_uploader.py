@@ -6,10 +6,17 @@ Supports multiple file formats and uploads to Vectorize
 
 import os
 import json
+import time
+import threading
 import mimetypes
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
+import urllib3
 import vectorize_client as v
+from upload_manifest import UploadManifest, snapshot_file
+from file_walker import walk_files
+from resumable_upload import ResumableUploader
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,17 +34,56 @@ class DocumentUploader:
         '.csv': 'text/csv'
     }
     
-    def __init__(self):
-        """Initialize uploader with Vectorize credentials."""
+    def __init__(self, concurrency: int = 8, manifest_path: Optional[str] = None, force: bool = False,
+                 chunk_size: int = 8 * 1024 * 1024, journal_path: Optional[str] = None,
+                 resumable: Optional[bool] = None):
+        """
+        Initialize uploader with Vectorize credentials.
+        
+        Args:
+            concurrency (int): Files uploaded in parallel by upload_files/upload_folder
+            manifest_path (str, optional): Upload manifest database. Defaults to
+                UPLOAD_MANIFEST or .upload_manifest.db in the working directory.
+            force (bool): Re-upload files even when the manifest says they are unchanged
+            chunk_size (int): Files larger than this are uploaded in resumable chunks
+                (if ``resumable``)
+            journal_path (str, optional): Resume journal for chunked uploads. Defaults
+                to UPLOAD_JOURNAL or .upload_journal.json in the working directory.
+            resumable (bool, optional): Whether the upload URLs accept resumable
+                ``Content-Range`` chunks. Defaults to UPLOAD_RESUMABLE ("false").
+        """
         self.org_id = os.getenv("VECTORIZE_ORGANIZATION_ID")
         self.access_token = os.getenv("VECTORIZE_PIPELINE_ACCESS_TOKEN")
         
         if not self.org_id or not self.access_token:
             raise ValueError("Missing Vectorize credentials!")
         
-        # Initialize API
-        self.api = v.ApiClient(v.Configuration(access_token=self.access_token))
+        self.concurrency = max(1, concurrency)
+        
+        # Initialize API, with a connection pool large enough for every worker
+        configuration = v.Configuration(access_token=self.access_token)
+        configuration.connection_pool_maxsize = max(configuration.connection_pool_maxsize or 0, self.concurrency)
+        self.api = v.ApiClient(configuration)
         self.files_api = v.FilesApi(self.api)
+        
+        # Shared by every file PUT so connections to the storage host are reused
+        self.http = urllib3.PoolManager(maxsize=self.concurrency)
+        if resumable is None:
+            resumable = os.getenv("UPLOAD_RESUMABLE", "false").lower() == "true"
+        self.resumable = ResumableUploader(
+            self.http,
+            chunk_size=chunk_size,
+            journal_path=journal_path or os.getenv("UPLOAD_JOURNAL", ".upload_journal.json"),
+            progress=self._print_progress,
+            resumable=resumable
+        )
+        # Progress is reported from the upload worker threads
+        self._progress_lock = threading.Lock()
+        self._progress_steps: Dict[str, int] = {}
+        
+        # Record of what was already uploaded, so re-runs only send changes
+        self.force = force
+        self.manifest = UploadManifest(manifest_path or os.getenv("UPLOAD_MANIFEST", ".upload_manifest.db"))
     
     def upload_file(self, file_path: str) -> bool:
         """Upload a single file to Vectorize."""
@@ -57,69 +103,153 @@ class DocumentUploader:
             
             print(f"📤 Uploading: {file_path.name}")
             
-            # Start file upload
-            response = self.files_api.start_file_upload(
-                self.org_id,
-                start_file_upload_request=v.StartFileUploadRequest(
-                    content_type=content_type,
-                    name=file_path.name
+            # Start file upload (skipped when a journaled upload can be resumed)
+            def start_upload() -> str:
+                response = self.files_api.start_file_upload(
+                    self.org_id,
+                    start_file_upload_request=v.StartFileUploadRequest(
+                        content_type=content_type,
+                        name=file_path.name
+                    )
                 )
-            )
-            
-            # Upload file data
-            import urllib3
-            http = urllib3.PoolManager()
+                return response.upload_url
             
-            with open(file_path, "rb") as f:
-                upload_response = http.request(
-                    "PUT", 
-                    response.upload_url, 
-                    body=f,
-                    headers={
-                        "Content-Type": content_type,
-                        "Content-Length": str(file_path.stat().st_size)
-                    }
-                )
-            
-            if upload_response.status == 200:
+            # Upload file data, in resumable chunks if it is large and the target supports them
+            if self.resumable.upload(str(file_path), content_type, start_upload):
                 print(f"✅ Upload successful: {file_path.name}")
                 return True
-            else:
-                print(f"❌ Upload failed: {upload_response.status}")
-                return False
+            return False
                 
         except Exception as e:
             print(f"❌ Error uploading {file_path}: {e}")
             return False
     
-    def upload_folder(self, folder_path: str) -> Dict[str, bool]:
-        """Upload all supported files from folder."""
+    def _print_progress(self, path: str, sent: int, total: int):
+        """Print progress of large uploads in 10% steps."""
+        if total <= self.resumable.chunk_size:
+            return
+        step = sent * 10 // total
+        with self._progress_lock:
+            advanced = step > self._progress_steps.get(path, 0)
+            if advanced:
+                self._progress_steps[path] = step
+            if sent >= total:
+                self._progress_steps.pop(path, None)
+        if advanced:
+            print(f"⏫ {os.path.basename(path)}: {step * 10}% ({sent / 1e6:.0f}/{total / 1e6:.0f} MB)")
+    
+    def upload_folder(self, folder_path: str, include: Optional[List[str]] = None,
+                      exclude: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Upload all supported files under a folder, including subfolders.
+        
+        Uploads start as soon as the walk finds the first file.
+        
+        Args:
+            folder_path (str): Folder to upload from
+            include (List[str], optional): Glob patterns files must match
+            exclude (List[str], optional): Glob patterns for files and folders to skip
+            
+        Returns:
+            Dict[str, bool]: Upload success per file path
+        """
         folder_path = Path(folder_path)
         
-        if not folder_path.exists():
+        if not folder_path.is_dir():
             print(f"❌ Folder not found: {folder_path}")
             return {}
         
-        results = {}
-        files_found = []
+        print(f"📁 Scanning {folder_path} and uploading files as they are found")
         
-        # Find all supported files
-        for suffix in self.SUPPORTED_FORMATS.keys():
-            files_found.extend(folder_path.glob(f"*{suffix}"))
+        files = walk_files(str(folder_path), self.SUPPORTED_FORMATS.keys(), include, exclude)
+        results = self.upload_files(files)
         
-        if not files_found:
+        if not results:
             print(f"❌ No supported files found in {folder_path}")
-            return {}
+        return results
+    
+    def _sync_file(self, file_path: str):
+        """
+        Upload one file unless the manifest shows it unchanged.
+        
+        Returns:
+            Tuple[bool, bool]: Success, and whether the upload was skipped
+        """
+        snapshot = None
+        if not self.force:
+            try:
+                unchanged, snapshot = self.manifest.check(self.org_id, file_path)
+            except OSError:
+                unchanged = False  # upload_file reports the missing file
+            if unchanged:
+                return True, True
+        
+        # Taken before the upload, so edits made while it runs are seen as changes next time.
+        # The upload then reads the file from the page cache the hash just filled.
+        if snapshot is None:
+            try:
+                snapshot = snapshot_file(file_path)
+            except OSError:
+                pass  # upload_file reports the missing file
+        
+        if not self.upload_file(file_path):
+            return False, False
+        self.manifest.record(self.org_id, file_path, snapshot)
+        return True, False
+    
+    def upload_files(self, file_paths: Iterable[str], concurrency: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Upload files in parallel and report aggregate throughput.
+        
+        Files recorded in the manifest with the same size and mtime (or,
+        failing that, the same content hash) are skipped and count as
+        successful. ``file_paths`` is consumed lazily with at most two
+        pending files per worker, so a generator (e.g. a folder walk) is
+        never materialized.
+        
+        Args:
+            file_paths (Iterable[str]): Files to upload
+            concurrency (int, optional): Worker count, defaults to the uploader's setting
+            
+        Returns:
+            Dict[str, bool]: Upload success per file path, in input order
+        """
+        workers = max(1, concurrency or self.concurrency)
+        results: Dict[str, bool] = {}
+        uploaded = skipped = uploaded_bytes = 0
         
-        print(f"📁 Found {len(files_found)} files to upload")
+        def collect(done):
+            nonlocal uploaded, skipped, uploaded_bytes
+            for future in done:
+                path = pending.pop(future)
+                ok, was_skipped = future.result()
+                results[path] = ok
+                if was_skipped:
+                    skipped += 1
+                elif ok:
+                    uploaded += 1
+                    try:
+                        uploaded_bytes += os.path.getsize(path)
+                    except OSError:
+                        pass  # removed since the upload
         
-        # Upload each file
-        for file_path in files_found:
-            success = self.upload_file(str(file_path))
-            results[str(file_path)] = success
+        start = time.perf_counter()
+        pending = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path in map(str, file_paths):
+                if path in results:
+                    continue
+                results[path] = False  # keeps input order in the returned dict
+                pending[pool.submit(self._sync_file, path)] = path
+                if len(pending) >= 2 * workers:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            collect(wait(pending).done)
+        elapsed = time.perf_counter() - start
         
         # Summary
-        successful = sum(results.values())
-        print(f"📊 Uploaded {successful}/{len(files_found)} files successfully")
+        if results:
+            print(f"📊 Uploaded {sum(results.values())}/{len(results)} files successfully ({skipped} unchanged, skipped)")
+            print(f"⚡ {elapsed:.1f}s, {uploaded / elapsed:.1f} files/s, "
+                  f"{uploaded_bytes / elapsed / 1e6:.2f} MB/s ({workers} workers)")
         
-        return results 
\ No newline at end of file
+        return results
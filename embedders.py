@@ -0,0 +1,240 @@
+"""
+Text Embedders for Local Retrieval
+Pluggable embedding backends used by the local vector store.
+"""
+
+import os
+import re
+import math
+import hashlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+
+
+class EmbedderBase(ABC):
+    """
+    Abstract base class for text embedders.
+
+    Every embedder returns a float32 matrix with one L2-normalized row per
+    input text, so cosine similarity is a plain dot product.
+    """
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Size of each embedding vector."""
+        pass
+
+    @property
+    def name(self) -> str:
+        """Identifier stored alongside an index so queries use a matching embedder."""
+        return f"{type(self).__name__}-{self.dimension}"
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            np.ndarray: Array of shape (len(texts), dimension), dtype float32
+        """
+        pass
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row in place, leaving all-zero rows untouched."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+class HashingEmbedder(EmbedderBase):
+    """
+    Deterministic offline embedder based on the hashing trick.
+
+    Word unigrams and bigrams are hashed into a fixed number of signed
+    buckets. No model download or network access is needed, which makes it
+    useful for tests and air-gapped setups.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, dimension: int = 512, use_bigrams: bool = True):
+        """
+        Initialize the hashing embedder.
+
+        Args:
+            dimension (int): Number of hash buckets (embedding size)
+            use_bigrams (bool): Whether to add word bigram features
+        """
+        if dimension <= 0:
+            raise ValueError("dimension must be positive")
+        self._dimension = dimension
+        self.use_bigrams = use_bigrams
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercase word tokenization shared by all hashing features."""
+        return self.TOKEN_PATTERN.findall(text.lower())
+
+    def _features(self, text: str) -> List[str]:
+        tokens = self.tokenize(text)
+        features = list(tokens)
+        if self.use_bigrams:
+            features.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        return features
+
+    def _bucket(self, feature: str):
+        # blake2b is stable across processes, unlike the salted built-in hash()
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self._dimension, 1.0 if (value >> 63) & 1 else -1.0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self._dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                bucket, sign = self._bucket(feature)
+                matrix[row, bucket] += sign
+        return normalize_rows(matrix)
+
+
+class TfidfEmbedder(HashingEmbedder):
+    """
+    Deterministic offline TF-IDF embedder over hashed features.
+
+    Features are hashed exactly like ``HashingEmbedder``. Each one is
+    weighted by sublinear term frequency (1 + log tf) and by the inverse
+    document frequency of its bucket, learned with ``fit``. Until fitted,
+    every IDF is 1. The name includes a digest of the IDF table, so an
+    index built with one fit can't be queried with another.
+    """
+
+    def __init__(self, dimension: int = 512, use_bigrams: bool = True, idf_path: Optional[str] = None):
+        """
+        Initialize the TF-IDF embedder.
+
+        Args:
+            dimension (int): Number of hash buckets (embedding size)
+            use_bigrams (bool): Whether to add word bigram features
+            idf_path (str, optional): .npy file written by ``save`` to load IDF weights from
+        """
+        super().__init__(dimension, use_bigrams)
+        self.idf = np.ones(dimension, dtype=np.float32)
+        self._fitted = False
+        if idf_path:
+            self.idf = np.load(idf_path).astype(np.float32)
+            if self.idf.shape != (dimension,):
+                raise ValueError(f"IDF table in {idf_path} does not match dimension {dimension}")
+            self._fitted = True
+
+    @property
+    def fitted(self) -> bool:
+        """Whether IDF weights were learned or loaded (otherwise every IDF is 1)."""
+        return self._fitted
+
+    @property
+    def name(self) -> str:
+        if not self._fitted:
+            return super().name
+        digest = hashlib.blake2b(self.idf.tobytes(), digest_size=4).hexdigest()
+        return f"{super().name}-{digest}"
+
+    def fit(self, texts: List[str]) -> "TfidfEmbedder":
+        """
+        Learn smoothed IDF weights from a corpus.
+
+        Args:
+            texts (List[str]): Corpus documents or chunks
+
+        Returns:
+            TfidfEmbedder: self
+        """
+        document_frequency = np.zeros(self._dimension, dtype=np.float64)
+        for text in texts:
+            buckets = {self._bucket(feature)[0] for feature in set(self._features(text))}
+            document_frequency[list(buckets)] += 1
+        n = len(texts)
+        self.idf = (np.log((1 + n) / (1 + document_frequency)) + 1).astype(np.float32)
+        self._fitted = True
+        return self
+
+    def save(self, path: str):
+        """Write the IDF table to a .npy file."""
+        np.save(path, self.idf)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self._dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in Counter(self._features(text)).items():
+                bucket, sign = self._bucket(feature)
+                matrix[row, bucket] += sign * (1.0 + math.log(count)) * self.idf[bucket]
+        return normalize_rows(matrix)
+
+
+class LiteLLMEmbedder(EmbedderBase):
+    """
+    Embedder backed by a hosted embedding model through LiteLLM.
+    """
+
+    def __init__(self, model: str = "openai/text-embedding-3-small", dimension: int = 1536):
+        """
+        Initialize the LiteLLM embedder.
+
+        Args:
+            model (str): LiteLLM embedding model name
+            dimension (int): Embedding size returned by the model
+        """
+        self.model = model
+        self._dimension = dimension
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}-{self._dimension}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+
+        from litellm import embedding
+
+        response = embedding(model=self.model, input=texts)
+        vectors = [item["embedding"] for item in response.data]
+        return normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+
+def get_embedder(kind: str = "hashing", idf_path: Optional[str] = None) -> EmbedderBase:
+    """
+    Build an embedder by name.
+
+    Args:
+        kind (str): "hashing" or "tfidf" for offline embedders, "openai" for LiteLLM.
+        idf_path (str, optional): IDF table for the TF-IDF embedder, usually the one
+            saved with an index (see ``index_storage.index_idf_path``).
+            TFIDF_IDF_PATH, if set, takes precedence.
+
+    Returns:
+        EmbedderBase: Configured embedder instance
+    """
+    if kind == "hashing":
+        return HashingEmbedder()
+    elif kind == "tfidf":
+        return TfidfEmbedder(idf_path=os.getenv("TFIDF_IDF_PATH") or idf_path)
+    elif kind == "openai":
+        return LiteLLMEmbedder()
+    else:
+        raise ValueError(f"Unsupported embedder: {kind}")
@@ -0,0 +1,300 @@
+import os
+import time
+import queue
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from embedders import EmbedderBase
+
+
+class _EmbedRequest:
+    """Texts from one caller, plus the slot its vectors are delivered to."""
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.vectors: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class BatchingEmbedder(EmbedderBase):
+    """
+    Coalesces concurrent ``embed`` calls into micro-batches.
+
+    Callers on any thread enqueue their texts and block. A worker thread
+    takes the first pending request, waits up to ``max_wait`` seconds for
+    more to arrive (or until ``batch_size`` texts are queued), embeds them
+    in one call to the wrapped embedder and hands each caller its rows.
+    With ``workers`` > 1, that many batches can be in flight at once.
+
+    ``batch_size`` adapts to observed latency: it doubles while full
+    batches finish under half of ``target_latency`` and halves when a batch
+    takes longer than ``target_latency``.
+    """
+
+    def __init__(self, embedder: EmbedderBase, max_batch_size: int = 256, min_batch_size: int = 8,
+                 max_wait: float = 0.005, target_latency: float = 0.5, workers: int = 2):
+        """
+        Initialize the batching embedder.
+
+        Args:
+            embedder (EmbedderBase): Embedder that does the actual work
+            max_batch_size (int): Upper bound for the adaptive batch size
+            min_batch_size (int): Lower bound for the adaptive batch size
+            max_wait (float): Seconds the first request in a batch waits for company
+            target_latency (float): Seconds one wrapped ``embed`` call should take
+            workers (int): Batches embedded concurrently
+        """
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.min_batch_size = min(min_batch_size, max_batch_size)
+        self.max_wait = max_wait
+        self.target_latency = target_latency
+        self.batch_size = max(self.min_batch_size, min(64, max_batch_size))
+
+        self.workers = max(1, workers)
+        self._queue: "queue.Queue[_EmbedRequest]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.texts_embedded = 0
+        self.total_latency = 0.0
+
+    @property
+    def dimension(self) -> int:
+        return self.embedder.dimension
+
+    @property
+    def name(self) -> str:
+        # Batching doesn't change the vectors, so indexes stay compatible
+        return self.embedder.name
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        self._ensure_worker()
+        request = _EmbedRequest(list(texts))
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def _ensure_worker(self):
+        if not self._threads:
+            with self._lock:
+                if not self._threads:
+                    for i in range(self.workers):
+                        thread = threading.Thread(target=self._run, name=f"embedding-batcher-{i}", daemon=True)
+                        thread.start()
+                        self._threads.append(thread)
+
+    def _collect(self) -> List[_EmbedRequest]:
+        """Block for one request, then gather more until the batch is full or max_wait passes."""
+        batch = [self._queue.get()]
+        count = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            count += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for request in batch for text in request.texts]
+            try:
+                parts = []
+                for start in range(0, len(texts), self.batch_size):
+                    chunk = texts[start:start + self.batch_size]
+                    call_start = time.perf_counter()
+                    parts.append(self.embedder.embed(chunk))
+                    self._adapt(len(chunk), time.perf_counter() - call_start)
+                vectors = np.concatenate(parts)
+            except BaseException as e:
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            offset = 0
+            for request in batch:
+                request.vectors = vectors[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+                request.done.set()
+
+    def _adapt(self, size: int, latency: float):
+        with self._lock:
+            self.batches += 1
+            self.texts_embedded += size
+            self.total_latency += latency
+            if latency > self.target_latency:
+                self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+            elif size >= self.batch_size and latency < self.target_latency / 2:
+                self.batch_size = min(self.max_batch_size, self.batch_size * 2)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batching counters."""
+        return {
+            "batches": self.batches,
+            "texts": self.texts_embedded,
+            "avg_batch_size": self.texts_embedded / self.batches if self.batches else 0.0,
+            "batch_size": self.batch_size,
+            "avg_latency": self.total_latency / self.batches if self.batches else 0.0,
+        }
+
+
+class EmbeddingCache:
+    """
+    SQLite store of embeddings keyed by a hash of (embedder name, text).
+
+    Vectors are stored as raw float32 bytes, so a lookup costs one indexed
+    read per text and no parsing.
+    """
+
+    LOOKUP_CHUNK = 500
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        self._conn.commit()
+
+    @staticmethod
+    def key(embedder_name: str, text: str) -> str:
+        return hashlib.sha256(f"{embedder_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for the given keys; missing keys are left out."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self.LOOKUP_CHUNK):
+                chunk = keys[start:start + self.LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """Store vectors by key."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items.items()]
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbedder(EmbedderBase):
+    """
+    Embedder wrapper that serves repeated texts from an ``EmbeddingCache``.
+
+    Only texts missing from the cache reach the wrapped embedder, each
+    distinct text once per call.
+    """
+
+    def __init__(self, embedder: EmbedderBase, cache: EmbeddingCache):
+        """
+        Initialize the cached embedder.
+
+        Args:
+            embedder (EmbedderBase): Embedder for cache misses
+            cache (EmbeddingCache): Persistent vector cache
+        """
+        self.embedder = embedder
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def dimension(self) -> int:
+        return self.embedder.dimension
+
+    @property
+    def name(self) -> str:
+        return self.embedder.name
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        keys = [EmbeddingCache.key(self.embedder.name, text) for text in texts]
+        found = self.cache.get_many(list(set(keys)))
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        if missing:
+            vectors = self.embedder.embed(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(fresh)
+            found.update(fresh)
+
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+
+        matrix = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for row, key in enumerate(keys):
+            matrix[row] = found[key]
+        return matrix
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def with_embedding_service_from_env(embedder: EmbedderBase) -> EmbedderBase:
+    """
+    Wrap an embedder in the batching and disk-cache layers configured by env.
+
+    Settings: EMBEDDING_CACHE_PATH (SQLite file; enables the disk cache),
+    EMBEDDING_BATCHING ("true" to coalesce concurrent calls),
+    EMBEDDING_MAX_BATCH and EMBEDDING_MAX_WAIT_MS.
+    """
+    if os.getenv("EMBEDDING_BATCHING", "false").lower() == "true":
+        embedder = BatchingEmbedder(
+            embedder,
+            max_batch_size=int(os.getenv("EMBEDDING_MAX_BATCH", "256")),
+            max_wait=float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5")) / 1000,
+        )
+
+    # The cache sits in front, so only misses are queued for batching
+    cache_path = os.getenv("EMBEDDING_CACHE_PATH")
+    if cache_path:
+        embedder = CachedEmbedder(embedder, EmbeddingCache(cache_path))
+
+    return embedder
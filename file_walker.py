@@ -0,0 +1,71 @@
+import os
+from fnmatch import fnmatch
+from typing import Iterable, Iterator, Optional
+
+
+def _matches(rel_path: str, name: str, patterns: Iterable[str]) -> bool:
+    """Match a glob pattern against the relative path or the bare name."""
+    return any(fnmatch(rel_path, pattern) or fnmatch(name, pattern) for pattern in patterns)
+
+
+def walk_files(root: str, suffixes: Optional[Iterable[str]] = None, include: Optional[Iterable[str]] = None,
+               exclude: Optional[Iterable[str]] = None, follow_symlinks: bool = True) -> Iterator[str]:
+    """
+    Recursively yield file paths under ``root`` in a single pass.
+
+    Directories are read lazily with ``os.scandir``, so paths are yielded
+    while the walk is still in progress and files are never collected in
+    a list. Memory grows with the number of directories, not files: the
+    pending-directory stack and the set of visited directories hold one
+    entry per directory. Every directory is walked at most once, even if
+    symlinks reach it by several paths: its (st_dev, st_ino) is
+    remembered, which also breaks symlink loops.
+
+    Args:
+        root (str): Directory to walk
+        suffixes (Iterable[str], optional): File suffixes to keep (e.g. ".pdf"), case-insensitive
+        include (Iterable[str], optional): Glob patterns a file must match (relative path or name)
+        exclude (Iterable[str], optional): Glob patterns for files and directories to skip
+        follow_symlinks (bool): Descend into symlinked directories and yield symlinked files
+
+    Yields:
+        str: Path of each matching file
+    """
+    suffixes = tuple(s.lower() for s in suffixes) if suffixes else None
+    include = list(include or [])
+    exclude = list(exclude or [])
+
+    root_stat = os.stat(root)
+    visited = {(root_stat.st_dev, root_stat.st_ino)}
+    stack = [root]
+
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel_path = os.path.relpath(entry.path, root).replace(os.sep, "/")
+                    if exclude and _matches(rel_path, entry.name, exclude):
+                        continue
+
+                    try:
+                        if entry.is_dir(follow_symlinks=follow_symlinks):
+                            st = entry.stat(follow_symlinks=True)
+                            key = (st.st_dev, st.st_ino)
+                            if key not in visited:
+                                visited.add(key)
+                                stack.append(entry.path)
+                            continue
+
+                        if not entry.is_file(follow_symlinks=follow_symlinks):
+                            continue
+                    except OSError:
+                        continue  # broken symlink or vanished entry
+
+                    if suffixes and not entry.name.lower().endswith(suffixes):
+                        continue
+                    if include and not _matches(rel_path, entry.name, include):
+                        continue
+                    yield entry.path
+        except OSError as e:
+            print(f"⚠️ Cannot read {directory}: {e}")
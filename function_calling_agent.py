@@ -6,15 +6,71 @@ An AI agent that can use tools to search documents and the web
 
 import os
 import json
-from typing import List, Dict, Any, Optional
-from litellm import completion
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 from agent_tools import AgentTools
 from cli_interface import CLIInterface
+from completion_cache import complete, acomplete
+from conversation_memory import ConversationMemory
+from bm25_index import tokenize
 
 load_dotenv()
 
 
+class PrefetchStats:
+    """
+    Counters for speculative document prefetch.
+
+    Each agent keeps its own unless one is injected; the web app's
+    ``AgentComponents`` shares one across its per-request agents.
+
+    Every prefetch ends as a hit (the model searched documents with a
+    matching query and got the prefetched result), a miss (it searched
+    with a query the prefetch doesn't cover, or the prefetch overran the
+    tool timeout) or unused (it didn't search documents at all, or the
+    turn failed before the tools ran).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.unused = 0
+        self.seconds_saved = 0.0
+
+    def record(self, outcome: str, seconds_saved: float = 0.0):
+        """Count one prefetch outcome: "hits", "misses" or "unused"."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.seconds_saved += seconds_saved
+
+    def stats(self) -> Dict[str, Any]:
+        """Outcome counters, hit rate and retrieval time hidden behind the first completion."""
+        with self._lock:
+            prefetches = self.hits + self.misses + self.unused
+            return {
+                "prefetches": prefetches,
+                "hits": self.hits,
+                "misses": self.misses,
+                "unused": self.unused,
+                "hit_rate": self.hits / prefetches if prefetches else 0.0,
+                "seconds_saved": self.seconds_saved,
+            }
+
+
+class _Prefetch:
+    """A speculative search for one turn; its outcome is recorded exactly once."""
+
+    def __init__(self, query: str, future):
+        self.query = query
+        self.future = future  # concurrent Future or asyncio.Task of (result, seconds)
+        self.settled = False
+
+
 class FunctionCallingAgent:
     """
     AI Agent with function calling capabilities.
@@ -22,14 +78,69 @@ class FunctionCallingAgent:
     This agent can:
     1. Search through RAG documents (Tool 1)
     2. Search the web for current information (Tool 2)
+    
+    ``chat_with_tools`` runs tools on a thread pool; ``achat_with_tools``
+    runs the same turn on the event loop for the async web server.
+    
+    With speculative prefetch, ``search_documents(user_message)`` starts
+    alongside the first completion. If the model then asks for a document
+    search the prefetch covers, its result is used instead of a new
+    retrieval; otherwise it is discarded.
     """
     
-    def __init__(self, cli: CLIInterface):
-        """Initialize the function calling agent."""
+    MODEL = "openai/gpt-4o"
+    
+    # search_documents' default, so most model searches fit in a prefetch
+    PREFETCH_RESULTS = 5
+    
+    # System message to guide the agent
+    SYSTEM_MESSAGE = """You are a helpful AI assistant with access to tools:
+
+1. search_documents: Search through uploaded documents
+2. search_web: Search the internet for current information
+
+Use tools when appropriate to provide better answers."""
+    
+    def __init__(self, cli: CLIInterface, max_tool_workers: int = 4, tool_timeout: float = 30.0,
+                 stream: bool = False, tools: Optional[AgentTools] = None,
+                 memory: Optional[ConversationMemory] = None,
+                 speculative_prefetch: Optional[bool] = None,
+                 prefetch_executor: Optional[ThreadPoolExecutor] = None,
+                 prefetch_stats: Optional[PrefetchStats] = None):
+        """
+        Initialize the function calling agent.
+        
+        Args:
+            cli (CLIInterface): CLI interface for user interaction
+            max_tool_workers (int): Maximum tool calls executed concurrently
+            tool_timeout (float): Seconds each tool call may run before it is abandoned
+            stream (bool): Print answer tokens as they are generated
+            tools (AgentTools, optional): Shared tools instance. A new one is created if omitted.
+            memory (ConversationMemory, optional): Conversation history (e.g. a web session's).
+                A new one is created if omitted.
+            speculative_prefetch (bool, optional): Search documents for the user message while
+                the model decides on tools. Defaults to AGENT_SPECULATIVE_PREFETCH ("false").
+            prefetch_executor (ThreadPoolExecutor, optional): Pool for prefetch searches
+                (e.g. shared by the web app's agents). Created on first use if omitted.
+            prefetch_stats (PrefetchStats, optional): Where prefetch outcomes are counted.
+                A new one is created if omitted.
+        """
         self.cli = cli
-        self.tools = AgentTools()
+        self.stream = stream
+        self.max_tool_workers = max_tool_workers
+        self.tool_timeout = tool_timeout
+        self.tools = tools or AgentTools()
+        self.memory = memory or ConversationMemory()
         self.available_tools = self.tools.get_available_tools()
         
+        if speculative_prefetch is None:
+            speculative_prefetch = os.getenv("AGENT_SPECULATIVE_PREFETCH", "false").lower() == "true"
+        self.speculative_prefetch = speculative_prefetch and self.tools.has_rag
+        # Share of the model's query terms that must appear in the user message
+        self.prefetch_match = float(os.getenv("AGENT_PREFETCH_MATCH", "0.8"))
+        self.prefetch_stats = prefetch_stats or PrefetchStats()
+        self._prefetch_executor = prefetch_executor
+        
         # Check OpenAI API key
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("OPENAI_API_KEY environment variable is required")
@@ -47,66 +158,103 @@ class FunctionCallingAgent:
         try:
             self.cli.print_question(user_message)
             
-            # System message to guide the agent
-            system_message = """You are a helpful AI assistant with access to tools:
-
-1. search_documents: Search through uploaded documents
-2. search_web: Search the internet for current information
-
-Use tools when appropriate to provide better answers."""
-
             # First call to get tool usage
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ]
+            messages = self._initial_messages(user_message)
+            prefetch = self._start_prefetch(user_message)
             
-            self.cli.loading_animation("Thinking", 1.5)
+            try:
+                # Call OpenAI with function calling
+                response, answer_printed = self._complete(
+                    "Thinking",
+                    model=self.MODEL,
+                    messages=messages,
+                    tools=self.available_tools,
+                    tool_choice="auto",
+                    temperature=0.7
+                )
+                
+                response_message = response.choices[0].message
+                
+                # Check if the model wants to call functions
+                tool_calls = getattr(response_message, 'tool_calls', None)
+                
+                # Execute tool calls concurrently
+                tool_results = self._execute_tool_calls(tool_calls, prefetch) if tool_calls else None
+            finally:
+                # No-op once the tools used or missed it; otherwise cancel and count it unused
+                self._discard_prefetch(prefetch)
             
-            # Call OpenAI with function calling
-            response = completion(
-                model="openai/gpt-4o",
-                messages=messages,
-                tools=self.available_tools,
-                tool_choice="auto",
-                temperature=0.7
-            )
+            if tool_calls:
+                messages.append(response_message)
+                self._append_tool_results(messages, tool_calls, tool_results)
+                
+                # Get final response from the model
+                final_response, answer_printed = self._complete(
+                    "Generating final response",
+                    model=self.MODEL,
+                    messages=messages,
+                    temperature=0.7
+                )
+                
+                final_answer = final_response.choices[0].message.content
+                
+            else:
+                # No tools needed, just return the response
+                final_answer = response_message.content
             
-            response_message = response.choices[0].message
+            # Display the final answer unless it was already streamed
+            if not answer_printed:
+                self.cli.print_answer(final_answer)
+            self.memory.add_turn(user_message, final_answer)
+            return final_answer
+            
+        except Exception as e:
+            error_msg = f"Error: {str(e)}"
+            self.cli.print_error(error_msg)
+            return "Sorry, I encountered an error."
+    
+    async def achat_with_tools(self, user_message: str) -> str:
+        """
+        Async version of ``chat_with_tools``.
+        
+        LLM calls and tools are awaited on the running event loop, so one
+        worker can serve many conversations while they wait on the network.
+        
+        Args:
+            user_message (str): User's message/question
+            
+        Returns:
+            str: AI response (potentially using tools)
+        """
+        try:
+            self.cli.print_question(user_message)
             
-            # Check if the model wants to call functions
-            tool_calls = getattr(response_message, 'tool_calls', None)
+            messages = self._initial_messages(user_message)
+            prefetch = self._astart_prefetch(user_message)
+            
+            try:
+                response, answer_printed = await self._acomplete(
+                    "Thinking",
+                    model=self.MODEL,
+                    messages=messages,
+                    tools=self.available_tools,
+                    tool_choice="auto",
+                    temperature=0.7
+                )
+                
+                response_message = response.choices[0].message
+                tool_calls = getattr(response_message, 'tool_calls', None)
+                tool_results = await self._aexecute_tool_calls(tool_calls, prefetch) if tool_calls else None
+            finally:
+                self._discard_prefetch(prefetch)
             
             if tool_calls:
-                # Execute tool calls
                 messages.append(response_message)
+                self._append_tool_results(messages, tool_calls, tool_results)
                 
-                for tool_call in tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    self.cli.print_info(f"Using tool: {function_name}")
-                    self.cli.loading_animation(f"Executing {function_name}", 2.0)
-                    
-                    # Execute the tool
-                    tool_result = self.tools.execute_tool(function_name, **function_args)
-                    
-                    # Display tool results
-                    self._display_tool_results(function_name, tool_result)
-                    
-                    # Add tool result to conversation
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": json.dumps(tool_result)
-                    })
-                
-                # Get final response from the model
-                self.cli.loading_animation("Generating final response", 1.5)
-                
-                final_response = completion(
-                    model="openai/gpt-4o",
+                final_response, answer_printed = await self._acomplete(
+                    "Generating final response",
+                    model=self.MODEL,
                     messages=messages,
                     temperature=0.7
                 )
@@ -114,11 +262,11 @@ Use tools when appropriate to provide better answers."""
                 final_answer = final_response.choices[0].message.content
                 
             else:
-                # No tools needed, just return the response
                 final_answer = response_message.content
             
-            # Display the final answer
-            self.cli.print_answer(final_answer)
+            if not answer_printed:
+                self.cli.print_answer(final_answer)
+            self.memory.add_turn(user_message, final_answer)
             return final_answer
             
         except Exception as e:
@@ -126,19 +274,253 @@ Use tools when appropriate to provide better answers."""
             self.cli.print_error(error_msg)
             return "Sorry, I encountered an error."
     
+    def _initial_messages(self, user_message: str) -> List[Dict[str, Any]]:
+        """System prompt, the conversation so far (summary + recent turns) and the user's question."""
+        return [
+            {"role": "system", "content": self.SYSTEM_MESSAGE},
+            *self.memory.messages(),
+            {"role": "user", "content": user_message}
+        ]
+    
+    def _append_tool_results(self, messages: List[Any], tool_calls, tool_results: List[Dict[str, Any]]):
+        """
+        Display tool results and add them to the conversation.
+        
+        Results are added in the original tool_call order so the
+        conversation is deterministic whatever finished first.
+        """
+        for tool_call, tool_result in zip(tool_calls, tool_results):
+            function_name = tool_call.function.name
+            
+            # Display tool results
+            self._display_tool_results(function_name, tool_result)
+            
+            # Add tool result to conversation
+            messages.append({
+                "tool_call_id": tool_call.id,
+                "role": "tool",
+                "name": function_name,
+                "content": json.dumps(tool_result)
+            })
+    
+    def _complete(self, spinner_message: str, **kwargs):
+        """
+        Call the LLM, streaming answer tokens when streaming is enabled.
+        
+        Goes through the completion cache when COMPLETION_CACHE is enabled.
+        
+        Returns:
+            Tuple: The (reassembled) response and whether its text was already printed
+        """
+        return complete(self.cli, spinner_message, self.stream, **kwargs)
+    
+    async def _acomplete(self, spinner_message: str, **kwargs):
+        """Async version of ``_complete``."""
+        return await acomplete(self.cli, spinner_message, self.stream, **kwargs)
+    
+    def _timed_search(self, query: str) -> Tuple[Dict[str, Any], float]:
+        start = time.perf_counter()
+        result = self.tools.search_documents(query, self.PREFETCH_RESULTS)
+        return result, time.perf_counter() - start
+    
+    async def _atimed_search(self, query: str) -> Tuple[Dict[str, Any], float]:
+        start = time.perf_counter()
+        result = await self.tools.asearch_documents(query, self.PREFETCH_RESULTS)
+        return result, time.perf_counter() - start
+    
+    def _start_prefetch(self, user_message: str) -> Optional[_Prefetch]:
+        """Start searching documents for the user message on a background thread (if enabled)."""
+        if not self.speculative_prefetch:
+            return None
+        if self._prefetch_executor is None:
+            # Two workers, so a discarded search still running doesn't delay the next turn's
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+        return _Prefetch(user_message, self._prefetch_executor.submit(self._timed_search, user_message))
+    
+    def _astart_prefetch(self, user_message: str) -> Optional[_Prefetch]:
+        """Async version of ``_start_prefetch``; the search runs as a task on the event loop."""
+        if not self.speculative_prefetch:
+            return None
+        return _Prefetch(user_message, asyncio.ensure_future(self._atimed_search(user_message)))
+    
+    def _discard_prefetch(self, prefetch: Optional[_Prefetch], outcome: str = "unused"):
+        """
+        Cancel a prefetch that won't be used and record why.
+        
+        Does nothing if its outcome is already recorded. A thread already
+        searching finishes in the background.
+        """
+        if prefetch is None or prefetch.settled:
+            return
+        prefetch.settled = True
+        prefetch.future.cancel()
+        self.prefetch_stats.record(outcome)
+    
+    def _match_prefetch(self, tool_calls, prefetch) -> Optional[int]:
+        """
+        Index of the tool call the prefetch can answer, recording a miss if there is none.
+        
+        The model rarely passes the user message verbatim; it drops filler
+        words or rephrases. A ``search_documents`` call matches when at least
+        ``prefetch_match`` of its query terms appear in the user message and
+        it asks for no more results than were prefetched.
+        """
+        if prefetch is None:
+            return None
+        
+        user_terms = set(tokenize(prefetch.query))
+        searched = False
+        for index, tool_call in enumerate(tool_calls):
+            if tool_call.function.name != "search_documents":
+                continue
+            searched = True
+            try:
+                args = json.loads(tool_call.function.arguments or "{}")
+                terms = set(tokenize(str(args.get("query", ""))))
+                num_results = int(args.get("num_results", self.PREFETCH_RESULTS))
+            except (ValueError, TypeError):
+                continue
+            if terms and num_results <= self.PREFETCH_RESULTS \
+                    and len(terms & user_terms) >= self.prefetch_match * len(terms):
+                return index
+        
+        self._discard_prefetch(prefetch, "misses" if searched else "unused")
+        return None
+    
+    def _use_prefetch(self, prefetch: _Prefetch, tool_call, result: Dict[str, Any],
+                      elapsed: float, waited: float) -> Dict[str, Any]:
+        """Prefetched result shaped like the search the model asked for; records the hit."""
+        prefetch.settled = True
+        self.prefetch_stats.record("hits", max(0.0, elapsed - waited))
+        if not result.get("success"):
+            return result
+        args = json.loads(tool_call.function.arguments or "{}")
+        results = result["results"][:int(args.get("num_results", self.PREFETCH_RESULTS))]
+        return {**result, "query": args.get("query", result["query"]), "results": results, "total_found": len(results)}
+    
+    def _run_tool(self, function_name: str, arguments: str) -> Dict[str, Any]:
+        """Parse arguments and execute one tool, turning failures into error results."""
+        try:
+            function_args = json.loads(arguments) if arguments else {}
+            return self.tools.execute_tool(function_name, **function_args)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error executing {function_name}: {str(e)}",
+                "results": []
+            }
+    
+    def _execute_tool_calls(self, tool_calls, prefetch=None) -> List[Dict[str, Any]]:
+        """
+        Execute tool calls on a bounded thread pool.
+        
+        Args:
+            tool_calls: Tool calls from the model response
+            prefetch (_Prefetch, optional): Speculative search from ``_start_prefetch``
+            
+        Returns:
+            List[Dict[str, Any]]: One result per tool call, in the same order
+        """
+        for tool_call in tool_calls:
+            self.cli.print_tool_start(tool_call.function.name, tool_call.function.arguments)
+        
+        matched = self._match_prefetch(tool_calls, prefetch)
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.max_tool_workers, len(tool_calls))))
+        try:
+            # All calls share one deadline, so the turn waits at most tool_timeout
+            deadline = time.monotonic() + self.tool_timeout
+            futures = [
+                prefetch.future if index == matched else
+                pool.submit(self._run_tool, tool_call.function.name, tool_call.function.arguments)
+                for index, tool_call in enumerate(tool_calls)
+            ]
+            
+            names = ", ".join(tool_call.function.name for tool_call in tool_calls)
+            results = []
+            with self.cli.spinner(f"Executing {names}"):
+                for index, (tool_call, future) in enumerate(zip(tool_calls, futures)):
+                    try:
+                        start = time.perf_counter()
+                        result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                        if index == matched:
+                            result = self._use_prefetch(prefetch, tool_call, *result, time.perf_counter() - start)
+                        results.append(result)
+                    except FutureTimeoutError:
+                        if index == matched:
+                            # Too slow to help: the model's own search would have timed out too
+                            self._discard_prefetch(prefetch, "misses")
+                        future.cancel()
+                        results.append(self._timeout_result(tool_call.function.name))
+            return results
+        finally:
+            # Don't block the turn on calls that overran their timeout
+            pool.shutdown(wait=False)
+    
+    async def _arun_tool(self, function_name: str, arguments: str) -> Dict[str, Any]:
+        """Async version of ``_run_tool``, bounded by ``tool_timeout``."""
+        try:
+            function_args = json.loads(arguments) if arguments else {}
+            return await asyncio.wait_for(
+                self.tools.aexecute_tool(function_name, **function_args), self.tool_timeout
+            )
+        except asyncio.TimeoutError:
+            return self._timeout_result(function_name)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error executing {function_name}: {str(e)}",
+                "results": []
+            }
+    
+    async def _aprefetched(self, tool_call, prefetch: _Prefetch) -> Dict[str, Any]:
+        """Wait for a matching prefetch task, bounded by ``tool_timeout`` like any tool call."""
+        try:
+            start = time.perf_counter()
+            result, elapsed = await asyncio.wait_for(prefetch.future, self.tool_timeout)
+            return self._use_prefetch(prefetch, tool_call, result, elapsed, time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            self._discard_prefetch(prefetch, "misses")
+            return self._timeout_result(tool_call.function.name)
+    
+    async def _aexecute_tool_calls(self, tool_calls, prefetch=None) -> List[Dict[str, Any]]:
+        """
+        Execute tool calls concurrently on the event loop.
+        
+        Each call is a coroutine rather than a pool thread, so
+        ``max_tool_workers`` does not apply; every call still gets
+        ``tool_timeout``, and since they run together the turn waits at
+        most that long.
+        
+        Args:
+            tool_calls: Tool calls from the model response
+            prefetch (_Prefetch, optional): Speculative search from ``_astart_prefetch``
+            
+        Returns:
+            List[Dict[str, Any]]: One result per tool call, in the same order
+        """
+        for tool_call in tool_calls:
+            self.cli.print_tool_start(tool_call.function.name, tool_call.function.arguments)
+        
+        matched = self._match_prefetch(tool_calls, prefetch)
+        names = ", ".join(tool_call.function.name for tool_call in tool_calls)
+        with self.cli.spinner(f"Executing {names}"):
+            return list(await asyncio.gather(*(
+                self._aprefetched(tool_call, prefetch) if index == matched else
+                self._arun_tool(tool_call.function.name, tool_call.function.arguments)
+                for index, tool_call in enumerate(tool_calls)
+            )))
+    
+    def _timeout_result(self, function_name: str) -> Dict[str, Any]:
+        """Error result for a tool call that overran ``tool_timeout``."""
+        return {
+            "success": False,
+            "error": f"Tool {function_name} timed out after {self.tool_timeout}s",
+            "results": []
+        }
+    
     def _display_tool_results(self, tool_name: str, tool_result: Dict[str, Any]):
         """Display tool execution results in a nice format."""
-        if tool_result.get("success"):
-            results = tool_result.get("results", [])
-            
-            if tool_name == "search_documents":
-                self.cli.print_success(f"Found {len(results)} documents")
-                
-            elif tool_name == "search_web":
-                self.cli.print_success(f"Found {len(results)} web results")
-        else:
-            error = tool_result.get("error", "Unknown error")
-            self.cli.print_warning(f"Tool {tool_name} failed: {error}")
+        self.cli.print_tool_result(tool_name, tool_result)
     
     def interactive_chat(self):
         """Start an interactive chat session with tool capabilities."""
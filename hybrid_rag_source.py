@@ -0,0 +1,195 @@
+import os
+import time
+import threading
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from rag_source_base import RAGSourceBase
+from local_vector_store import LocalVectorStore
+from bm25_index import BM25Index, reciprocal_rank_fusion
+
+
+class HybridRAGSource(RAGSourceBase):
+    """
+    Local RAG source that fuses BM25 keyword search with vector search.
+
+    Dense retrieval finds paraphrases but tends to miss exact identifiers,
+    error codes and product names; BM25 finds those. Each retriever returns
+    its top ``candidates`` chunks and the two rankings are merged with
+    reciprocal-rank fusion, which needs no score calibration between them.
+
+    Every query records how long each stage took (query embedding, vector
+    search, BM25 search, fusion); see ``last_timings`` and ``stats``.
+    """
+
+    STAGES = ('embed', 'vector', 'bm25', 'fusion')
+
+    def __init__(self, store: Optional[LocalVectorStore] = None, bm25: Optional[BM25Index] = None,
+                 candidates: Optional[int] = None, rrf_k: Optional[int] = None):
+        """
+        Initialize the hybrid source.
+
+        Args:
+            store (LocalVectorStore, optional): Vector store to search. Defaults to
+                one configured from env (LOCAL_INDEX_PATH, LOCAL_DOCUMENTS_PATH, ...).
+            bm25 (BM25Index, optional): Keyword index over the store's chunks. Defaults
+                to the one saved with the store's index, or is built on the first query.
+            candidates (int, optional): Results taken from each retriever before fusion.
+                Defaults to HYBRID_CANDIDATES (50 if unset).
+            rrf_k (int, optional): Reciprocal-rank fusion constant. Defaults to
+                HYBRID_RRF_K (60 if unset).
+        """
+        self.store = store or LocalVectorStore()
+        self.candidates = candidates or int(os.getenv("HYBRID_CANDIDATES", "50"))
+        self.rrf_k = rrf_k or int(os.getenv("HYBRID_RRF_K", "60"))
+
+        if bm25 is None and self.store.data_path is not None:
+            # Same generation as the mapped embeddings, even if a re-ingest published a newer one
+            bm25 = BM25Index.open(self.store.data_path)
+        # A saved keyword index is only usable if it covers exactly the store's chunks
+        self._bm25 = bm25 if bm25 is not None and len(bm25) == len(self.store) else None
+        self._bm25_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self.last_timings: Dict[str, float] = {}
+        self.queries = 0
+        self._total_ms = dict.fromkeys(self.STAGES, 0.0)
+
+    @property
+    def embedder(self):
+        """The store's embedder (also used by CachedRAGSource's semantic tier)."""
+        return self.store.embedder
+
+    @property
+    def bm25(self) -> BM25Index:
+        """The keyword index, (re)built if chunks were added since it was made."""
+        if self._bm25 is None or len(self._bm25) != len(self.store):
+            with self._bm25_lock:
+                if self._bm25 is None or len(self._bm25) != len(self.store):
+                    self._bm25 = BM25Index.from_texts(self.store.texts)
+        return self._bm25
+
+    def _record(self, timings: Dict[str, float]):
+        with self._stats_lock:
+            self.last_timings = timings
+            self.queries += 1
+            for stage, ms in timings.items():
+                self._total_ms[stage] += ms
+
+    def _fuse(self, question: str, vector_hits: np.ndarray, num_results: int,
+              timings: Dict[str, float]) -> List[Dict[str, Any]]:
+        """BM25 search, fusion with the vector ranking and formatting; fills in stage timings."""
+        start = time.perf_counter()
+        keyword_hits, _ = self.bm25.search(question, self.candidates)
+        timings['bm25'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        fused, scores = reciprocal_rank_fusion([vector_hits, keyword_hits], k=self.rrf_k)
+        vector_ranks = {int(row): rank for rank, row in enumerate(vector_hits, 1)}
+        keyword_ranks = {int(row): rank for rank, row in enumerate(keyword_hits, 1)}
+
+        documents = []
+        for row, score in zip(fused[:num_results], scores[:num_results]):
+            row = int(row)
+            documents.append({
+                "content": self.store.texts[row],
+                "metadata": {
+                    "score": float(score),
+                    "source": "hybrid",
+                    "vector_rank": vector_ranks.get(row),
+                    "bm25_rank": keyword_ranks.get(row),
+                    **self.store.metadatas[row]
+                }
+            })
+        timings['fusion'] = (time.perf_counter() - start) * 1000
+        return documents
+
+    def retrieve_documents(self, question: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retrieve chunks ranked by fused keyword and vector relevance.
+
+        Args:
+            question (str): The question to search for
+            num_results (int): Number of documents to retrieve
+
+        Returns:
+            List[Dict[str, Any]]: List of retrieved documents with content and metadata
+        """
+        if len(self.store) == 0 or num_results <= 0:
+            return []
+
+        try:
+            timings = {}
+            start = time.perf_counter()
+            query = self.store.embedder.embed([question])[0]
+            timings['embed'] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            vector_hits, _ = self.store.search_vector(query, max(self.candidates, num_results))
+            timings['vector'] = (time.perf_counter() - start) * 1000
+
+            documents = self._fuse(question, vector_hits, num_results, timings)
+            self._record(timings)
+            return documents
+
+        except Exception as e:
+            print(f"Error retrieving documents from hybrid search: {e}")
+            return []
+
+    def retrieve_documents_many(self, questions: List[str], num_results: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve documents for several questions with one embedding call.
+
+        Args:
+            questions (List[str]): Questions to search for
+            num_results (int): Number of documents to retrieve per question
+
+        Returns:
+            List[List[Dict[str, Any]]]: One result list per question, in input order
+        """
+        if not questions:
+            return []
+        if len(self.store) == 0 or num_results <= 0:
+            return [[] for _ in questions]
+
+        try:
+            start = time.perf_counter()
+            queries = self.store.embedder.embed(questions)
+            embed_ms = (time.perf_counter() - start) * 1000 / len(questions)
+
+            start = time.perf_counter()
+            hits = self.store.search_vectors(queries, max(self.candidates, num_results))
+            vector_ms = (time.perf_counter() - start) * 1000 / len(questions)
+
+            results = []
+            for question, (vector_hits, _) in zip(questions, hits):
+                timings = {'embed': embed_ms, 'vector': vector_ms}
+                results.append(self._fuse(question, vector_hits, num_results, timings))
+                self._record(timings)
+            return results
+
+        except Exception as e:
+            print(f"Error retrieving documents from hybrid search: {e}")
+            return [[] for _ in questions]
+
+    def stats(self) -> Dict[str, Any]:
+        """Mean latency per stage in milliseconds, plus the latest query's timings."""
+        with self._stats_lock:
+            return {
+                "queries": self.queries,
+                "mean_ms": {
+                    stage: total / self.queries if self.queries else 0.0
+                    for stage, total in self._total_ms.items()
+                },
+                "last_ms": dict(self.last_timings),
+            }
+
+    def get_required_env_vars(self) -> List[str]:
+        """
+        Get the list of required environment variables for hybrid search.
+
+        Returns:
+            List[str]: List of required environment variable names
+        """
+        return self.store.get_required_env_vars()
@@ -0,0 +1,281 @@
+"""
+On-Disk Index Format for the Local Vector Store
+Memory-mapped embeddings and chunk tables for near-instant startup.
+
+Layout of an index directory:
+    manifest.json           count, dimension, dtype, embedder name and the
+                            generation directory holding the data
+    gen-*/                  one generation of the index:
+        embeddings.npy          (n, dimension) float32, float16 or int8 matrix
+        scales.npy              (n,) float32 per-row scales (int8 only)
+        texts.bin / .offsets    UTF-8 chunk texts and their (n + 1) byte offsets
+        metadata.bin / .offsets JSON metadata per chunk and their byte offsets
+        ivf_*.npy               IVF centroids and inverted lists (if built)
+        idf.npy                 IDF table of the TF-IDF embedder (tfidf indexes only)
+
+Every array is opened with ``mmap`` so opening costs the same for ten
+chunks or ten million, and worker processes share pages through the OS
+page cache instead of each holding a private copy.
+
+Files are never rewritten once published: truncating a file another
+process has mapped kills that process with SIGBUS on its next access.
+Saving writes a new generation and then atomically replaces the
+manifest, so running readers keep their old files (unlinked files stay
+valid while mapped) and new readers see the new generation.
+"""
+
+import os
+import json
+import mmap
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+SUPPORTED_DTYPES = ('float32', 'float16', 'int8')
+MANIFEST_NAME = 'manifest.json'
+GENERATION_PREFIX = 'gen-'
+IDF_FILE = 'idf.npy'
+
+
+class ChunkTable:
+    """
+    Read-only sequence of variable-length records stored in one blob.
+
+    Record ``i`` is the byte range ``offsets[i]:offsets[i + 1]`` of the
+    memory-mapped blob and is decoded only when accessed.
+    """
+
+    def __init__(self, blob_path: Path, offsets_path: Path, decode_json: bool = False):
+        """
+        Open a chunk table.
+
+        Args:
+            blob_path (Path): File holding the concatenated records
+            offsets_path (Path): .npy file with the (n + 1) record offsets
+            decode_json (bool): Decode each record as JSON instead of text
+        """
+        self.offsets = np.load(offsets_path, mmap_mode='r')
+        self.decode_json = decode_json
+        self._file = open(blob_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._blob = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        raw = self._blob[int(self.offsets[index]):int(self.offsets[index + 1])]
+        text = bytes(raw).decode('utf-8')
+        return json.loads(text) if self.decode_json else text
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def _write_table(records: Iterable[Any], blob_path: Path, offsets_path: Path, encode_json: bool = False):
+    offsets = [0]
+    with open(blob_path, 'wb') as f:
+        for record in records:
+            data = (json.dumps(record) if encode_json else record).encode('utf-8')
+            f.write(data)
+            offsets.append(offsets[-1] + len(data))
+    np.save(offsets_path, np.asarray(offsets, dtype=np.int64))
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Convert float32 embeddings to the storage dtype.
+
+    Args:
+        vectors (np.ndarray): float32 matrix
+        dtype (str): "float32", "float16" or "int8"
+
+    Returns:
+        Tuple[np.ndarray, Optional[np.ndarray]]: Stored matrix and per-row scales (int8 only)
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported index dtype: {dtype}")
+
+    if dtype != 'int8':
+        return vectors.astype(dtype), None
+
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path / MANIFEST_NAME) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_index(path: str, vectors: np.ndarray, texts: Iterable[str], metadatas: Iterable[Dict[str, Any]],
+                embedder_name: str, dtype: str = 'float16',
+                ivf_arrays: Optional[Dict[str, np.ndarray]] = None) -> Tuple[Path, Dict[str, Any]]:
+    """
+    Write a new, unpublished generation of an index.
+
+    Readers keep seeing the current generation until ``publish_index``
+    switches the manifest, so other files (e.g. a keyword index) can be
+    added to the generation directory first.
+
+    Args:
+        path (str): Index directory (created if missing)
+        vectors (np.ndarray): float32 embedding matrix
+        texts (Iterable[str]): Chunk texts, one per row
+        metadatas (Iterable[Dict[str, Any]]): Chunk metadata, one per row
+        embedder_name (str): Name of the embedder that produced the vectors
+        dtype (str): Storage dtype for the embedding matrix
+        ivf_arrays (Dict[str, np.ndarray], optional): Built IVF arrays to persist
+
+    Returns:
+        Tuple[Path, Dict[str, Any]]: The generation directory and its manifest
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    generation = Path(tempfile.mkdtemp(prefix=GENERATION_PREFIX, dir=path))
+    # mkdtemp creates the directory private to its owner; web workers may run as another user
+    os.chmod(generation, 0o755)
+
+    stored, scales = quantize(np.asarray(vectors, dtype=np.float32), dtype)
+    np.save(generation / 'embeddings.npy', stored)
+    if scales is not None:
+        np.save(generation / 'scales.npy', scales)
+
+    _write_table(texts, generation / 'texts.bin', generation / 'texts.offsets.npy')
+    _write_table(metadatas, generation / 'metadata.bin', generation / 'metadata.offsets.npy', encode_json=True)
+
+    for name, array in (ivf_arrays or {}).items():
+        np.save(generation / f'ivf_{name}.npy', array)
+
+    manifest = {
+        'version': FORMAT_VERSION,
+        'count': int(len(stored)),
+        'dimension': int(stored.shape[1]),
+        'dtype': dtype,
+        'embedder': embedder_name,
+        'ivf': bool(ivf_arrays),
+        'data': generation.name,
+    }
+    return generation, manifest
+
+
+def publish_index(path: str, manifest: Dict[str, Any]):
+    """
+    Make a generation from ``write_index`` the current one.
+
+    The manifest is replaced atomically. The previous generation is kept,
+    since a reader may have read the old manifest and not yet mapped its
+    files; older generations are deleted.
+
+    Args:
+        path (str): Index directory
+        manifest (Dict[str, Any]): Manifest returned by ``write_index``
+    """
+    path = Path(path)
+    previous = _read_manifest(path)
+    keep = {manifest['data'], previous['data'] if previous else None}
+
+    tmp = path / (MANIFEST_NAME + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path / MANIFEST_NAME)
+
+    # Unlinking is safe for processes that still have the files mapped
+    for generation in path.glob(GENERATION_PREFIX + '*'):
+        if generation.name not in keep:
+            shutil.rmtree(generation, ignore_errors=True)
+
+
+def save_index(path: str, vectors: np.ndarray, texts: Iterable[str], metadatas: Iterable[Dict[str, Any]],
+               embedder_name: str, dtype: str = 'float16', ivf_arrays: Optional[Dict[str, np.ndarray]] = None) -> Path:
+    """
+    Write and publish a new generation of an index (see ``write_index`` for the arguments).
+
+    Returns:
+        Path: The generation directory
+    """
+    generation, manifest = write_index(path, vectors, texts, metadatas, embedder_name, dtype, ivf_arrays)
+    publish_index(path, manifest)
+    return generation
+
+
+def index_data_path(path: str) -> Optional[Path]:
+    """
+    Directory holding the current generation's files.
+
+    Args:
+        path (str): Index directory
+
+    Returns:
+        Optional[Path]: The generation directory, or None if there is no index at ``path``
+    """
+    manifest = _read_manifest(Path(path))
+    return Path(path) / manifest['data'] if manifest else None
+
+
+def index_idf_path(path: Optional[str]) -> Optional[str]:
+    """
+    IDF table saved with the current generation of an index.
+
+    Args:
+        path (str, optional): Index directory
+
+    Returns:
+        Optional[str]: Path of the table, or None if there is no index or it has none
+    """
+    data_path = index_data_path(path) if path else None
+    if data_path is None or not (data_path / IDF_FILE).exists():
+        return None
+    return str(data_path / IDF_FILE)
+
+
+def open_index(path: str) -> Dict[str, Any]:
+    """
+    Memory-map an index directory without reading its contents.
+
+    Args:
+        path (str): Index directory written by ``save_index``
+
+    Returns:
+        Dict[str, Any]: manifest, data path (the generation directory), embeddings,
+        scales, texts, metadatas and ivf arrays
+    """
+    root = Path(path)
+    manifest = _read_manifest(root)
+    if manifest is None:
+        raise ValueError(f"No local index found at: {root}")
+    if manifest.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported index format version: {manifest.get('version')}")
+    path = root / manifest['data']
+
+    ivf = None
+    if manifest.get('ivf'):
+        ivf = {
+            name: np.load(path / f'ivf_{name}.npy', mmap_mode='r')
+            for name in ('centroids', 'list_ids', 'list_offsets')
+        }
+
+    return {
+        'manifest': manifest,
+        'path': path,
+        'embeddings': np.load(path / 'embeddings.npy', mmap_mode='r'),
+        'scales': np.load(path / 'scales.npy', mmap_mode='r') if manifest['dtype'] == 'int8' else None,
+        'texts': ChunkTable(path / 'texts.bin', path / 'texts.offsets.npy'),
+        'metadatas': ChunkTable(path / 'metadata.bin', path / 'metadata.offsets.npy', decode_json=True),
+        'ivf': ivf,
+    }
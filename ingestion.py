@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Local Document Ingestion for Agent Engineering Bootcamp RAG System
+Parse -> chunk -> embed -> index, without sending documents to Vectorize
+"""
+
+import os
+import re
+import csv
+import math
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from embedders import EmbedderBase, TfidfEmbedder
+from file_walker import walk_files
+from local_vector_store import LocalVectorStore
+from bm25_index import BM25Index
+from index_storage import publish_index, IDF_FILE
+
+
+INGEST_FORMATS = ('.pdf', '.txt', '.md', '.docx', '.csv')
+CHUNKING_MODES = ('cdc', 'fixed')
+
+
+def parse_text(path: str) -> str:
+    """Read a .txt or .md file."""
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def parse_csv(path: str) -> str:
+    """Render each CSV row as one "column: value" paragraph."""
+    with open(path, newline="", encoding="utf-8", errors="ignore") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return ""
+        rows = []
+        for row in reader:
+            fields = [f"{name}: {value}" for name, value in zip(header, row) if value.strip()]
+            if fields:
+                rows.append(", ".join(fields))
+        return "\n\n".join(rows)
+
+
+def parse_pdf(path: str) -> str:
+    """Extract text per page with pypdf (optional dependency)."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ImportError("PDF ingestion requires pypdf: pip install pypdf")
+    reader = PdfReader(path)
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def parse_docx(path: str) -> str:
+    """Extract paragraph text with python-docx (optional dependency)."""
+    try:
+        import docx
+    except ImportError:
+        raise ImportError("DOCX ingestion requires python-docx: pip install python-docx")
+    return "\n\n".join(paragraph.text for paragraph in docx.Document(path).paragraphs)
+
+
+PARSERS = {
+    '.txt': parse_text,
+    '.md': parse_text,
+    '.csv': parse_csv,
+    '.pdf': parse_pdf,
+    '.docx': parse_docx,
+}
+
+
+def chunk_text(text: str, max_tokens: int = 200, overlap: int = 40) -> List[str]:
+    """
+    Split text into chunks of at most ``max_tokens`` tokens.
+
+    Tokens are whitespace-separated words, a close, dependency-free proxy
+    for model tokens. Paragraphs are packed whole while they fit; a chunk
+    is closed at a paragraph boundary rather than mid-paragraph, and only
+    paragraphs longer than the budget are split. Each chunk starts with
+    the last ``overlap`` tokens of the previous one.
+
+    Args:
+        text (str): Document text
+        max_tokens (int): Token budget per chunk
+        overlap (int): Tokens repeated from the previous chunk
+
+    Returns:
+        List[str]: Chunk texts
+    """
+    if not 0 <= overlap < max_tokens:
+        raise ValueError("overlap must be non-negative and smaller than max_tokens")
+
+    chunks: List[str] = []
+    current: List[str] = []
+    fresh = 0  # tokens in current that are not carried-over overlap
+
+    def flush():
+        nonlocal current, fresh
+        chunks.append(" ".join(current))
+        current = current[-overlap:] if overlap else []
+        fresh = 0
+
+    for paragraph in re.split(r"\n\s*\n", text):
+        words = paragraph.split()
+        while words:
+            room = max_tokens - len(current)
+            if len(words) <= room:
+                current.extend(words)
+                fresh += len(words)
+                break
+            if fresh:
+                flush()
+                continue
+            current.extend(words[:room])
+            fresh += room
+            words = words[room:]
+            flush()
+
+    if fresh:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def content_defined_chunks(text: str, max_tokens: int = 200) -> List[str]:
+    """
+    Split text at content-defined boundaries.
+
+    A gear rolling hash runs over the word stream; a boundary falls after
+    any word where the top bits of the hash are zero. The hash only
+    depends on the last ~32 words, so an edit moves the boundaries next
+    to it and every other chunk comes out byte-identical, keeping its
+    content hash (and, on re-ingestion, its vector). Chunks are at least
+    ``max_tokens // 4`` tokens, about ``max_tokens // 2`` on average and
+    never more than ``max_tokens``.
+
+    Args:
+        text (str): Document text
+        max_tokens (int): Hard token limit per chunk
+
+    Returns:
+        List[str]: Chunk texts
+    """
+    min_tokens = max(1, max_tokens // 4)
+    bits = max(1, round(math.log2(max(2, max_tokens // 2 - min_tokens))))
+    boundary_mask = ((1 << bits) - 1) << (32 - bits)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    rolling = 0
+    hashes: Dict[str, int] = {}
+    for word in text.split():
+        word_hash = hashes.get(word)
+        if word_hash is None:
+            word_hash = hashes[word] = _word_hash(word)
+        rolling = ((rolling << 1) + word_hash) & 0xFFFFFFFF
+        current.append(word)
+        if len(current) >= max_tokens or (len(current) >= min_tokens and not rolling & boundary_mask):
+            chunks.append(" ".join(current))
+            current = []
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def chunk_hash(text: str) -> str:
+    """Content hash stored with each chunk to detect unchanged chunks."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def parse_and_chunk(path: str, max_tokens: int, overlap: int,
+                    chunking: str = 'cdc') -> Tuple[str, List[str], Optional[str]]:
+    """
+    Parse and chunk one file. Runs in a worker process.
+
+    Returns:
+        Tuple[str, List[str], Optional[str]]: Path, chunks, and an error message if parsing failed
+    """
+    try:
+        parser = PARSERS.get(os.path.splitext(path)[1].lower())
+        if parser is None:
+            return path, [], f"Unsupported format: {path}"
+        text = parser(path)
+        if chunking == 'cdc':
+            return path, content_defined_chunks(text, max_tokens), None
+        return path, chunk_text(text, max_tokens, overlap), None
+    except Exception as e:
+        return path, [], str(e)
+
+
+def iter_chunks(paths: Iterable[str], max_tokens: int = 200, overlap: int = 40,
+                workers: Optional[int] = None, chunking: str = 'cdc') -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Parse and chunk files on a process pool, yielding chunks as files finish.
+
+    At most two files per worker are pending, so ``paths`` can be a lazy
+    folder walk of any size.
+
+    Args:
+        paths (Iterable[str]): Files to ingest
+        max_tokens (int): Token budget per chunk
+        overlap (int): Tokens repeated between consecutive chunks (fixed chunking only)
+        workers (int, optional): Worker processes, defaults to the CPU count
+        chunking (str): "cdc" (content-defined) or "fixed" (token budget with overlap)
+
+    Yields:
+        Tuple[str, Dict[str, Any]]: Chunk text and its metadata ({"file", "chunk", "chunk_hash"})
+    """
+    if chunking not in CHUNKING_MODES:
+        raise ValueError(f"Unsupported chunking: {chunking}")
+    workers = workers or os.cpu_count() or 1
+    pending = set()
+
+    def drain(done):
+        for future in done:
+            pending.discard(future)
+            path, chunks, error = future.result()
+            if error:
+                print(f"⚠️ Skipping {path}: {error}")
+            for i, chunk in enumerate(chunks):
+                yield chunk, {"file": path, "chunk": i, "chunk_hash": chunk_hash(chunk)}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path in paths:
+            pending.add(pool.submit(parse_and_chunk, str(path), max_tokens, overlap, chunking))
+            if len(pending) >= 2 * workers:
+                yield from drain(wait(pending, return_when=FIRST_COMPLETED).done)
+        while pending:
+            yield from drain(wait(pending, return_when=FIRST_COMPLETED).done)
+
+
+def ingest(source: str, index_path: str, embedder: Optional[EmbedderBase] = None,
+           index_type: str = 'flat', max_tokens: int = 200, overlap: int = 40, batch_size: int = 256,
+           workers: Optional[int] = None, include: Optional[List[str]] = None,
+           exclude: Optional[List[str]] = None, dtype: str = 'float16', chunking: str = 'cdc',
+           reuse: bool = True) -> Dict[str, Any]:
+    """
+    Build a local index from a file or folder.
+
+    Every chunk carries a content hash. Chunks whose hash is already in
+    the previous index at ``index_path`` (or earlier in this run) reuse
+    that vector instead of being embedded again, so with content-defined
+    chunking the embedding cost of a re-ingest scales with the size of
+    the edits. The BM25 keyword index used by hybrid search is written
+    into the same index generation, and both are published together, so
+    servers with the old index open are unaffected until they reopen it.
+
+    An unfitted TF-IDF embedder is fitted on all chunks before any is
+    embedded, and its IDF table is saved with the index, where
+    ``index_idf_path`` finds it for the stores that open it. A fitted one (e.g. loaded from the
+    previous index) is kept, so unchanged chunks keep their vectors; with
+    ``reuse=False`` it is refitted.
+
+    Args:
+        source (str): File or folder (walked recursively) to ingest
+        index_path (str): Output index directory, opened later via LOCAL_INDEX_PATH
+        embedder (EmbedderBase, optional): Embedder, defaults to LOCAL_EMBEDDER
+        index_type (str): "flat" or "ivf"
+        max_tokens (int): Token budget per chunk
+        overlap (int): Tokens repeated between consecutive chunks
+        batch_size (int): Chunks embedded per embedder call
+        workers (int, optional): Parser processes, defaults to the CPU count
+        include (List[str], optional): Glob patterns files must match
+        exclude (List[str], optional): Glob patterns for files and folders to skip
+        dtype (str): Embedding storage dtype: "float32", "float16" or "int8"
+        chunking (str): "cdc" (content-defined) or "fixed" (token budget with overlap)
+        reuse (bool): Reuse vectors of unchanged chunks from the previous index
+
+    Returns:
+        Dict[str, Any]: Files, chunks, embedded/reused counts and timing of the run
+    """
+    if os.path.isdir(source):
+        paths = walk_files(source, INGEST_FORMATS, include, exclude)
+    elif os.path.isfile(source):
+        paths = [source]
+    else:
+        raise ValueError(f"Path not found: {source}")
+
+    store = LocalVectorStore(embedder=embedder, index_type=index_type, from_env=False)
+    start = time.perf_counter()
+
+    chunks = iter_chunks(paths, max_tokens, overlap, workers, chunking)
+    tfidf = _tfidf_embedder(store.embedder)
+    if tfidf is not None and (not tfidf.fitted or not reuse):
+        # IDF weights need every chunk before the first one is embedded
+        chunks = list(chunks)
+        tfidf.fit([text for text, _ in chunks])
+
+    previous, previous_rows = _open_previous(index_path, store.embedder) if reuse else (None, {})
+    embed_seconds = 0.0
+    embedded = reused = 0
+    files = set()
+    seen: Dict[str, int] = {}
+    texts: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+
+    def embed_batch():
+        nonlocal embed_seconds, embedded, reused
+        hashes = [metadata["chunk_hash"] for metadata in metadatas]
+        vectors = np.empty((len(texts), store.embedder.dimension), dtype=np.float32)
+
+        own, previous_hits, missing = [], [], {}
+        for i, digest in enumerate(hashes):
+            if digest in seen:
+                own.append(i)
+            elif digest in previous_rows:
+                previous_hits.append(i)
+            else:
+                missing.setdefault(digest, []).append(i)
+
+        if own:
+            vectors[own] = store.vectors_at([seen[hashes[i]] for i in own])
+        if previous_hits:
+            vectors[previous_hits] = previous.vectors_at([previous_rows[hashes[i]] for i in previous_hits])
+        if missing:
+            # Embed each distinct new chunk once
+            batch_start = time.perf_counter()
+            fresh = store.embedder.embed([texts[rows[0]] for rows in missing.values()])
+            embed_seconds += time.perf_counter() - batch_start
+            for vector, rows in zip(fresh, missing.values()):
+                vectors[rows] = vector
+
+        embedded += len(missing)
+        reused += len(texts) - len(missing)
+
+        base = len(store)
+        store.add_embeddings(vectors, texts, metadatas)
+        for i, digest in enumerate(hashes):
+            seen.setdefault(digest, base + i)
+        texts.clear()
+        metadatas.clear()
+
+    for text, metadata in chunks:
+        files.add(metadata["file"])
+        texts.append(text)
+        metadatas.append(metadata)
+        if len(texts) >= batch_size:
+            embed_batch()
+    if texts:
+        embed_batch()
+
+    if not len(store):
+        raise ValueError(f"No ingestible content found in {source}")
+
+    # Only needed for reuse; drop its maps and row table before writing
+    previous = previous_rows = None
+    generation, manifest = store.write(index_path, dtype=dtype)
+    # Keyword postings for hybrid search live next to the embeddings
+    BM25Index.from_texts(store.texts).save(generation)
+    if tfidf is not None:
+        tfidf.save(str(generation / IDF_FILE))
+    publish_index(index_path, manifest)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "files": len(files),
+        "chunks": len(store),
+        "seconds": elapsed,
+        "embedded": embedded,
+        "reused": reused,
+        "embed_seconds": embed_seconds,
+        "chunks_per_second": len(store) / elapsed if elapsed else 0.0,
+        "index_path": index_path,
+    }
+
+
+def _tfidf_embedder(embedder: EmbedderBase) -> Optional[TfidfEmbedder]:
+    """The TF-IDF embedder under any batching/caching wrappers, or None."""
+    while not isinstance(embedder, TfidfEmbedder):
+        embedder = getattr(embedder, "embedder", None)
+        if embedder is None:
+            return None
+    return embedder
+
+
+def _open_previous(index_path: str, embedder: EmbedderBase) -> Tuple[Optional[LocalVectorStore], Dict[str, int]]:
+    """Open an existing index for vector reuse. Returns the store and a chunk hash -> row map."""
+    if not os.path.exists(os.path.join(index_path, 'manifest.json')):
+        return None, {}
+    try:
+        previous = LocalVectorStore(embedder=embedder, index_path=index_path, from_env=False)
+    except ValueError as e:
+        print(f"⚠️ Not reusing vectors from {index_path}: {e}")
+        return None, {}
+
+    rows = {}
+    for row, metadata in enumerate(previous.metadatas):
+        digest = metadata.get("chunk_hash")
+        if digest is not None:
+            rows.setdefault(digest, row)
+    return previous, rows
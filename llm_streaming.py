@@ -0,0 +1,85 @@
+"""
+Token Streaming for LLM Answers
+Shared helper that prints answer deltas as they arrive.
+"""
+
+from itertools import chain
+from typing import Any, Tuple
+
+import litellm
+
+
+def stream_completion(cli, spinner_message: str, **kwargs) -> Tuple[Any, bool]:
+    """
+    Call the LLM with ``stream=True`` and print content deltas as they arrive.
+
+    The spinner runs only until the first chunk arrives. The streamed chunks
+    are then reassembled with ``litellm.stream_chunk_builder``, which also
+    concatenates tool-call argument deltas by index. Callers therefore get
+    back the same response shape as a non-streaming ``completion`` call.
+
+    Args:
+        cli: CLI interface with ``spinner`` and ``print_answer_start/delta/end``
+        spinner_message (str): Message shown until the first token arrives
+        **kwargs: Arguments forwarded to ``litellm.completion``
+
+    Returns:
+        Tuple[Any, bool]: Reassembled response and whether any answer text was printed
+    """
+    with cli.spinner(spinner_message):
+        iterator = iter(litellm.completion(stream=True, **kwargs))
+        first = next(iterator, None)
+
+    chunks = []
+    printed = False
+    for chunk in chain([first] if first is not None else [], iterator):
+        chunks.append(chunk)
+        printed = _print_delta(cli, chunk, printed)
+
+    if printed:
+        cli.print_answer_end()
+
+    return litellm.stream_chunk_builder(chunks, messages=kwargs.get("messages")), printed
+
+
+async def astream_completion(cli, spinner_message: str, **kwargs) -> Tuple[Any, bool]:
+    """
+    Async counterpart of ``stream_completion`` built on ``litellm.acompletion``.
+
+    Args:
+        cli: CLI interface with ``spinner`` and ``print_answer_start/delta/end``
+        spinner_message (str): Message shown until the first token arrives
+        **kwargs: Arguments forwarded to ``litellm.acompletion``
+
+    Returns:
+        Tuple[Any, bool]: Reassembled response and whether any answer text was printed
+    """
+    with cli.spinner(spinner_message):
+        iterator = (await litellm.acompletion(stream=True, **kwargs)).__aiter__()
+        first = await anext(iterator, None)
+
+    chunks = []
+    printed = False
+    if first is not None:
+        chunks.append(first)
+        printed = _print_delta(cli, first, printed)
+        async for chunk in iterator:
+            chunks.append(chunk)
+            printed = _print_delta(cli, chunk, printed)
+
+    if printed:
+        cli.print_answer_end()
+
+    return litellm.stream_chunk_builder(chunks, messages=kwargs.get("messages")), printed
+
+
+def _print_delta(cli, chunk, printed: bool) -> bool:
+    """Print the content delta of one chunk. Returns whether any answer text has been printed."""
+    delta = chunk.choices[0].delta if chunk.choices else None
+    text = getattr(delta, "content", None)
+    if text:
+        if not printed:
+            cli.print_answer_start()
+        cli.print_answer_delta(text)
+        return True
+    return printed
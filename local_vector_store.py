@@ -0,0 +1,439 @@
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rag_source_base import RAGSourceBase
+from embedders import EmbedderBase, get_embedder
+from embedding_service import with_embedding_service_from_env
+from ann_index import IVFIndex, top_k_indices
+from index_storage import write_index, publish_index, open_index, index_idf_path
+
+
+class LocalVectorStore(RAGSourceBase):
+    """
+    In-process RAG source backed by a NumPy embedding matrix.
+
+    Chunk embeddings live in one contiguous float32 matrix, so a query is a
+    single matrix-vector product followed by ``argpartition`` for top-k.
+    No network round trip is involved once the chunks are embedded.
+
+    For large corpora an IVF index can replace the brute-force scan; it is
+    (re)built lazily on the first query after new chunks are added.
+
+    A store can be saved to disk and re-opened memory-mapped (see
+    ``index_storage``), which makes startup O(1) in the corpus size.
+    """
+
+    TEXT_FORMATS = ('.txt', '.md')
+    INDEX_TYPES = ('flat', 'ivf')
+    SCORE_BLOCK = 65536
+
+    def __init__(self, embedder: Optional[EmbedderBase] = None, documents_path: Optional[str] = None,
+                 index_type: Optional[str] = None, nprobe: Optional[int] = None,
+                 n_lists: Optional[int] = None, index_path: Optional[str] = None, from_env: bool = True):
+        """
+        Initialize the local vector store.
+
+        Args:
+            embedder (EmbedderBase, optional): Embedder for chunks and queries.
+                Defaults to the one named by LOCAL_EMBEDDER ("hashing" if unset),
+                with the batching/disk-cache layers enabled by env.
+            documents_path (str, optional): Folder or file of .txt/.md documents to
+                load on startup. Defaults to LOCAL_DOCUMENTS_PATH.
+            index_type (str, optional): "flat" (exact) or "ivf" (approximate).
+                Defaults to LOCAL_INDEX_TYPE ("flat" if unset).
+            nprobe (int, optional): IVF lists scanned per query. Defaults to
+                LOCAL_IVF_NPROBE (8 if unset).
+            n_lists (int, optional): IVF coarse centroids. Defaults to 4 * sqrt(n).
+            index_path (str, optional): Saved index directory to memory-map on
+                startup. Defaults to LOCAL_INDEX_PATH.
+            from_env (bool): Fall back to LOCAL_INDEX_PATH and LOCAL_DOCUMENTS_PATH.
+                Pass False to start empty (e.g. when building a new index).
+        """
+        index_path = index_path or (os.getenv("LOCAL_INDEX_PATH") if from_env else None)
+        # A TF-IDF embedder needs the IDF table the index was built with
+        self.embedder = embedder or with_embedding_service_from_env(
+            get_embedder(os.getenv("LOCAL_EMBEDDER", "hashing"), idf_path=index_idf_path(index_path))
+        )
+
+        self.index_type = index_type or os.getenv("LOCAL_INDEX_TYPE", "flat")
+        if self.index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {self.index_type}")
+        self.ivf = IVFIndex(n_lists=n_lists, nprobe=nprobe or int(os.getenv("LOCAL_IVF_NPROBE", "8")))
+        self._index_dirty = True
+        self._index_lock = threading.Lock()
+
+        self._matrix = np.zeros((0, self.embedder.dimension), dtype=np.float32)
+        self._scales: Optional[np.ndarray] = None
+        self._size = 0
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._mapped = False
+        # Generation directory of the mapped index, if any
+        self.data_path: Optional[Path] = None
+
+        if index_path:
+            self.open(index_path)
+
+        documents_path = documents_path or (os.getenv("LOCAL_DOCUMENTS_PATH") if from_env else None)
+        if documents_path:
+            self.load_folder(documents_path)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """View of the populated rows of the embedding matrix."""
+        return self._matrix[:self._size]
+
+    @property
+    def texts(self) -> Sequence[str]:
+        """Chunk texts, indexed by row."""
+        return self._texts
+
+    @property
+    def metadatas(self) -> Sequence[Dict[str, Any]]:
+        """Chunk metadata, indexed by row."""
+        return self._metadatas
+
+    def add_texts(self, texts: List[str], metadatas: Optional[List[Dict[str, Any]]] = None) -> int:
+        """
+        Embed and add chunks to the store.
+
+        Args:
+            texts (List[str]): Chunk texts
+            metadatas (List[Dict[str, Any]], optional): Metadata per chunk
+
+        Returns:
+            int: Number of chunks added
+        """
+        if not texts:
+            return 0
+
+        metadatas = metadatas or [{} for _ in texts]
+        if len(metadatas) != len(texts):
+            raise ValueError("texts and metadatas must have the same length")
+
+        vectors = self.embedder.embed(texts)
+        self.add_embeddings(vectors, texts, metadatas)
+        return len(texts)
+
+    def add_embeddings(self, vectors: np.ndarray, texts: List[str], metadatas: List[Dict[str, Any]]):
+        """
+        Add pre-computed, L2-normalized embeddings.
+
+        Args:
+            vectors (np.ndarray): Array of shape (len(texts), dimension)
+            texts (List[str]): Chunk texts
+            metadatas (List[Dict[str, Any]]): Metadata per chunk
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.embedder.dimension:
+            raise ValueError(f"Expected embeddings of dimension {self.embedder.dimension}")
+
+        if self._mapped:
+            self._materialize()
+
+        needed = self._size + len(vectors)
+        if needed > len(self._matrix):
+            # Grow geometrically so repeated appends stay amortized O(1)
+            capacity = max(needed, 2 * len(self._matrix), 64)
+            grown = np.zeros((capacity, self.embedder.dimension), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+
+        self._matrix[self._size:needed] = vectors
+        self._size = needed
+        self._texts.extend(texts)
+        self._metadatas.extend(metadatas)
+        self._index_dirty = True
+
+    def dense_embeddings(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Rows of the embedding matrix as float32, de-quantizing if needed.
+
+        Args:
+            start (int): First row
+            stop (int, optional): End row (exclusive). Defaults to the store size.
+
+        Returns:
+            np.ndarray: float32 array of shape (stop - start, dimension)
+        """
+        stop = self._size if stop is None else stop
+        block = np.asarray(self._matrix[start:stop], dtype=np.float32)
+        if self._scales is not None:
+            block *= self._scales[start:stop, None]
+        return block
+
+    def vectors_at(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Gather arbitrary rows as float32, de-quantizing if needed.
+
+        Args:
+            rows (np.ndarray): Row indices
+
+        Returns:
+            np.ndarray: float32 array of shape (len(rows), dimension)
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        block = np.asarray(self._matrix[rows], dtype=np.float32)
+        if self._scales is not None:
+            block *= self._scales[rows, None]
+        return block
+
+    def _materialize(self):
+        """Copy a memory-mapped index into private memory so it can grow."""
+        self._matrix = self.dense_embeddings()
+        self._scales = None
+        self._texts = list(self._texts)
+        self._metadatas = list(self._metadatas)
+        self._mapped = False
+        self.data_path = None
+
+    def save(self, path: str, dtype: str = 'float16') -> Path:
+        """
+        Persist the store as a memory-mappable index directory.
+
+        Saving into a directory that other processes have open is safe; it
+        adds a new generation instead of overwriting their mapped files.
+
+        Args:
+            path (str): Output directory
+            dtype (str): Embedding storage dtype: "float32", "float16" or "int8"
+
+        Returns:
+            Path: The generation directory written
+        """
+        generation, manifest = self.write(path, dtype)
+        publish_index(path, manifest)
+        return generation
+
+    def write(self, path: str, dtype: str = 'float16') -> Tuple[Path, Dict[str, Any]]:
+        """
+        Write the store as a new generation of an index without publishing it.
+
+        Files added to the generation directory before ``publish_index`` is
+        called become visible to readers together with the embeddings.
+
+        Args:
+            path (str): Index directory
+            dtype (str): Embedding storage dtype: "float32", "float16" or "int8"
+
+        Returns:
+            Tuple[Path, Dict[str, Any]]: The generation directory and the manifest to publish
+        """
+        if self._index_dirty:
+            self.build_index()
+
+        ivf_arrays = None
+        if self.ivf.is_trained:
+            ivf_arrays = {
+                'centroids': self.ivf.centroids,
+                'list_ids': self.ivf.list_ids,
+                'list_offsets': self.ivf.list_offsets,
+            }
+
+        return write_index(path, self.dense_embeddings(), self._texts, self._metadatas,
+                           self.embedder.name, dtype=dtype, ivf_arrays=ivf_arrays)
+
+    def open(self, path: str):
+        """
+        Memory-map a saved index, replacing the store contents.
+
+        Nothing is read up front; pages are loaded on demand and shared
+        between processes through the OS page cache.
+
+        Args:
+            path (str): Index directory written by ``save``
+        """
+        index = open_index(path)
+        manifest = index['manifest']
+        if manifest['embedder'] != self.embedder.name:
+            raise ValueError(
+                f"Index was built with embedder {manifest['embedder']}, "
+                f"but this store uses {self.embedder.name}"
+            )
+
+        self._matrix = index['embeddings']
+        self._scales = index['scales']
+        self._size = manifest['count']
+        self._texts = index['texts']
+        self._metadatas = index['metadatas']
+        self._mapped = True
+        self.data_path = index['path']
+
+        if index['ivf']:
+            self.ivf.load(**index['ivf'])
+        self._index_dirty = index['ivf'] is None
+
+    def load_folder(self, path: str) -> int:
+        """
+        Load .txt/.md documents, splitting them into paragraph chunks.
+
+        Args:
+            path (str): Folder (searched recursively) or single file
+
+        Returns:
+            int: Number of chunks added
+        """
+        path = Path(path)
+        if not path.exists():
+            raise ValueError(f"Local documents path not found: {path}")
+
+        files = [path] if path.is_file() else sorted(
+            p for p in path.rglob("*") if p.suffix.lower() in self.TEXT_FORMATS
+        )
+
+        texts, metadatas = [], []
+        for file_path in files:
+            content = file_path.read_text(encoding="utf-8", errors="ignore")
+            paragraphs = [p.strip() for p in content.split("\n\n") if p.strip()]
+            for i, paragraph in enumerate(paragraphs):
+                texts.append(paragraph)
+                metadatas.append({"file": str(file_path), "chunk": i})
+
+        return self.add_texts(texts, metadatas)
+
+    def build_index(self):
+        """Build the ANN index now instead of on the next query."""
+        with self._index_lock:
+            if self.index_type == 'ivf' and self._size:
+                self.ivf.build(self.embeddings if self._scales is None else self.dense_embeddings())
+            self._index_dirty = False
+
+    def search_vector(self, query: np.ndarray, k: int, nprobe: Optional[int] = None):
+        """
+        Top-k search for an already embedded query.
+
+        Args:
+            query (np.ndarray): L2-normalized query vector
+            k (int): Number of results
+            nprobe (int, optional): IVF lists to scan, overriding the default
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row indices and scores, best first
+        """
+        if self.index_type == 'ivf':
+            if self._index_dirty:
+                self.build_index()
+            return self.ivf.search(self.embeddings, query, k, nprobe, scales=self._scales)
+
+        scores = self._score_all(query)
+        best = top_k_indices(scores, k)
+        return best, scores[best]
+
+    def search_vectors(self, queries: np.ndarray, k: int,
+                       nprobe: Optional[int] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Top-k search for a batch of embedded queries.
+
+        The flat index scores the whole batch with one matrix multiply.
+
+        Args:
+            queries (np.ndarray): L2-normalized query matrix of shape (m, dimension)
+            k (int): Number of results per query
+            nprobe (int, optional): IVF lists to scan, overriding the default
+
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: Row indices and scores per query, best first
+        """
+        if self.index_type == 'ivf':
+            return [self.search_vector(query, k, nprobe) for query in queries]
+
+        scores = self._score_all(queries.T).T
+        k = min(k, self._size)
+        if k < self._size:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.tile(np.arange(self._size), (len(queries), 1))
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+
+        best = np.take_along_axis(candidates, order, axis=1)
+        best_scores = np.take_along_axis(candidate_scores, order, axis=1)
+        return list(zip(best, best_scores))
+
+    def _score_all(self, query: np.ndarray) -> np.ndarray:
+        """Similarity of every row to a query vector, or to each column of a query matrix."""
+        if self._matrix.dtype == np.float32:
+            return self.embeddings @ query
+
+        # Convert reduced-precision rows block by block instead of
+        # materializing a float32 copy of the whole matrix per query
+        scores = np.empty((self._size,) + query.shape[1:], dtype=np.float32)
+        for start in range(0, self._size, self.SCORE_BLOCK):
+            stop = min(start + self.SCORE_BLOCK, self._size)
+            scores[start:stop] = self.dense_embeddings(start, stop) @ query
+        return scores
+
+    def _format_results(self, indices: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+        documents = []
+        for idx, score in zip(indices, scores):
+            documents.append({
+                "content": self._texts[idx],
+                "metadata": {
+                    "score": float(score),
+                    "source": "local",
+                    **self._metadatas[idx]
+                }
+            })
+        return documents
+
+    def retrieve_documents(self, question: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retrieve the chunks most similar to the question.
+
+        Args:
+            question (str): The question to search for
+            num_results (int): Number of documents to retrieve
+
+        Returns:
+            List[Dict[str, Any]]: List of retrieved documents with content and metadata
+        """
+        if self._size == 0 or num_results <= 0:
+            return []
+
+        try:
+            query = self.embedder.embed([question])[0]
+            return self._format_results(*self.search_vector(query, num_results))
+
+        except Exception as e:
+            print(f"Error retrieving documents from local store: {e}")
+            return []
+
+    def retrieve_documents_many(self, questions: List[str], num_results: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve documents for several questions with one embedding call.
+
+        Args:
+            questions (List[str]): Questions to search for
+            num_results (int): Number of documents to retrieve per question
+
+        Returns:
+            List[List[Dict[str, Any]]]: One result list per question, in input order
+        """
+        if not questions:
+            return []
+        if self._size == 0 or num_results <= 0:
+            return [[] for _ in questions]
+
+        try:
+            queries = self.embedder.embed(questions)
+            return [self._format_results(*hits) for hits in self.search_vectors(queries, num_results)]
+
+        except Exception as e:
+            print(f"Error retrieving documents from local store: {e}")
+            return [[] for _ in questions]
+
+    def get_required_env_vars(self) -> List[str]:
+        """
+        Get the list of required environment variables for the local store.
+
+        Returns:
+            List[str]: List of required environment variable names
+        """
+        return ["OPENAI_API_KEY"]
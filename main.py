@@ -14,6 +14,9 @@ from dotenv import load_dotenv
 # Import our RAG system components
 from rag_source_base import RAGSourceType
 from vectorize_wrapper import VectorizeWrapper
+from local_vector_store import LocalVectorStore
+from hybrid_rag_source import HybridRAGSource
+from cached_rag_source import with_cache_from_env
 from rag_chat import RAGChat
 from cli_interface import CLIInterface
 from document_uploader import DocumentUploader
@@ -23,7 +26,7 @@ from function_calling_agent import FunctionCallingAgent
 load_dotenv()
 
 # Choose your RAG source - CHANGE THIS to switch between sources
-RAG_SOURCE = RAGSourceType.NONE  # Options: VECTORIZE, NONE
+RAG_SOURCE = RAGSourceType.NONE  # Options: VECTORIZE, LOCAL, HYBRID, NONE
 
 
 def check_environment_variables(required_vars):
@@ -39,15 +42,21 @@ def check_environment_variables(required_vars):
 def get_rag_source():
     """Get the RAG source and required environment variables based on configuration."""
     if RAG_SOURCE == RAGSourceType.VECTORIZE:
-        wrapper = VectorizeWrapper()
+        wrapper = with_cache_from_env(VectorizeWrapper())
         return wrapper, wrapper.get_required_env_vars()
+    elif RAG_SOURCE == RAGSourceType.LOCAL:
+        store = with_cache_from_env(LocalVectorStore())
+        return store, store.get_required_env_vars()
+    elif RAG_SOURCE == RAGSourceType.HYBRID:
+        hybrid = with_cache_from_env(HybridRAGSource())
+        return hybrid, hybrid.get_required_env_vars()
     elif RAG_SOURCE == RAGSourceType.NONE:
         return None, ["OPENAI_API_KEY"]
     else:
         raise ValueError(f"Unsupported RAG source: {RAG_SOURCE}")
 
 
-def run_chat_mode(cli):
+def run_chat_mode(cli, stream=True):
     """Run the interactive chat mode."""
     
     try:
@@ -77,6 +86,15 @@ VECTORIZE_PIPELINE_ID=your-pipeline-id
 # - OpenAI API: https://platform.openai.com/api-keys
 # - Vectorize: https://vectorize.io (sign up and create a pipeline)
                 """)
+            elif RAG_SOURCE in (RAGSourceType.LOCAL, RAGSourceType.HYBRID):
+                cli.print_info("""
+# Required for the Local RAG Source:
+OPENAI_API_KEY=your-openai-api-key
+
+# Optional:
+LOCAL_DOCUMENTS_PATH=./documents   # .txt/.md files to index in memory
+LOCAL_EMBEDDER=hashing             # "hashing" or "tfidf" (offline), or "openai"
+                """)
             else:
                 cli.print_info("""
 # Required for OpenAI only:
@@ -95,7 +113,7 @@ OPENAI_API_KEY=your-openai-api-key
         else:
             cli.print_info("Running in OpenAI-only mode (no document retrieval)")
         
-        rag_chat = RAGChat(cli, rag_source)
+        rag_chat = RAGChat(cli, rag_source, stream=stream)
         
         # Start interactive chat
         rag_chat.interactive_chat()
@@ -124,7 +142,9 @@ def run_upload_mode(cli, upload_args):
             return 1
         
         # Initialize uploader
-        uploader = DocumentUploader()
+        uploader = DocumentUploader(
+            concurrency=upload_args.concurrency, manifest_path=upload_args.manifest, force=upload_args.force
+        )
         cli.print_success("Document uploader initialized!")
         
         # Handle upload based on arguments
@@ -148,15 +168,12 @@ def run_upload_mode(cli, upload_args):
                 cli.print_error("No files found matching the pattern(s)")
                 return 1
             
-            # Upload files
+            # Upload files in parallel
             cli.print_info(f"Uploading {len(all_files)} file(s)...")
-            successful = 0
-            
-            for file_path in all_files:
-                if uploader.upload_file(str(file_path)):
-                    successful += 1
+            results = uploader.upload_files(all_files)
+            successful = sum(results.values())
             
-            cli.print_success(f"Upload complete: {successful}/{len(all_files)} files uploaded")
+            cli.print_success(f"Upload complete: {successful}/{len(results)} files uploaded")
             
         elif upload_args.command == 'folder':
             from pathlib import Path
@@ -169,7 +186,7 @@ def run_upload_mode(cli, upload_args):
                 return 1
             
             cli.print_info(f"Uploading files from folder: {folder_path}")
-            results = uploader.upload_folder(str(folder_path))
+            results = uploader.upload_folder(str(folder_path), upload_args.include, upload_args.exclude)
             
             if results:
                 successful = sum(results.values())
@@ -184,7 +201,55 @@ def run_upload_mode(cli, upload_args):
         return 1
 
 
-def run_agent_mode(cli):
+def run_ingest_mode(cli, ingest_args):
+    """Run the local ingestion mode: parse, chunk, embed and index documents."""
+    try:
+        from ingestion import ingest
+        from embedders import get_embedder
+        from embedding_service import with_embedding_service_from_env
+        from index_storage import index_idf_path
+        
+        # A TF-IDF embedder keeps the IDF table of the index being updated, so vectors can be reused
+        embedder = with_embedding_service_from_env(
+            get_embedder(ingest_args.embedder, idf_path=index_idf_path(ingest_args.index))
+        )
+        cli.print_info(f"Ingesting {ingest_args.path} into {ingest_args.index} ({embedder.name})...")
+        
+        with cli.spinner("Parsing, chunking and embedding"):
+            stats = ingest(
+                ingest_args.path,
+                ingest_args.index,
+                embedder=embedder,
+                index_type=ingest_args.index_type,
+                max_tokens=ingest_args.chunk_tokens,
+                overlap=ingest_args.overlap,
+                batch_size=ingest_args.batch_size,
+                workers=ingest_args.workers,
+                include=ingest_args.include,
+                exclude=ingest_args.exclude,
+                chunking=ingest_args.chunking,
+                reuse=not ingest_args.no_reuse,
+            )
+        
+        cli.print_success(
+            f"Indexed {stats['chunks']} chunks from {stats['files']} files in {stats['seconds']:.1f}s "
+            f"({stats['chunks_per_second']:.0f} chunks/s, {stats['embed_seconds']:.1f}s embedding)"
+        )
+        cli.print_info(f"Embedded {stats['embedded']} new chunks, reused {stats['reused']} unchanged vectors")
+        cli.print_info("Use it with RAG_SOURCE = RAGSourceType.LOCAL (or HYBRID) and:")
+        cli.print_info(f"  LOCAL_INDEX_PATH={stats['index_path']}")
+        cli.print_info(f"  LOCAL_EMBEDDER={ingest_args.embedder}")
+        if ingest_args.embedder == 'tfidf':
+            cli.print_info("  (the IDF table is saved in the index and loaded from LOCAL_INDEX_PATH; "
+                           "leave TFIDF_IDF_PATH unset)")
+        return 0
+        
+    except Exception as e:
+        cli.print_error(f"Ingestion failed: {e}")
+        return 1
+
+
+def run_agent_mode(cli, stream=True):
     """Run the function calling agent mode."""
     try:
         # Check required environment variables for agent
@@ -200,7 +265,7 @@ def run_agent_mode(cli):
             return 1
         
         # Initialize function calling agent
-        agent = FunctionCallingAgent(cli)
+        agent = FunctionCallingAgent(cli, stream=stream)
         cli.print_success("Function calling agent initialized!")
         
         # Start interactive agent chat
@@ -213,8 +278,14 @@ def run_agent_mode(cli):
         return 1
 
 
-def run_web_mode(cli):
-    """Run the web interface mode."""
+def run_web_mode(cli, use_async=False):
+    """
+    Run the web interface mode.
+    
+    Args:
+        cli: CLI interface for output
+        use_async (bool): Serve the ASGI app with Hypercorn instead of the Flask dev server
+    """
     try:
         # Check required environment variables
         required_vars = ["OPENAI_API_KEY"]
@@ -233,8 +304,13 @@ def run_web_mode(cli):
         cli.print_info("🔧 Press Ctrl+C to stop the server")
         
         # Import and run web app
-        from web_app import app
-        app.run(host='0.0.0.0', port=5000, debug=False)
+        if use_async:
+            import asyncio
+            from async_web_app import serve
+            asyncio.run(serve(host='0.0.0.0', port=5000))
+        else:
+            from web_app import app
+            app.run(host='0.0.0.0', port=5000, debug=False)
         
         return 0
         
@@ -259,6 +335,7 @@ Commands:
   upload folder ./documents              # Upload folder
   agent                                   # Start function calling agent (Week 2 Assignment!)
   web                                     # Start web interface for agent (NEW!)
+  ingest ./documents                      # Build a local index (no Vectorize needed)
   
 Examples:
   python main.py chat                     # Start chat mode
@@ -266,6 +343,8 @@ Examples:
   python main.py upload folder docs/     # Upload all files from docs folder
   python main.py agent                    # Start agent with tools (WEEK 2 ASSIGNMENT)
   python main.py web                      # Start web interface (WEEK 2 BONUS!)
+  python main.py web --async              # Serve the web interface with the async ASGI server
+  python main.py ingest docs/ --index ./local_index --workers 8
         """
     )
     
@@ -273,12 +352,35 @@ Examples:
     
     # Chat mode (default)
     chat_parser = subparsers.add_parser('chat', help='Start interactive RAG chat')
+    chat_parser.add_argument('--no-stream', action='store_true', help='Print answers only once complete')
     
     # Agent mode (NEW - for assignment)
     agent_parser = subparsers.add_parser('agent', help='Start function calling agent with tools')
+    agent_parser.add_argument('--no-stream', action='store_true', help='Print answers only once complete')
     
     # Web mode (BONUS - web interface)
     web_parser = subparsers.add_parser('web', help='Start web interface for function calling agent')
+    web_parser.add_argument('--async', dest='use_async', action='store_true',
+                            help='Serve with the async ASGI app (Quart + Hypercorn)')
+    
+    # Ingest mode (local parse -> chunk -> embed -> index)
+    ingest_parser = subparsers.add_parser('ingest', help='Build a local vector index from documents')
+    ingest_parser.add_argument('path', help='File or folder (recursive) to ingest')
+    ingest_parser.add_argument('--index', default=os.getenv('LOCAL_INDEX_PATH', './local_index'),
+                               help='Output index directory (default: LOCAL_INDEX_PATH or ./local_index)')
+    ingest_parser.add_argument('--embedder', default=os.getenv('LOCAL_EMBEDDER', 'hashing'),
+                               choices=['hashing', 'tfidf', 'openai'], help='Embedder (default: LOCAL_EMBEDDER or hashing)')
+    ingest_parser.add_argument('--index-type', default='flat', choices=['flat', 'ivf'], help='Search index type')
+    ingest_parser.add_argument('--chunking', default='cdc', choices=['cdc', 'fixed'],
+                               help='cdc: content-defined boundaries (edits re-embed only nearby chunks); '
+                                    'fixed: token budget with overlap')
+    ingest_parser.add_argument('--chunk-tokens', type=int, default=200, help='Maximum tokens per chunk')
+    ingest_parser.add_argument('--overlap', type=int, default=40, help='Tokens shared by consecutive chunks (fixed only)')
+    ingest_parser.add_argument('--no-reuse', action='store_true', help='Re-embed every chunk instead of reusing the existing index')
+    ingest_parser.add_argument('--batch-size', type=int, default=256, help='Chunks per embedding call')
+    ingest_parser.add_argument('--workers', type=int, default=None, help='Parser processes (default: CPU count)')
+    ingest_parser.add_argument('--include', nargs='+', default=None, metavar='PATTERN', help='Only ingest matching globs')
+    ingest_parser.add_argument('--exclude', nargs='+', default=None, metavar='PATTERN', help='Skip matching globs')
     
     # Upload mode
     upload_parser = subparsers.add_parser('upload', help='Upload documents to RAG system')
@@ -287,10 +389,20 @@ Examples:
     # Upload file command
     file_parser = upload_subparsers.add_parser('file', help='Upload single file or files with wildcard')
     file_parser.add_argument('path', nargs='+', help='File path(s) to upload')
+    file_parser.add_argument('--concurrency', type=int, default=8, help='Files uploaded in parallel (default: 8)')
+    file_parser.add_argument('--manifest', default=None, help='Upload manifest path (default: .upload_manifest.db)')
+    file_parser.add_argument('--force', action='store_true', help='Re-upload files even if unchanged')
     
     # Upload folder command  
     folder_parser = upload_subparsers.add_parser('folder', help='Upload all files from folder')
     folder_parser.add_argument('path', help='Folder path to upload from')
+    folder_parser.add_argument('--concurrency', type=int, default=8, help='Files uploaded in parallel (default: 8)')
+    folder_parser.add_argument('--manifest', default=None, help='Upload manifest path (default: .upload_manifest.db)')
+    folder_parser.add_argument('--force', action='store_true', help='Re-upload files even if unchanged')
+    folder_parser.add_argument('--include', nargs='+', default=None, metavar='PATTERN',
+                               help='Only upload files matching these globs (e.g. "reports/*" "*.pdf")')
+    folder_parser.add_argument('--exclude', nargs='+', default=None, metavar='PATTERN',
+                               help='Skip files and folders matching these globs (e.g. ".git" "drafts")')
     
     args = parser.parse_args()
     
@@ -302,7 +414,7 @@ Examples:
     cli = CLIInterface("Agent Engineering Bootcamp - RAG System")
     
     if args.mode == 'chat':
-        return run_chat_mode(cli)
+        return run_chat_mode(cli, stream=not getattr(args, 'no_stream', False))
     elif args.mode == 'upload':
         if not args.command:
             cli.print_error("Upload mode requires a command (file or folder)")
@@ -310,9 +422,11 @@ Examples:
             return 1
         return run_upload_mode(cli, args)
     elif args.mode == 'agent':
-        return run_agent_mode(cli)
+        return run_agent_mode(cli, stream=not args.no_stream)
     elif args.mode == 'web':
-        return run_web_mode(cli)
+        return run_web_mode(cli, use_async=args.use_async)
+    elif args.mode == 'ingest':
+        return run_ingest_mode(cli, args)
     else:
         parser.print_help()
         return 1
@@ -0,0 +1,83 @@
+"""Tests for the CachedRAGSource retrieval cache."""
+
+from typing import Any, Dict, List
+
+from cached_rag_source import CachedRAGSource, with_cache_from_env
+from embedders import HashingEmbedder
+from rag_source_base import RAGSourceBase
+
+
+QUESTION = ("Which settings does the upload pipeline need and what does the ingestion "
+            "service log when a scheduled batch job fails with error code E1042?")
+
+
+class CountingSource(RAGSourceBase):
+    """Source that returns one document naming the question it was asked."""
+
+    def __init__(self):
+        self.questions: List[str] = []
+
+    def retrieve_documents(self, question: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        self.questions.append(question)
+        return [{"content": question, "metadata": {"rank": i}} for i in range(num_results)]
+
+    def get_required_env_vars(self) -> List[str]:
+        return []
+
+
+def test_identifier_only_difference_misses_cache():
+    other = QUESTION.replace("E1042", "E2077")
+    embedder = HashingEmbedder()
+    first, second = embedder.embed([CachedRAGSource.normalize_question(q) for q in (QUESTION, other)])
+    # Close enough that a 0.95 semantic tier would hand back the wrong documents
+    assert float(first @ second) > 0.95
+
+    source = CountingSource()
+    cache = CachedRAGSource(source, embedder=embedder)
+
+    assert cache.retrieve_documents(QUESTION, 3)[0]["content"] == QUESTION
+    assert cache.retrieve_documents(other, 3)[0]["content"] == other
+    assert source.questions == [QUESTION, other]
+    assert cache.stats()["semantic_hits"] == 0
+
+
+def test_cache_from_env_is_exact_only_by_default(monkeypatch):
+    monkeypatch.setenv("RAG_CACHE", "true")
+    monkeypatch.delenv("RAG_CACHE_SIMILARITY", raising=False)
+
+    cache = with_cache_from_env(CountingSource())
+
+    assert cache.similarity_threshold is None
+
+
+def test_exact_tier_normalizes_question():
+    source = CountingSource()
+    cache = CachedRAGSource(source)
+
+    cache.retrieve_documents("What is RAG?", 2)
+    cache.retrieve_documents("  what IS rag ", 2)
+
+    assert len(source.questions) == 1
+    assert cache.stats()["exact_hits"] == 1
+
+
+def test_evicted_question_returns_its_slot():
+    source = CountingSource()
+    cache = CachedRAGSource(source, max_size=2, similarity_threshold=0.99)
+    first, second, third = "How are chunks embedded?", "Which port does the web app use?", "Who maintains the docs?"
+
+    cache.retrieve_documents(first, 2)
+    cache.retrieve_documents(second, 2)
+    first_slot = cache._slot_keys.index((CachedRAGSource.normalize_question(first), 2))
+    cache.retrieve_documents(third, 2)
+
+    # The least recently used question made room, and its slot went to the new one
+    assert cache._slot_keys[first_slot] == (CachedRAGSource.normalize_question(third), 2)
+    assert cache._free_slots == []
+    assert sorted(key[0] for key in cache._slot_keys) == sorted(
+        CachedRAGSource.normalize_question(q) for q in (second, third))
+
+    # Neither tier still answers the evicted question
+    cache.retrieve_documents(first + "  ", 2)
+    assert source.questions == [first, second, third, first + "  "]
+    assert cache.stats()["semantic_hits"] == 0
@@ -0,0 +1,130 @@
+"""Tests for the two-tier completion cache."""
+
+import asyncio
+import json
+from contextlib import nullcontext
+
+import litellm
+import pytest
+
+import completion_cache
+from completion_cache import CompletionCache, acomplete, complete
+
+
+def tool_call_response(call_id: str = "call_abc123"):
+    return litellm.ModelResponse(
+        model="gpt-4o-mini",
+        choices=[{
+            "index": 0,
+            "finish_reason": "tool_calls",
+            "message": {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": "search_documents", "arguments": json.dumps({"query": "index format"})},
+                }],
+            },
+        }],
+    )
+
+
+def conversation(call_id: str):
+    return [
+        {"role": "user", "content": "How is the index stored?"},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": call_id, "type": "function",
+             "function": {"name": "search_documents", "arguments": "{\"query\": \"index format\"}"}},
+        ]},
+        {"role": "tool", "tool_call_id": call_id, "content": "Embeddings are memory mapped."},
+    ]
+
+
+class NullCLI:
+    def spinner(self, message):
+        return nullcontext()
+
+
+def assert_same_tool_call(cached, original):
+    call = cached.choices[0].message.tool_calls[0]
+    expected = original.choices[0].message.tool_calls[0]
+    assert (call.id, call.function.name, call.function.arguments) == \
+        (expected.id, expected.function.name, expected.function.arguments)
+    assert cached.choices[0].finish_reason == "tool_calls"
+
+
+def test_tool_call_response_round_trips_through_disk(tmp_path):
+    path = str(tmp_path / "completions.db")
+    response = tool_call_response()
+    writer = CompletionCache(path=path)
+    writer.put("key", response, latency=1.5)
+    writer.close()
+
+    reader = CompletionCache(path=path)
+    first, second = reader.get("key"), reader.get("key")
+    reader.close()
+
+    assert_same_tool_call(first, response)
+    assert first is not second
+    stats = reader.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+    assert stats["seconds_saved"] > 0
+
+
+def test_key_ignores_tool_call_ids_and_transport_settings():
+    first = CompletionCache.key(model="gpt-4o-mini", messages=conversation("call_1"), api_key="a", stream=True)
+    second = CompletionCache.key(model="gpt-4o-mini", messages=conversation("call_zz"), api_key="b")
+    other_model = CompletionCache.key(model="gpt-4o", messages=conversation("call_1"))
+
+    assert first == second
+    assert first != other_model
+
+
+def test_expired_entries_miss():
+    cache = CompletionCache(ttl=0.0)
+    cache.put("key", tool_call_response(), latency=1.0)
+
+    assert cache.get("key") is None
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch):
+    cache = CompletionCache()
+    monkeypatch.setenv("COMPLETION_CACHE", "true")
+    monkeypatch.setattr(completion_cache, "_cache", cache)
+    return cache
+
+
+def test_complete_serves_repeated_request_from_cache(monkeypatch, enabled_cache):
+    calls = []
+    response = tool_call_response()
+    monkeypatch.setattr(litellm, "completion", lambda **kwargs: calls.append(kwargs) or response)
+
+    first, _ = complete(NullCLI(), "Thinking...", model="gpt-4o-mini", messages=conversation("call_1"))
+    second, printed = complete(NullCLI(), "Thinking...", model="gpt-4o-mini", messages=conversation("call_2"))
+
+    assert len(calls) == 1
+    assert first is response and not printed
+    assert_same_tool_call(second, response)
+
+
+def test_acomplete_serves_repeated_request_from_cache(monkeypatch, enabled_cache):
+    calls = []
+    response = tool_call_response()
+
+    async def acompletion(**kwargs):
+        calls.append(kwargs)
+        return response
+
+    monkeypatch.setattr(litellm, "acompletion", acompletion)
+
+    async def ask_twice():
+        await acomplete(NullCLI(), "Thinking...", model="gpt-4o-mini", messages=conversation("call_1"))
+        return await acomplete(NullCLI(), "Thinking...", model="gpt-4o-mini", messages=conversation("call_1"))
+
+    cached, _ = asyncio.run(ask_twice())
+
+    assert len(calls) == 1
+    assert_same_tool_call(cached, response)
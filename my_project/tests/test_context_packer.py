@@ -0,0 +1,69 @@
+"""Tests for ContextPacker."""
+
+from context_packer import ContextPacker, estimate_tokens
+
+
+def test_explicit_zero_settings_override_environment(monkeypatch):
+    monkeypatch.setenv("CONTEXT_MAX_TOKENS", "2000")
+    monkeypatch.setenv("CONTEXT_DEDUP_THRESHOLD", "0.8")
+
+    packer = ContextPacker(max_tokens=0, dedup_threshold=0.0)
+
+    assert packer.max_tokens == 0
+    assert packer.dedup_threshold == 0.0
+    assert packer.pack([{"content": "Some retrieved text about vectors.", "metadata": {"score": 1.0}}]) == []
+
+
+def test_unset_settings_come_from_environment(monkeypatch):
+    monkeypatch.setenv("CONTEXT_MAX_TOKENS", "123")
+    monkeypatch.setenv("CONTEXT_CHUNK_TOKENS", "45")
+    monkeypatch.setenv("CONTEXT_DEDUP_THRESHOLD", "0.5")
+
+    packer = ContextPacker()
+
+    assert (packer.max_tokens, packer.max_chunk_tokens, packer.dedup_threshold) == (123, 45, 0.5)
+
+
+def doc(content: str, score: float) -> dict:
+    return {"content": content, "metadata": {"score": score}}
+
+
+def test_near_duplicates_are_dropped_keeping_the_best_scored():
+    text = "The local index stores float16 embeddings in a memory mapped file next to the chunk texts and metadata."
+    documents = [
+        doc(text + " It was rebuilt yesterday.", 0.7),
+        doc(text, 0.9),
+        doc("BM25 postings are stored in CSR arrays beside the embeddings.", 0.5),
+    ]
+
+    packer = ContextPacker(max_tokens=1000, max_chunk_tokens=400, dedup_threshold=0.8)
+
+    packed = packer.pack(documents)
+
+    assert [d["content"] for d in packed] == [text, documents[2]["content"]]
+    assert packer.last_stats["duplicates"] == 1
+
+
+def test_long_documents_are_trimmed_to_matching_sentences():
+    filler = " ".join(f"Sentence {i} talks about something unrelated to the question at hand." for i in range(20))
+    content = f"{filler} The retry budget for uploads is five attempts per chunk. {filler}"
+    packer = ContextPacker(max_tokens=1000, max_chunk_tokens=60, dedup_threshold=0.8)
+
+    packed = packer.pack([doc(content, 1.0)], question="What is the retry budget for uploads?")
+
+    trimmed = packed[0]["content"]
+    assert "The retry budget for uploads is five attempts per chunk." in trimmed
+    assert estimate_tokens(trimmed) <= 60
+    assert packed[0]["metadata"]["trimmed"] is True
+    assert packer.last_stats["trimmed"] == 1
+
+
+def test_packing_stops_when_the_budget_is_spent():
+    documents = [doc(f"Document {i} " + "with some filler words " * 20, 1.0 - i / 10) for i in range(5)]
+    packer = ContextPacker(max_tokens=300, max_chunk_tokens=400, dedup_threshold=1.0)
+
+    packed = packer.pack(documents)
+
+    assert sum(estimate_tokens(d["content"]) for d in packed) <= 300
+    assert packed[0]["content"].startswith("Document 0")
+    assert packer.last_stats["output_tokens"] <= 300
@@ -0,0 +1,63 @@
+"""Tests for BM25 keyword search, reciprocal-rank fusion and HybridRAGSource."""
+
+from bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+from embedders import HashingEmbedder
+from hybrid_rag_source import HybridRAGSource
+from local_vector_store import LocalVectorStore
+
+
+TEXTS = [
+    "The ingestion pipeline parses documents and splits them into chunks.",
+    "Error ERR-1042 means the index manifest could not be read.",
+    "Vector search compares the query embedding with every chunk embedding.",
+    "Errors while reading the index are logged with their error code.",
+    "Hybrid search fuses keyword and vector rankings.",
+]
+
+
+def test_tokenize_keeps_identifiers_and_their_parts():
+    assert tokenize("See ERR-1042 in v2.3") == ["see", "err-1042", "err", "1042", "in", "v2.3", "v2", "3"]
+
+
+def test_bm25_ranks_exact_identifier_first():
+    index = BM25Index.from_texts(TEXTS)
+
+    ids, scores = index.search("what does ERR-1042 mean", 3)
+
+    assert ids[0] == 1
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_bm25_never_returns_documents_without_query_terms():
+    index = BM25Index.from_texts(TEXTS)
+
+    ids, _ = index.search("fusion rankings", 10)
+
+    assert list(ids) == [4]
+    assert len(index.search("completely unrelated", 10)[0]) == 0
+
+
+def test_rrf_prefers_ids_found_by_both_rankers():
+    ids, scores = reciprocal_rank_fusion([[3, 1, 2], [5, 4, 1]])
+
+    assert ids[0] == 1
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_rrf_breaks_ties_by_ascending_id():
+    ids, _ = reciprocal_rank_fusion([[7, 2], [2, 7], [9], [4]])
+
+    assert list(ids) == [2, 7, 4, 9]
+
+
+def test_hybrid_source_surfaces_identifier_match():
+    store = LocalVectorStore(embedder=HashingEmbedder(dimension=64), from_env=False)
+    store.add_texts(TEXTS, [{"file": f"doc{i}.md"} for i in range(len(TEXTS))])
+    source = HybridRAGSource(store=store, candidates=5)
+
+    documents = source.retrieve_documents("ERR-1042", num_results=2)
+
+    assert documents[0]["content"] == TEXTS[1]
+    assert documents[0]["metadata"]["bm25_rank"] == 1
+    assert documents[0]["metadata"]["file"] == "doc1.md"
+    assert set(source.last_timings) == set(HybridRAGSource.STAGES)
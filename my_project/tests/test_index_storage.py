@@ -0,0 +1,82 @@
+"""Tests for the memory-mapped index format and generation publishing."""
+
+import json
+
+import numpy as np
+import pytest
+
+from index_storage import MANIFEST_NAME, open_index, publish_index, quantize, save_index, write_index
+
+
+def unit_vectors(n: int, dimension: int = 64, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).normal(size=(n, dimension))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def stored_vectors(index) -> np.ndarray:
+    vectors = np.asarray(index["embeddings"], dtype=np.float32)
+    if index["scales"] is not None:
+        vectors = vectors * np.asarray(index["scales"])[:, None]
+    return vectors
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 0.0), ("float16", 1e-3), ("int8", 1e-2)])
+def test_round_trip_accuracy(tmp_path, dtype, tolerance):
+    vectors = unit_vectors(200)
+    texts = [f"chunk {i} ✓" for i in range(200)]
+    metadatas = [{"file": "doc.md", "chunk": i} for i in range(200)]
+
+    save_index(str(tmp_path), vectors, texts, metadatas, "test-embedder", dtype=dtype)
+    index = open_index(str(tmp_path))
+
+    assert index["manifest"]["dtype"] == dtype
+    assert np.abs(stored_vectors(index) - vectors).max() <= tolerance
+    # Rankings survive quantization
+    query = vectors[7]
+    assert int(np.argmax(stored_vectors(index) @ query)) == 7
+    assert list(index["texts"]) == texts
+    assert list(index["metadatas"]) == metadatas
+
+
+def test_int8_scales_keep_zero_rows():
+    vectors = unit_vectors(3)
+    vectors[1] = 0.0
+
+    quantized, scales = quantize(vectors, "int8")
+
+    assert quantized.dtype == np.int8
+    assert not quantized[1].any()
+    assert np.all(scales > 0)
+
+
+def test_publish_swaps_generations(tmp_path):
+    first = unit_vectors(10, seed=1)
+    save_index(str(tmp_path), first, [f"old {i}" for i in range(10)], [{}] * 10, "test-embedder")
+    old = open_index(str(tmp_path))
+
+    second = unit_vectors(12, seed=2)
+    generation, manifest = write_index(str(tmp_path), second, [f"new {i}" for i in range(12)], [{}] * 12,
+                                       "test-embedder")
+    # Written but not yet published: readers still get the old generation
+    assert open_index(str(tmp_path))["manifest"]["count"] == 10
+
+    publish_index(str(tmp_path), manifest)
+    new = open_index(str(tmp_path))
+
+    assert new["path"] == generation
+    assert new["texts"][0] == "new 0"
+    # Files already mapped from the old generation stay readable
+    assert old["texts"][0] == "old 0"
+    np.testing.assert_allclose(np.asarray(old["embeddings"], dtype=np.float32), first, atol=1e-3)
+
+
+def test_publish_keeps_current_and_previous_generation_only(tmp_path):
+    (tmp_path / "notes.txt").write_text("left here by a user")
+    generations = [
+        save_index(str(tmp_path), unit_vectors(4, seed=i), ["text"] * 4, [{}] * 4, "test-embedder")
+        for i in range(3)
+    ]
+
+    remaining = sorted(p.name for p in tmp_path.iterdir())
+    assert remaining == sorted([generations[1].name, generations[2].name, MANIFEST_NAME, "notes.txt"])
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text())["data"] == generations[2].name
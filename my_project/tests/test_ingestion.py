@@ -0,0 +1,81 @@
+"""Tests for content-defined chunking and chunk-hash vector reuse in ingest."""
+
+import random
+
+import numpy as np
+import pytest
+
+from embedders import HashingEmbedder
+from index_storage import open_index
+from ingestion import chunk_hash, content_defined_chunks, ingest
+
+
+def prose(words: int, seed: int) -> str:
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(500)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_chunks_respect_token_limit_and_keep_every_word():
+    text = prose(5000, seed=0)
+
+    chunks = content_defined_chunks(text, max_tokens=200)
+
+    assert " ".join(chunks) == text
+    assert max(len(chunk.split()) for chunk in chunks) <= 200
+    assert min(len(chunk.split()) for chunk in chunks[:-1]) >= 50
+
+
+def test_boundaries_survive_an_edit():
+    words = prose(5000, seed=1).split()
+    before = content_defined_chunks(" ".join(words), max_tokens=200)
+    words[2500:2500] = ["an", "inserted", "sentence", "in", "the", "middle"]
+    after = content_defined_chunks(" ".join(words), max_tokens=200)
+
+    unchanged = {chunk_hash(chunk) for chunk in before} & {chunk_hash(chunk) for chunk in after}
+    # Only the chunks around the edit change
+    assert len(after) - len(unchanged) <= 3
+    assert after[0] == before[0] and after[-1] == before[-1]
+
+
+@pytest.fixture
+def folder(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(4):
+        (docs / f"doc{i}.md").write_text(prose(1500, seed=10 + i))
+    return docs
+
+
+def run_ingest(folder, index_path):
+    return ingest(str(folder), str(index_path), embedder=HashingEmbedder(dimension=64), workers=1)
+
+
+def test_reingest_reuses_unchanged_chunks(folder, tmp_path):
+    index_path = tmp_path / "index"
+    first = run_ingest(folder, index_path)
+    assert first["embedded"] == first["chunks"] and first["reused"] == 0
+
+    second = run_ingest(folder, index_path)
+    assert second["embedded"] == 0
+    assert second["reused"] == first["chunks"]
+
+
+def test_edit_only_embeds_changed_chunks(folder, tmp_path):
+    index_path = tmp_path / "index"
+    run_ingest(folder, index_path)
+
+    edited = folder / "doc2.md"
+    words = edited.read_text().split()
+    words[700:700] = ["freshly", "added", "words"]
+    edited.write_text(" ".join(words))
+    second = run_ingest(folder, index_path)
+
+    assert 0 < second["embedded"] <= 3
+    assert second["embedded"] + second["reused"] == second["chunks"]
+
+    # Reused vectors equal a fresh embedding of the same text
+    index = open_index(str(index_path))
+    rows = [0, len(index["texts"]) - 1]
+    fresh = HashingEmbedder(dimension=64).embed([index["texts"][row] for row in rows])
+    np.testing.assert_allclose(np.asarray(index["embeddings"][rows], dtype=np.float32), fresh, atol=1e-3)
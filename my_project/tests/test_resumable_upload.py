@@ -0,0 +1,133 @@
+"""Tests for ResumableUploader against a local HTTP stand-in."""
+
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from resumable_upload import ResumableUploader
+
+
+CHUNK = 64 * 1024
+
+
+class UploadTarget(BaseHTTPRequestHandler):
+    """
+    Minimal resumable-upload server.
+
+    Chunks are acknowledged with 308 and ``Range: bytes=0-N`` until the last
+    one. Paths under ``/plain`` ignore ``Content-Range`` and store each body
+    as the whole file, like a target without chunk support.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status: int, stored: int = 0):
+        self.send_response(status)
+        if status == 308 and stored:
+            self.send_header("Range", f"bytes=0-{stored - 1}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_PUT(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        content_range = self.headers.get("Content-Range")
+        server.requests.append((self.path, content_range))
+
+        if self.path.startswith("/plain"):
+            server.files[self.path] = bytearray(body)
+            return self._reply(200)
+
+        data = server.files.setdefault(self.path, bytearray())
+        total = int(content_range.rsplit("/", 1)[1])
+        if content_range.startswith("bytes */"):
+            return self._reply(200 if len(data) == total else 308, len(data))
+
+        if server.fail_next:
+            server.fail_next -= 1
+            return self._reply(503)
+
+        start = int(content_range.split()[1].split("-")[0])
+        if start != len(data):
+            return self._reply(308, len(data))
+        data.extend(body)
+        self._reply(200 if len(data) == total else 308, len(data))
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def target():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UploadTarget)
+    server.files = {}
+    server.requests = []
+    server.fail_next = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "large.csv"
+    path.write_bytes(os.urandom(5 * CHUNK + 123))
+    return path
+
+
+def make_uploader(tmp_path, **kwargs) -> ResumableUploader:
+    return ResumableUploader(chunk_size=CHUNK, backoff=0, journal_path=str(tmp_path / "journal.json"), **kwargs)
+
+
+def url_of(server, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_port}{path}"
+
+
+def test_retries_chunk_after_server_error(target, document, tmp_path):
+    target.fail_next = 1
+    uploader = make_uploader(tmp_path)
+
+    assert uploader.upload(str(document), "text/csv", lambda: url_of(target, "/upload/1"))
+
+    assert target.files["/upload/1"] == document.read_bytes()
+    assert json.loads((tmp_path / "journal.json").read_text()) == {}
+
+
+def test_resumes_from_journal_in_new_uploader(target, document, tmp_path):
+    class Interrupted(Exception):
+        pass
+
+    def stop_after_two_chunks(path, sent, total):
+        if sent >= 2 * CHUNK:
+            raise Interrupted()
+
+    first = make_uploader(tmp_path, progress=stop_after_two_chunks)
+    with pytest.raises(Interrupted):
+        first.upload(str(document), "text/csv", lambda: url_of(target, "/upload/2"))
+    assert len(target.files["/upload/2"]) == 2 * CHUNK
+
+    target.requests.clear()
+    new_urls = []
+    second = make_uploader(tmp_path)
+    assert second.upload(str(document), "text/csv", lambda: new_urls.append(1) or url_of(target, "/upload/3"))
+
+    assert new_urls == []
+    assert target.files["/upload/2"] == document.read_bytes()
+    chunk_ranges = [content_range for _, content_range in target.requests if "*" not in content_range]
+    assert chunk_ranges[0].startswith(f"bytes {2 * CHUNK}-")
+    assert len(chunk_ranges) == 4
+
+
+def test_falls_back_to_single_put_on_plain_target(target, document, tmp_path):
+    uploader = make_uploader(tmp_path)
+
+    assert uploader.upload(str(document), "text/csv", lambda: url_of(target, "/plain/1"))
+
+    assert target.files["/plain/1"] == document.read_bytes()
+    # One chunk before the fallback, then the whole file
+    assert [content_range for _, content_range in target.requests] == [f"bytes 0-{CHUNK - 1}/{document.stat().st_size}", None]
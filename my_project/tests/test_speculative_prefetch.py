@@ -0,0 +1,78 @@
+"""Tests for matching speculative document prefetches to the model's tool calls."""
+
+import json
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+from agent_tools import AgentTools
+from function_calling_agent import FunctionCallingAgent, _Prefetch
+
+
+class NullCLI:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.delenv("AGENT_PREFETCH_MATCH", raising=False)
+    tools = AgentTools()
+    tools.rag_source, tools.has_rag = object(), True
+    return FunctionCallingAgent(NullCLI(), tools=tools, speculative_prefetch=True)
+
+
+def tool_call(name: str, **arguments):
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments=json.dumps(arguments)))
+
+
+def prefetch(question: str) -> _Prefetch:
+    return _Prefetch(question, Future())
+
+
+def test_rephrased_query_matches(agent):
+    pending = prefetch("Can you tell me what the vector index latency is?")
+    calls = [tool_call("search_web", query="vector index news"), tool_call("search_documents", query="vector index latency")]
+
+    assert agent._match_prefetch(calls, pending) == 1
+    # The hit is recorded once the result is used
+    assert not pending.settled
+    assert agent.prefetch_stats.stats()["prefetches"] == 0
+
+
+def test_more_results_than_prefetched_is_a_miss(agent):
+    pending = prefetch("Can you tell me what the vector index latency is?")
+    calls = [tool_call("search_documents", query="vector index latency", num_results=agent.PREFETCH_RESULTS + 5)]
+
+    assert agent._match_prefetch(calls, pending) is None
+    assert pending.future.cancelled()
+    assert agent.prefetch_stats.stats()["misses"] == 1
+
+
+def test_no_document_search_leaves_prefetch_unused(agent):
+    pending = prefetch("What's the weather in Lagos?")
+
+    assert agent._match_prefetch([tool_call("search_web", query="weather in Lagos")], pending) is None
+    assert pending.future.cancelled()
+    assert agent.prefetch_stats.stats()["unused"] == 1
+
+
+def test_outcome_is_recorded_once(agent):
+    pending = prefetch("vector index latency")
+
+    agent._discard_prefetch(pending, "misses")
+    agent._discard_prefetch(pending)
+
+    stats = agent.prefetch_stats.stats()
+    assert (stats["misses"], stats["unused"]) == (1, 0)
+
+
+def test_stats_are_per_agent(agent):
+    other = FunctionCallingAgent(NullCLI(), tools=agent.tools, speculative_prefetch=True)
+
+    agent._discard_prefetch(prefetch("vector index latency"))
+
+    assert agent.prefetch_stats.stats()["unused"] == 1
+    assert other.prefetch_stats.stats()["prefetches"] == 0
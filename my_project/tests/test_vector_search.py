@@ -0,0 +1,93 @@
+"""Tests for flat and IVF search in LocalVectorStore against brute force."""
+
+import numpy as np
+import pytest
+
+from ann_index import IVFIndex, top_k_indices
+from embedders import HashingEmbedder
+from local_vector_store import LocalVectorStore
+
+
+DIMENSION = 32
+
+
+def clustered_vectors(n: int, clusters: int = 16, seed: int = 0) -> np.ndarray:
+    """L2-normalized vectors drawn around random cluster centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, DIMENSION))
+    vectors = centres[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, DIMENSION))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def brute_force(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    return np.argsort(-(vectors @ query), kind="stable")[:k]
+
+
+def make_store(vectors: np.ndarray, index_type: str, **kwargs) -> LocalVectorStore:
+    store = LocalVectorStore(embedder=HashingEmbedder(dimension=DIMENSION), index_type=index_type,
+                             from_env=False, **kwargs)
+    store.add_embeddings(vectors, [f"chunk {i}" for i in range(len(vectors))],
+                         [{"row": i} for i in range(len(vectors))])
+    return store
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    vectors = clustered_vectors(2000 + 20)
+    return vectors[:2000], vectors[2000:]
+
+
+def test_top_k_indices_matches_full_sort():
+    scores = np.random.default_rng(1).normal(size=500)
+
+    assert list(top_k_indices(scores, 10)) == list(np.argsort(-scores)[:10])
+    assert len(top_k_indices(scores, 0)) == 0
+    assert len(top_k_indices(scores, 1000)) == 500
+
+
+def test_flat_search_is_exact(corpus):
+    vectors, queries = corpus
+    store = make_store(vectors, "flat")
+
+    for query in queries:
+        rows, scores = store.search_vector(query, 10)
+        assert list(rows) == list(brute_force(vectors, query, 10))
+        np.testing.assert_allclose(scores, vectors[rows] @ query, rtol=1e-5)
+
+
+def test_flat_batch_search_matches_single_queries(corpus):
+    vectors, queries = corpus
+    store = make_store(vectors, "flat")
+
+    for query, (rows, _) in zip(queries, store.search_vectors(queries, 10)):
+        assert list(rows) == list(store.search_vector(query, 10)[0])
+
+
+def test_ivf_probing_every_list_is_exact(corpus):
+    vectors, queries = corpus
+    index = IVFIndex(n_lists=32)
+    index.build(vectors)
+
+    for query in queries:
+        rows, _ = index.search(vectors, query, 10, nprobe=32)
+        assert list(rows) == list(brute_force(vectors, query, 10))
+
+
+def test_ivf_recall_against_brute_force(corpus):
+    vectors, queries = corpus
+    store = make_store(vectors, "ivf", n_lists=32, nprobe=8)
+
+    found = sum(
+        len(set(store.search_vector(query, 10)[0]) & set(brute_force(vectors, query, 10)))
+        for query in queries
+    )
+    assert found / (10 * len(queries)) >= 0.9
+
+
+def test_ivf_lists_cover_every_vector_once(corpus):
+    vectors, _ = corpus
+    index = IVFIndex(n_lists=32)
+    index.build(vectors)
+
+    assert sorted(index.list_ids) == list(range(len(vectors)))
+    assert index.list_offsets[-1] == len(vectors)
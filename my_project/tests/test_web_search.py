@@ -0,0 +1,97 @@
+"""Tests for AgentTools.search_web against a local stub of the instant answer API."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from agent_tools import AgentTools
+
+
+ANSWERS = {
+    "vector databases": "A vector database stores embeddings and answers nearest-neighbour queries.",
+    "retrieval augmented generation": "Retrieval augmented generation grounds model answers in fetched documents.",
+}
+
+
+class InstantAnswerStub(BaseHTTPRequestHandler):
+    """Answers known queries, returns an empty answer for the rest and fails while ``server.broken``."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # One handler per TCP connection; keep-alive requests reuse it
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)["q"][0]
+        self.server.queries.append(query)
+        if self.server.broken:
+            status, body = 503, b""
+        else:
+            status, body = 200, json.dumps({"Abstract": ANSWERS.get(query, ""), "RelatedTopics": []}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), InstantAnswerStub)
+    server.queries = []
+    server.connections = 0
+    server.broken = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("WEB_SEARCH_URL", f"http://127.0.0.1:{server.server_port}/")
+    monkeypatch.setenv("WEB_SEARCH_CACHE_SIZE", "16")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_searches_share_one_connection(stub):
+    tools = AgentTools()
+
+    first = tools.search_web("vector databases")
+    second = tools.search_web("retrieval augmented generation")
+
+    assert first["results"][0]["content"] == ANSWERS["vector databases"]
+    assert second["results"][0]["content"] == ANSWERS["retrieval augmented generation"]
+    assert stub.queries == ["vector databases", "retrieval augmented generation"]
+    assert stub.connections == 1
+
+
+def test_equivalent_query_is_served_from_cache(stub):
+    tools = AgentTools()
+
+    tools.search_web("vector databases")
+    cached = tools.search_web("  Vector Databases? ")
+
+    assert stub.queries == ["vector databases"]
+    assert cached["success"]
+    assert cached["query"] == "  Vector Databases? "
+    assert cached["results"][0]["content"] == ANSWERS["vector databases"]
+
+
+def test_failures_and_non_answers_are_not_cached(stub):
+    tools = AgentTools()
+
+    stub.broken = True
+    assert not tools.search_web("vector databases")["success"]
+    stub.broken = False
+    assert tools.search_web("vector databases")["results"][0]["content"] == ANSWERS["vector databases"]
+
+    fallback = tools.search_web("unanswerable question")
+    assert fallback["results"][0]["title"].startswith("Search Performed")
+    tools.search_web("unanswerable question")
+
+    assert stub.queries == ["vector databases", "vector databases", "unanswerable question", "unanswerable question"]
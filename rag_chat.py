@@ -1,9 +1,11 @@
 import os
 from typing import List, Dict, Any, Optional
-from litellm import completion
 from dotenv import load_dotenv
 from rag_source_base import RAGSourceBase
 from cli_interface import CLIInterface
+from completion_cache import complete
+from context_packer import ContextPacker
+from conversation_memory import ConversationMemory
 
 # Load environment variables
 load_dotenv()
@@ -19,16 +21,22 @@ class RAGChat:
     3. Generates context-aware responses using LLM
     """
     
-    def __init__(self, cli: CLIInterface, rag_source: Optional[RAGSourceBase] = None):
+    def __init__(self, cli: CLIInterface, rag_source: Optional[RAGSourceBase] = None, stream: bool = False,
+                 memory: Optional[ConversationMemory] = None):
         """
         Initialize the RAG Chat system.
         
         Args:
             cli (CLIInterface): CLI interface for user interaction
             rag_source (RAGSourceBase, optional): RAG source for document retrieval
+            stream (bool): Print answer tokens as they are generated
+            memory (ConversationMemory, optional): Conversation history. A new one is created if omitted.
         """
         self.cli = cli
         self.rag_source = rag_source
+        self.stream = stream
+        self.context_packer = ContextPacker()
+        self.memory = memory or ConversationMemory()
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         
         if not self.openai_api_key:
@@ -49,23 +57,29 @@ class RAGChat:
             return []
         
         try:
-            self.cli.loading_animation("Searching knowledge base", 1.5)
-            documents = self.rag_source.retrieve_documents(question, num_results)
+            with self.cli.spinner("Searching knowledge base"):
+                documents = self.rag_source.retrieve_documents(question, num_results)
             return documents
         except Exception as e:
             self.cli.print_error(f"Failed to retrieve documents: {e}")
             return []
     
-    def format_context(self, documents: List[Dict[str, Any]]) -> str:
+    def format_context(self, documents: List[Dict[str, Any]], question: str = "") -> str:
         """
         Format retrieved documents into context for the LLM.
         
+        Documents go through the context packer first: near-duplicates are
+        dropped, long ones are trimmed to the sentences that best match the
+        question, and the rest are ordered by score within the token budget.
+        
         Args:
             documents (List[Dict[str, Any]]): Retrieved documents
+            question (str): User's question, used to pick sentences when trimming
             
         Returns:
             str: Formatted context string
         """
+        documents = self.context_packer.pack(documents, question)
         if not documents:
             return ""
         
@@ -80,6 +94,8 @@ class RAGChat:
         """
         Generate AI response using LLM with optional context.
         
+        In streaming mode the answer is printed while it is generated.
+        
         Args:
             question (str): User's question
             context (str): Retrieved document context
@@ -88,38 +104,52 @@ class RAGChat:
             str: AI-generated response
         """
         try:
-            # Prepare the prompt
-            if context:
-                system_message = """You are a helpful AI assistant. Use the provided context to answer the user's question. 
+            return self._complete_response(question, context)
+        except Exception as e:
+            return self._apologize(e)
+    
+    def _complete_response(self, question: str, context: str) -> str:
+        """Body of ``generate_response``; errors propagate so callers can tell an answer from an apology."""
+        # Prepare the prompt
+        if context:
+            system_message = """You are a helpful AI assistant. Use the provided context to answer the user's question. 
                 If the context doesn't contain relevant information, say so and provide a general response based on your knowledge.
                 
                 Context:
                 {context}"""
-                
-                messages = [
-                    {"role": "system", "content": system_message.format(context=context)},
-                    {"role": "user", "content": question}
-                ]
-            else:
-                messages = [
-                    {"role": "system", "content": "You are a helpful AI assistant. Answer the user's question to the best of your ability."},
-                    {"role": "user", "content": question}
-                ]
-            
-            self.cli.loading_animation("Generating response", 2.0)
-            
-            # Call LiteLLM
-            response = completion(
-                model="openai/gpt-4o",
-                messages=messages,
-                temperature=0.7
-            )
             
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            self.cli.print_error(f"Failed to generate response: {e}")
-            return "I apologize, but I'm having trouble generating a response right now."
+            system_message = system_message.format(context=context)
+        else:
+            system_message = "You are a helpful AI assistant. Answer the user's question to the best of your ability."
+        
+        # Earlier turns (summary + recent history) sit between the system prompt and the question
+        messages = [
+            {"role": "system", "content": system_message},
+            *self.memory.messages(),
+            {"role": "user", "content": question}
+        ]
+        
+        # Call LiteLLM (through the completion cache when COMPLETION_CACHE is enabled)
+        response, printed = complete(
+            self.cli,
+            "Generating response",
+            self.stream,
+            model="openai/gpt-4o",
+            messages=messages,
+            temperature=0.7
+        )
+        answer = response.choices[0].message.content
+        if self.stream and not printed:
+            self.cli.print_answer(answer)
+        return answer
+    
+    def _apologize(self, error: Exception) -> str:
+        """Report a failed generation and return the apology shown in its place."""
+        self.cli.print_error(f"Failed to generate response: {error}")
+        answer = "I apologize, but I'm having trouble generating a response right now."
+        if self.stream:
+            self.cli.print_answer(answer)
+        return answer
     
     def chat(self, question: str) -> str:
         """
@@ -141,13 +171,23 @@ class RAGChat:
             self.cli.print_documents(documents)
         
         # Step 3: Format context
-        context = self.format_context(documents)
+        context = self.format_context(documents, question)
         
         # Step 4: Generate response
-        response = self.generate_response(question, context)
+        try:
+            response = self._complete_response(question, context)
+            answered = True
+        except Exception as e:
+            response = self._apologize(e)
+            answered = False
+        
+        # Step 5: Display response (already printed token by token when streaming)
+        if not self.stream:
+            self.cli.print_answer(response)
         
-        # Step 5: Display response
-        self.cli.print_answer(response)
+        # Step 6: Remember the turn for follow-up questions (an apology isn't worth remembering)
+        if answered:
+            self.memory.add_turn(question, response)
         
         return response
     
@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from enum import Enum
 from typing import List, Dict, Any
@@ -7,6 +9,8 @@ class RAGSourceType(Enum):
     """Enumeration of supported RAG source types."""
     NONE = "none"
     VECTORIZE = "vectorize"
+    LOCAL = "local"
+    HYBRID = "hybrid"
     PINECONE = "pinecone"
 
 
@@ -31,6 +35,46 @@ class RAGSourceBase(ABC):
         """
         pass
     
+    def retrieve_documents_many(self, questions: List[str], num_results: int = 5,
+                                max_concurrency: int = 8) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve documents for several questions at once.
+        
+        The default runs ``retrieve_documents`` on a bounded thread pool.
+        Sources that can batch natively (one embedding call, one matrix
+        multiply) override this.
+        
+        Args:
+            questions (List[str]): Questions to search for
+            num_results (int): Number of documents to retrieve per question
+            max_concurrency (int): Maximum retrievals in flight at once
+            
+        Returns:
+            List[List[Dict[str, Any]]]: One result list per question, in input order
+        """
+        if not questions:
+            return []
+        
+        workers = max(1, min(max_concurrency, len(questions)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda q: self.retrieve_documents(q, num_results), questions))
+    
+    async def aretrieve_documents(self, question: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Async version of ``retrieve_documents``.
+        
+        The default runs the synchronous method in a worker thread so the event
+        loop is never blocked. Sources with a native async client override this.
+        
+        Args:
+            question (str): The question to search for
+            num_results (int): Number of documents to retrieve
+            
+        Returns:
+            List[Dict[str, Any]]: List of retrieved documents with metadata
+        """
+        return await asyncio.to_thread(self.retrieve_documents, question, num_results)
+    
     @abstractmethod
     def get_required_env_vars(self) -> List[str]:
         """
@@ -0,0 +1,232 @@
+"""
+Resumable Chunked Uploads
+Content-Range PUT uploads with retries and a local resume journal.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Callable, Dict, Optional
+
+import urllib3
+
+
+# Servers answer an incomplete chunked upload with 308 and the stored range
+RESUME_INCOMPLETE = 308
+DONE_STATUSES = (200, 201)
+
+
+class ResumableUploader:
+    """
+    Chunked, resumable PUT uploads with a local resume journal.
+
+    Large files are sent as ``Content-Range`` chunks, so memory stays at
+    one chunk however big the file is. The server acknowledges each chunk
+    with ``308`` and a ``Range: bytes=0-N`` header. A failed chunk is
+    retried from the last offset the server confirmed, with exponential
+    backoff. After each chunk the upload URL and offset are written to a
+    JSON journal, so an interrupted run resumes where it stopped.
+
+    Only targets that implement this protocol should get chunked uploads:
+    a plain PUT target stores whatever body it receives as the whole file.
+    The ``bytes */size`` status probe is therefore only sent to URLs the
+    journal records as mid-upload. With ``resumable=False`` every file is
+    sent in a single streaming PUT.
+    """
+
+    def __init__(self, http: Optional[urllib3.PoolManager] = None, chunk_size: int = 8 * 1024 * 1024,
+                 max_retries: int = 5, backoff: float = 0.5, journal_path: str = ".upload_journal.json",
+                 progress: Optional[Callable[[str, int, int], None]] = None, resumable: bool = True):
+        """
+        Initialize the uploader.
+
+        Args:
+            http (urllib3.PoolManager, optional): Shared connection pool
+            chunk_size (int): Bytes per chunk; smaller files are sent in one PUT
+            max_retries (int): Attempts per chunk (or per single PUT) before giving up
+            backoff (float): Initial retry delay in seconds, doubled after each failure
+            journal_path (str): JSON file recording in-progress uploads
+            progress (Callable, optional): Called with (path, bytes_sent, total_bytes)
+            resumable (bool): Whether the target accepts ``Content-Range`` chunk uploads
+        """
+        self.http = http or urllib3.PoolManager()
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.journal_path = journal_path
+        self.progress = progress
+        self.resumable = resumable
+
+        self._lock = threading.Lock()
+        self._journal: Dict[str, Dict] = {}
+        if os.path.exists(journal_path):
+            try:
+                with open(journal_path) as f:
+                    self._journal = json.load(f)
+            except (OSError, ValueError):
+                self._journal = {}
+
+    def _save_journal(self):
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._journal, f)
+        os.replace(tmp_path, self.journal_path)
+
+    def _journal_update(self, key: str, entry: Optional[Dict]):
+        with self._lock:
+            if entry is None:
+                if self._journal.pop(key, None) is None:
+                    return
+            else:
+                self._journal[key] = entry
+            self._save_journal()
+
+    @staticmethod
+    def _confirmed_offset(response) -> int:
+        """Next byte to send, from a 308 response's ``Range: bytes=0-N`` header."""
+        header = response.headers.get("Range")
+        if not header:
+            return 0
+        return int(header.rsplit("-", 1)[1]) + 1
+
+    def _query_offset(self, url: str, size: int) -> Optional[int]:
+        """
+        Ask the server how much of an upload it has.
+
+        Returns:
+            Optional[int]: Next offset to send, ``size`` if already complete,
+            or None if the target doesn't support resumable uploads
+        """
+        response = self.http.request(
+            "PUT", url, body=b"", headers={"Content-Range": f"bytes */{size}"}, retries=False
+        )
+        if response.status == RESUME_INCOMPLETE:
+            return self._confirmed_offset(response)
+        if response.status in DONE_STATUSES:
+            return size
+        return None
+
+    def _report(self, path: str, sent: int, size: int):
+        if self.progress:
+            self.progress(path, sent, size)
+
+    def _sleep(self, attempt: int):
+        time.sleep(self.backoff * (2 ** attempt))
+
+    def upload(self, path: str, content_type: str, get_upload_url: Callable[[], str]) -> bool:
+        """
+        Upload one file, resuming a journaled upload if possible.
+
+        Args:
+            path (str): File to upload
+            content_type (str): MIME type of the file
+            get_upload_url (Callable[[], str]): Creates a new upload URL. Only
+                called when there is no resumable upload for this file.
+
+        Returns:
+            bool: True if the server confirmed the complete file
+        """
+        st = os.stat(path)
+        size = st.st_size
+        key = os.path.abspath(path)
+
+        if size <= self.chunk_size or not self.resumable:
+            return self._upload_single(path, size, content_type, get_upload_url())
+
+        # Resume only if the file hasn't changed since the journaled attempt
+        entry = self._journal.get(key)
+        url, offset = None, None
+        if entry and entry["size"] == size and entry["mtime_ns"] == st.st_mtime_ns:
+            try:
+                url, offset = entry["url"], self._query_offset(entry["url"], size)
+            except urllib3.exceptions.HTTPError:
+                offset = None
+            if offset is not None:
+                print(f"↩️ Resuming {os.path.basename(path)} at {offset / size:.0%}")
+
+        if offset is None:
+            # Nothing is stored at a fresh URL, so there is nothing to probe
+            url, offset = get_upload_url(), 0
+
+        journal_entry = {"url": url, "size": size, "mtime_ns": st.st_mtime_ns, "offset": offset}
+        self._journal_update(key, journal_entry)
+
+        with open(path, "rb") as f:
+            attempt = 0
+            while offset < size:
+                f.seek(offset)
+                chunk = f.read(self.chunk_size)
+                end = offset + len(chunk) - 1
+                try:
+                    response = self.http.request(
+                        "PUT", url, body=chunk, retries=False,
+                        headers={
+                            "Content-Type": content_type,
+                            "Content-Range": f"bytes {offset}-{end}/{size}",
+                        }
+                    )
+                    status = response.status
+                except urllib3.exceptions.HTTPError:
+                    status = None
+
+                if status in DONE_STATUSES:
+                    if end + 1 < size:
+                        # The target took the chunk as the whole file; replace it with one PUT
+                        print(f"⚠️ {os.path.basename(path)}: target doesn't accept chunked uploads, sending it whole")
+                        self._journal_update(key, None)
+                        return self._upload_single(path, size, content_type, url)
+                    offset = size
+                elif status == RESUME_INCOMPLETE:
+                    offset = self._confirmed_offset(response)
+                    attempt = 0
+                    journal_entry["offset"] = offset
+                    self._journal_update(key, journal_entry)
+                elif status is not None and 400 <= status < 500 and status not in (408, 429):
+                    print(f"❌ Chunk upload rejected: {status}")
+                    return False
+                else:
+                    # Timeout, 5xx or dropped connection: resend from what the server has
+                    if attempt >= self.max_retries:
+                        print(f"❌ Giving up on {os.path.basename(path)} at {offset / size:.0%}; re-run to resume")
+                        return False
+                    self._sleep(attempt)
+                    attempt += 1
+                    try:
+                        confirmed = self._query_offset(url, size)
+                        if confirmed is not None:
+                            offset = confirmed
+                    except urllib3.exceptions.HTTPError:
+                        pass
+                    continue
+
+                self._report(path, offset, size)
+
+        self._journal_update(key, None)
+        return True
+
+    def _upload_single(self, path: str, size: int, content_type: str, url: str) -> bool:
+        """Stream the whole file in one PUT, retrying from the start on transient errors."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                with open(path, "rb") as f:
+                    response = self.http.request(
+                        "PUT", url, body=f, retries=False,
+                        headers={
+                            "Content-Type": content_type,
+                            "Content-Length": str(size),
+                        }
+                    )
+                if response.status in DONE_STATUSES:
+                    self._report(path, size, size)
+                    return True
+                if response.status < 500 and response.status not in (408, 429):
+                    print(f"❌ Upload failed: {response.status}")
+                    return False
+            except urllib3.exceptions.HTTPError:
+                pass
+            if attempt < self.max_retries:
+                self._sleep(attempt)
+
+        print(f"❌ Upload failed after {self.max_retries + 1} attempts: {os.path.basename(path)}")
+        return False
@@ -0,0 +1,126 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry time-to-live.
+
+    Entries are evicted when the cache exceeds ``max_size`` (least recently
+    used first) or when they are older than ``ttl`` seconds. Hit, miss and
+    eviction counters are kept for reporting.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 3600.0,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of entries
+            ttl (float, optional): Entry lifetime in seconds, or None for no expiry
+            on_evict (Callable, optional): Called with (key, value) whenever an
+                entry leaves the cache through eviction, expiry, replacement or pop
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key, self._MISSING) is not self._MISSING
+
+    def _expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and time.monotonic() >= expires_at
+
+    def _remove(self, key: Hashable, evicted: bool = True):
+        _, value = self._data.pop(key)
+        if evicted:
+            self.evictions += 1
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value and mark it recently used, counting a hit or miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._expired(entry[0]):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value without touching LRU order or counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._expired(entry[0]):
+                return default
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to store
+            ttl (float, optional): Lifetime override for this entry
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key, evicted=False)
+            self._data[key] = (expires_at, value)
+
+            while len(self._data) > self.max_size:
+                self._remove(next(iter(self._data)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value."""
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._data[key][1]
+            self._remove(key, evicted=False)
+            return value
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
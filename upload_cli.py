@@ -20,7 +20,8 @@ def main():
         epilog="""
 Examples:
   python upload_cli.py file document.pdf           # Upload single file
-  python upload_cli.py folder ./documents          # Upload folder
+  python upload_cli.py folder ./documents          # Upload folder (recursive)
+  python upload_cli.py folder ./docs --exclude .git drafts   # Skip folders/files by glob
   python upload_cli.py file *.txt                  # Upload all txt files
   
 Supported formats: .pdf, .txt, .md, .docx, .doc, .csv
@@ -32,10 +33,20 @@ Supported formats: .pdf, .txt, .md, .docx, .doc, .csv
     # File upload command
     file_parser = subparsers.add_parser('file', help='Upload single file or files with wildcard')
     file_parser.add_argument('path', nargs='+', help='File path(s) to upload')
+    file_parser.add_argument('--concurrency', type=int, default=8, help='Files uploaded in parallel (default: 8)')
+    file_parser.add_argument('--manifest', default=None, help='Upload manifest path (default: .upload_manifest.db)')
+    file_parser.add_argument('--force', action='store_true', help='Re-upload files even if unchanged')
     
     # Folder upload command  
     folder_parser = subparsers.add_parser('folder', help='Upload all files from folder')
     folder_parser.add_argument('path', help='Folder path to upload from')
+    folder_parser.add_argument('--concurrency', type=int, default=8, help='Files uploaded in parallel (default: 8)')
+    folder_parser.add_argument('--manifest', default=None, help='Upload manifest path (default: .upload_manifest.db)')
+    folder_parser.add_argument('--force', action='store_true', help='Re-upload files even if unchanged')
+    folder_parser.add_argument('--include', nargs='+', default=None, metavar='PATTERN',
+                               help='Only upload files matching these globs (e.g. "reports/*" "*.pdf")')
+    folder_parser.add_argument('--exclude', nargs='+', default=None, metavar='PATTERN',
+                               help='Skip files and folders matching these globs (e.g. ".git" "drafts")')
     
     args = parser.parse_args()
     
@@ -47,7 +58,9 @@ Supported formats: .pdf, .txt, .md, .docx, .doc, .csv
     cli = CLIInterface("Document Upload System")
     
     try:
-        uploader = DocumentUploader()
+        uploader = DocumentUploader(
+            concurrency=args.concurrency, manifest_path=args.manifest, force=args.force
+        )
         cli.print_success("Document uploader initialized!")
         
         if args.command == 'file':
@@ -68,15 +81,12 @@ Supported formats: .pdf, .txt, .md, .docx, .doc, .csv
                 cli.print_error("No files found matching the pattern(s)")
                 return 1
             
-            # Upload files
+            # Upload files in parallel
             cli.print_info(f"Uploading {len(all_files)} file(s)...")
-            successful = 0
+            results = uploader.upload_files(all_files)
+            successful = sum(results.values())
             
-            for file_path in all_files:
-                if uploader.upload_file(str(file_path)):
-                    successful += 1
-            
-            cli.print_success(f"Upload complete: {successful}/{len(all_files)} files uploaded")
+            cli.print_success(f"Upload complete: {successful}/{len(results)} files uploaded")
             
         elif args.command == 'folder':
             # Handle folder upload
@@ -87,7 +97,7 @@ Supported formats: .pdf, .txt, .md, .docx, .doc, .csv
                 return 1
             
             cli.print_info(f"Uploading files from folder: {folder_path}")
-            results = uploader.upload_folder(str(folder_path))
+            results = uploader.upload_folder(str(folder_path), args.include, args.exclude)
             
             if results:
                 successful = sum(results.values())
@@ -0,0 +1,133 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional, Tuple
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# (size, mtime_ns, sha256) of a file at one point in time
+FileSnapshot = Tuple[int, int, str]
+
+
+def snapshot_file(path: str) -> FileSnapshot:
+    """
+    Size, mtime and SHA-256 of a file.
+
+    The stat comes first, so an edit made while hashing leaves a newer
+    mtime on disk than the one recorded, and the next ``check`` re-hashes.
+    """
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns, file_sha256(path)
+
+
+class UploadManifest:
+    """
+    SQLite record of files already uploaded to a destination.
+
+    Each row stores path, size, mtime (ns) and SHA-256 per destination.
+    ``check`` only stats a file when size and mtime match the record, and
+    hashes it only when they don't, so an unchanged corpus is verified
+    without reading any file contents.
+    """
+
+    def __init__(self, path: str = ".upload_manifest.db"):
+        """
+        Open (or create) the manifest.
+
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                target TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (target, path)
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def check(self, target: str, path: str) -> Tuple[bool, Optional[FileSnapshot]]:
+        """
+        Decide whether a file needs uploading.
+
+        Args:
+            target (str): Destination identifier (e.g. the organization ID)
+            path (str): File to check
+
+        Returns:
+            Tuple[bool, Optional[FileSnapshot]]: Whether the file is unchanged since
+            its last upload, and its snapshot if it had to be hashed
+        """
+        key = self._key(path)
+        st = os.stat(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, sha256 FROM files WHERE target = ? AND path = ?", (target, key)
+            ).fetchone()
+
+        if row is None:
+            return False, None
+        size, mtime_ns, sha256 = row
+        if size == st.st_size and mtime_ns == st.st_mtime_ns:
+            return True, None
+        if size != st.st_size:
+            return False, None
+
+        # Same size but touched: only the content hash can tell
+        snapshot = (st.st_size, st.st_mtime_ns, file_sha256(path))
+        if snapshot[2] == sha256:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE files SET mtime_ns = ? WHERE target = ? AND path = ?", (st.st_mtime_ns, target, key)
+                )
+                self._conn.commit()
+            return True, snapshot
+        return False, snapshot
+
+    def record(self, target: str, path: str, snapshot: FileSnapshot):
+        """
+        Record a successful upload.
+
+        Args:
+            target (str): Destination identifier
+            path (str): Uploaded file
+            snapshot (FileSnapshot): The file's state taken *before* the upload
+                (``snapshot_file``), so edits made during the upload aren't
+                recorded as uploaded
+        """
+        size, mtime_ns, digest = snapshot
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (target, path, size, mtime_ns, sha256, uploaded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (target, self._key(path), size, mtime_ns, digest, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,7 @@
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import vectorize_client as v
+from async_http import get_async_client, aclose_async_client
 from rag_source_base import RAGSourceBase
 
 
@@ -9,8 +10,14 @@ class VectorizeWrapper(RAGSourceBase):
     Vectorize.io RAG source implementation.
     
     This class handles document retrieval using Vectorize.io's API.
+    
+    The async path talks to the REST API directly through an ``httpx``
+    connection pool shared by every async caller on the same event loop, so many
+    retrievals can be in flight without holding a thread each.
     """
     
+    API_URL = "https://api.vectorize.io/v1"
+    
     def __init__(self):
         """Initialize the Vectorize client with credentials from environment variables."""
         self.org_id = os.getenv("VECTORIZE_ORGANIZATION_ID")
@@ -21,9 +28,27 @@ class VectorizeWrapper(RAGSourceBase):
             raise ValueError("Missing required Vectorize environment variables")
         
         # Initialize the Vectorize API client
-        self.api = v.ApiClient(v.Configuration(access_token=self.access_token))
+        self.api_url = os.getenv("VECTORIZE_API_URL", self.API_URL)
+        self.api = v.ApiClient(v.Configuration(host=self.api_url, access_token=self.access_token))
         self.pipelines_api = v.PipelinesApi(self.api)
     
+    @staticmethod
+    def _format_document(text: str, score: Optional[float], metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Format one Vectorize document for the common RAG source interface."""
+        return {
+            "content": text,
+            "metadata": {
+                "score": score,
+                "source": "vectorize",
+                **(metadata or {})
+            }
+        }
+    
+    @classmethod
+    async def aclose(cls):
+        """Close the pooled HTTP client of the running event loop."""
+        await aclose_async_client()
+    
     def retrieve_documents(self, question: str, num_results: int = 5) -> List[Dict[str, Any]]:
         """
         Retrieve documents from Vectorize based on the question.
@@ -49,15 +74,9 @@ class VectorizeWrapper(RAGSourceBase):
             # Format the response for consistent interface
             documents = []
             for doc in response.documents:
-                formatted_doc = {
-                    "content": doc.text,
-                    "metadata": {
-                        "score": getattr(doc, 'score', None),
-                        "source": "vectorize",
-                        **getattr(doc, 'metadata', {})
-                    }
-                }
-                documents.append(formatted_doc)
+                documents.append(self._format_document(
+                    doc.text, getattr(doc, 'score', None), getattr(doc, 'metadata', {})
+                ))
             
             return documents
             
@@ -65,6 +84,35 @@ class VectorizeWrapper(RAGSourceBase):
             print(f"Error retrieving documents from Vectorize: {e}")
             return []
     
+    async def aretrieve_documents(self, question: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retrieve documents from Vectorize without blocking the event loop.
+        
+        Args:
+            question (str): The question to search for
+            num_results (int): Number of documents to retrieve
+            
+        Returns:
+            List[Dict[str, Any]]: List of retrieved documents with content and metadata
+        """
+        try:
+            client = get_async_client()
+            response = await client.post(
+                f"{self.api_url}/org/{self.org_id}/pipelines/{self.pipeline_id}/retrieval",
+                json={"question": question, "numResults": num_results},
+                headers={"Authorization": f"Bearer {self.access_token}"},
+            )
+            response.raise_for_status()
+            
+            return [
+                self._format_document(doc.get("text", ""), doc.get("score"), doc.get("metadata"))
+                for doc in response.json().get("documents", [])
+            ]
+            
+        except Exception as e:
+            print(f"Error retrieving documents from Vectorize: {e}")
+            return []
+    
     def get_required_env_vars(self) -> List[str]:
         """
         Get the list of required environment variables for Vectorize.
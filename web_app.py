@@ -6,10 +6,12 @@ Agent Engineering Bootcamp - Week 2 Assignment
 
 import os
 import json
-from flask import Flask, render_template, request, jsonify, session
+import queue
+import threading
+from contextlib import contextmanager
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
 from dotenv import load_dotenv
-from agent_tools import AgentTools
-from function_calling_agent import FunctionCallingAgent
+from agent_components import AgentComponents
 from cli_interface import CLIInterface
 import uuid
 
@@ -21,31 +23,120 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', 'agent-bootcamp-secret-key-change
 # Initialize components
 cli = CLIInterface()
 
+# Shared tools, RAG client and config: built once, reused by every request
+components = AgentComponents()
+
 class WebCLIInterface:
     """Mock CLI interface for web usage."""
     def __init__(self):
         self.messages = []
+        self._answer_parts = []
+    
+    def add_message(self, message_type, content):
+        self.messages.append({'type': message_type, 'content': content})
     
     def print_info(self, message):
-        self.messages.append({'type': 'info', 'content': message})
+        self.add_message('info', message)
     
     def print_success(self, message):
-        self.messages.append({'type': 'success', 'content': message})
+        self.add_message('success', message)
     
     def print_error(self, message):
-        self.messages.append({'type': 'error', 'content': message})
+        self.add_message('error', message)
     
     def print_warning(self, message):
-        self.messages.append({'type': 'warning', 'content': message})
+        self.add_message('warning', message)
     
     def print_question(self, message):
-        self.messages.append({'type': 'question', 'content': message})
+        self.add_message('question', message)
     
     def print_answer(self, message):
-        self.messages.append({'type': 'answer', 'content': message})
+        self.add_message('answer', message)
+    
+    def print_answer_start(self):
+        self._answer_parts = []
+    
+    def print_answer_delta(self, delta):
+        self._answer_parts.append(delta)
+    
+    def print_answer_end(self):
+        self.add_message('answer', ''.join(self._answer_parts))
+    
+    def print_tool_start(self, tool_name, arguments=""):
+        self.print_info(f"Using tool: {tool_name}")
+    
+    def print_tool_result(self, tool_name, tool_result):
+        CLIInterface.print_tool_result(self, tool_name, tool_result)
     
     def loading_animation(self, message, duration):
-        self.messages.append({'type': 'loading', 'content': message})
+        self.add_message('loading', message)
+    
+    @contextmanager
+    def spinner(self, message):
+        self.add_message('loading', message)
+        yield
+
+
+class StreamingWebCLIInterface(WebCLIInterface):
+    """Web CLI interface that also publishes every event to a queue for SSE."""
+    
+    _CLOSED = object()
+    
+    def __init__(self):
+        super().__init__()
+        self._events = queue.Queue()
+    
+    def emit(self, event_type, **data):
+        self._events.put_nowait({'type': event_type, **data})
+    
+    def close(self):
+        self._events.put_nowait(self._CLOSED)
+    
+    def events(self):
+        """Yield events until the producer closes the stream."""
+        while True:
+            event = self._events.get()
+            if event is self._CLOSED:
+                return
+            yield event
+    
+    def add_message(self, message_type, content):
+        super().add_message(message_type, content)
+        self.emit(message_type, content=content)
+    
+    def print_answer_delta(self, delta):
+        super().print_answer_delta(delta)
+        self.emit('token', content=delta)
+    
+    def print_tool_start(self, tool_name, arguments=""):
+        self.emit('tool_start', name=tool_name, arguments=arguments)
+        super().print_tool_start(tool_name, arguments)
+    
+    def print_tool_result(self, tool_name, tool_result):
+        self.emit(
+            'tool_result',
+            name=tool_name,
+            success=bool(tool_result.get('success')),
+            total=len(tool_result.get('results', [])),
+            error=tool_result.get('error')
+        )
+        super().print_tool_result(tool_name, tool_result)
+
+
+def format_sse(event):
+    """Serialize one event in Server-Sent Events wire format."""
+    return f"data: {json.dumps(event)}\n\n"
+
+def conversation_id(session) -> str:
+    """
+    The caller's conversation id, issued by the server on first use.
+    
+    It lives in the signed session cookie, so a client can't pick (or
+    guess its way into) another user's conversation memory.
+    """
+    if 'conversation_id' not in session:
+        session['conversation_id'] = uuid.uuid4().hex
+    return session['conversation_id']
 
 @app.route('/')
 def index():
@@ -69,14 +160,14 @@ def chat():
         web_cli = WebCLIInterface()
         
         # Check if agent can be initialized
-        if not os.getenv("OPENAI_API_KEY"):
+        if not components.config['openai_configured']:
             return jsonify({
                 'success': False,
                 'error': 'OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.'
             })
         
-        # Initialize function calling agent
-        agent = FunctionCallingAgent(web_cli)
+        # Initialize a per-request agent around the shared components
+        agent = components.create_agent(web_cli, session_id=conversation_id(session))
         
         # Get response from agent
         response = agent.chat_with_tools(user_message)
@@ -97,23 +188,55 @@ def chat():
             'error': f'Error: {str(e)}'
         })
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Handle chat requests, streaming tool and answer events as Server-Sent Events."""
+    data = request.get_json(silent=True) or {}
+    user_message = data.get('message', '').strip()
+    # Read in the request context: the agent thread can't see the session
+    session_id = conversation_id(session)
+    
+    web_cli = StreamingWebCLIInterface()
+    
+    def run_agent():
+        try:
+            if not user_message:
+                web_cli.emit('error', error='Please enter a message')
+                return
+            
+            if not components.config['openai_configured']:
+                web_cli.emit('error', error='OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.')
+                return
+            
+            agent = components.create_agent(web_cli, session_id=session_id, stream=True)
+            response = agent.chat_with_tools(user_message)
+            web_cli.emit('done', response=response)
+            
+        except Exception as e:
+            web_cli.emit('error', error=f'Error: {str(e)}')
+        finally:
+            web_cli.close()
+    
+    # The agent runs on its own thread so events reach the client while it works
+    threading.Thread(target=run_agent, daemon=True).start()
+    
+    def generate():
+        for event in web_cli.events():
+            yield format_sse(event)
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/tools')
 def get_tools():
     """Get available tools information."""
     try:
-        tools = AgentTools()
-        available_tools = tools.get_available_tools()
-        
-        tool_info = []
-        for tool in available_tools:
-            tool_info.append({
-                'name': tool['function']['name'],
-                'description': tool['function']['description']
-            })
-        
         return jsonify({
             'success': True,
-            'tools': tool_info
+            'tools': components.tool_info()
         })
         
     except Exception as e:
@@ -126,24 +249,9 @@ def get_tools():
 def get_status():
     """Get system status."""
     try:
-        # Check environment variables
-        openai_key = bool(os.getenv("OPENAI_API_KEY"))
-        vectorize_org = bool(os.getenv("VECTORIZE_ORGANIZATION_ID"))
-        vectorize_token = bool(os.getenv("VECTORIZE_PIPELINE_ACCESS_TOKEN"))
-        vectorize_pipeline = bool(os.getenv("VECTORIZE_PIPELINE_ID"))
-        
-        # Check tool availability
-        tools = AgentTools()
-        rag_available = tools.has_rag
-        
         return jsonify({
             'success': True,
-            'status': {
-                'openai_configured': openai_key,
-                'vectorize_configured': vectorize_org and vectorize_token and vectorize_pipeline,
-                'rag_available': rag_available,
-                'total_tools': len(tools.get_available_tools())
-            }
+            'status': components.status()
         })
         
     except Exception as e: